@@ -4,10 +4,11 @@ from .calorie_calculator_agent import calorie_calculator_agent
 from .food_recommendation_agent import food_recommendation_agent
 from .diet_analysis_agent import diet_analysis_agent
 from .measurement_conversion_agent import measurement_conversion_agent
-from .health_info_agent import health_info_agent, health_info_workflow
+from .health_info_agent import health_info_agent, health_info_workflow, health_info_merged_workflow
 from .research_agent import research_agent
 from .nutritionist_rag_agent import nutritionist_rag_agent
 from .personal_agent import personal_agent
+from .fan_out_agent import multi_domain_agent
 
 __all__ = [
     "root_agent",
@@ -18,7 +19,9 @@ __all__ = [
     "measurement_conversion_agent",
     "health_info_agent",
     "health_info_workflow",
+    "health_info_merged_workflow",
     "research_agent",
     "nutritionist_rag_agent",
     "personal_agent",
+    "multi_domain_agent",
 ] 
\ No newline at end of file
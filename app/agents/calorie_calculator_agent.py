@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
 
 calorie_calculator_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("CalorieCalculatorAgent"),
     name="CalorieCalculatorAgent",
     description="Calculates total calories and macronutrients for meals and recipes using web search",
     instruction="""You are a Nutrition Calculator Specialist who calculates nutritional totals for meals and recipes.
@@ -38,5 +39,8 @@ calorie_calculator_agent = LlmAgent(
     2. Calculate the total calories, protein, carbs, and fat
     3. Present the totals and the breakdown by food item
     """,
-    tools=[google_search]
+    tools=[google_search],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 ) 
\ No newline at end of file
@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
 
 diet_analysis_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("DietAnalysisAgent"),
     name="DietAnalysisAgent",
     description="Analyzes food logs and provides nutritional feedback using web search",
     instruction="""You are a Diet Analysis Specialist who evaluates food logs and provides nutritional feedback.
@@ -57,5 +58,8 @@ diet_analysis_agent = LlmAgent(
     3. Provide feedback on strengths and potential improvements
     4. Include practical suggestions for enhancements
     """,
-    tools=[google_search]
+    tools=[google_search],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 ) 
\ No newline at end of file
@@ -0,0 +1,111 @@
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from agents.nutritionist_rag_agent import nutritionist_rag_agent
+from agents.personal_agent import personal_agent
+from agents.prefetch import discard_prefetches_callback
+from agents.pre_router import FAN_OUT_AGENT, PERSONAL_AGENT, RAG_AGENT, RESEARCH_AGENT, get_pre_router
+from agents.research_agent import research_agent
+
+# Fan-out for questions that span domains, such as "based on my intake this
+# week, what does the latest research say about my protein needs". Instead
+# of one handoff (a partial answer) or several in a row, the specialists
+# the question needs run concurrently in a ParallelAgent, each writing its
+# part to its own output_key, and a merge step without a model call puts
+# the parts together. Wall-clock latency is that of the slowest specialist.
+#
+# The specialists are selected when the fan-out starts (keyword rules and
+# classifier of the pre-router). Branches that are not selected answer
+# nothing without calling their model.
+
+SELECTED_STATE_KEY = "fan_out_agents"
+
+FAN_OUT_INSTRUCTION = """
+This request spans several specialties and other specialists answer the other parts at the same time.
+Answer only the part within your specialty, briefly, without repeating what the others will cover.
+"""
+
+# Specialist -> (fan-out branch name, output_key, section heading), in the order of the merged answer
+FAN_OUT_BRANCHES = {
+    PERSONAL_AGENT: ("PersonalFanOutAgent", "fan_out_personal", "Your data"),
+    RAG_AGENT: ("NutritionistFanOutAgent", "fan_out_guidance", "Guidance"),
+    RESEARCH_AGENT: ("ResearchFanOutAgent", "fan_out_research", "Latest research"),
+}
+
+
+def select_specialists_callback(callback_context) -> Optional[types.Content]:
+    """Before-agent callback of the fan-out: records the branches this request needs."""
+    user_content = callback_context.user_content
+    text = " ".join(part.text for part in (user_content.parts or []) if part.text) if user_content else ""
+    router = get_pre_router()
+    specialists = router.domains(text)
+    if not specialists:
+        specialists = [router.score(text)[0]]
+    callback_context.state[SELECTED_STATE_KEY] = [FAN_OUT_BRANCHES[agent][0] for agent in specialists]
+    # Clear the previous turn's parts so the merge only sees this turn's
+    for _, output_key, _ in FAN_OUT_BRANCHES.values():
+        callback_context.state[output_key] = None
+    return None
+
+
+def skip_unselected_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """Before-model callback of the branches: an unselected branch answers nothing without a model call."""
+    if callback_context.agent_name in (callback_context.state.get(SELECTED_STATE_KEY) or []):
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text="")]))
+
+
+def _branch(agent, name: str, output_key: str):
+    return agent.clone(update={
+        "name": name,
+        "instruction": agent.instruction + FAN_OUT_INSTRUCTION,
+        "output_key": output_key,
+        "model": model_for(name),
+        "before_model_callback": [skip_unselected_callback, select_model_callback],
+        "after_model_callback": record_model_usage_callback,  # Partial answers are not cached
+        "after_agent_callback": None,  # Prefetches are dropped once the whole fan-out ends
+        "disallow_transfer_to_parent": True,
+        "disallow_transfer_to_peers": True,
+    })
+
+
+class FanOutMergeAgent(BaseAgent):
+    """Joins the specialists' parts into one answer, without a model call."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        sections = []
+        for _, output_key, heading in FAN_OUT_BRANCHES.values():
+            part = ctx.session.state.get(output_key)
+            if part and part.strip():
+                sections.append(f"**{heading}**\n{part.strip()}")
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text="\n\n".join(sections))])
+        )
+
+
+specialist_fan_out = ParallelAgent(
+    name="SpecialistFanOut",
+    sub_agents=[
+        _branch(personal_agent, *FAN_OUT_BRANCHES[PERSONAL_AGENT][:2]),
+        _branch(nutritionist_rag_agent, *FAN_OUT_BRANCHES[RAG_AGENT][:2]),
+        _branch(research_agent, *FAN_OUT_BRANCHES[RESEARCH_AGENT][:2]),
+    ],
+    before_agent_callback=select_specialists_callback,
+)
+
+multi_domain_agent = SequentialAgent(
+    name=FAN_OUT_AGENT,
+    description="Answers questions spanning user data, nutrition guidance and research by running those specialists concurrently",
+    sub_agents=[specialist_fan_out, FanOutMergeAgent(name="FanOutMergeAgent")],
+    after_agent_callback=discard_prefetches_callback,
+)
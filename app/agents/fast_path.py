@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional
+import re
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from config import FAST_PATH_ENABLED
+from agents.pre_router import latest_user_text
+from tools.calorie_calculator import calculate_nutrition
+from tools.ingredient_parser import parse_ingredient_line, to_calculator_units
+from tools.measurement_conversion import conversion_graph, convert_measurement
+
+# No-model fast path for pure computation questions such as "how many grams
+# is 2 cups of flour" or "calories in 150 g chicken breast and 1 cup rice".
+# The question is matched against a few fixed phrasings, its amounts are
+# read with the ingredient parser, the local conversion or nutrition tool
+# runs directly and the answer is rendered from a template. Anything that
+# does not parse cleanly (no number, unknown unit or food) falls through
+# to the agents, and so does a food the database only matches approximately:
+# "almond butter" is not almonds, and the agents can say so.
+
+CONVERSION_TEMPLATE = "{amount} {from_unit} of {food} is about {converted} {to_unit}."
+UNIT_CONVERSION_TEMPLATE = "{amount} {from_unit} is about {converted} {to_unit}."
+NUTRITION_TEMPLATE = (
+    "{items} {verb} about {calories} kcal, with {protein} g protein, "
+    "{carbohydrates} g carbohydrates, {fat} g fat and {fiber} g fiber."
+)
+
+_CONVERSION_PATTERNS = [
+    re.compile(r"^(?:how many|how much) (?P<to>[a-z ]+?) (?:is|are|in|makes?|equals?) (?P<amount>.+)$"),
+    re.compile(r"^convert (?P<amount>.+?) (?:to|into) (?P<to>[a-z ]+)$"),
+    re.compile(r"^(?P<amount>.+?) (?:in|to|into) (?P<to>[a-z ]+)$"),
+    re.compile(r"^berapa (?P<to>[a-z]+) (?:dalam |untuk |di )?(?P<amount>.+)$"),
+]
+_NUTRITION_PATTERNS = [
+    re.compile(
+        r"^(?:how many |what are the |what is the |what's the )?"
+        r"(?:calories|kcal|nutrition|nutrients|macros)(?: are| is)? (?:in|of|for) (?P<items>.+)$"
+    ),
+    re.compile(r"^(?:berapa )?(?:kalori|kkal|gizi|nutrisi) (?:dalam |di |dari |pada |untuk )?(?P<items>.+)$"),
+]
+_ITEM_SEPARATOR = re.compile(r"\s*(?:,|\+|&|\band\b|\bdan\b)\s*")
+_ARTICLE = re.compile(r"^(?:a|an|one|satu|se)\s+")
+_UNITS_ONLY = re.compile(r"^(?P<quantity>\d+(?:[.,]\d+)?)\s*(?P<unit>[a-z. ]+)$")
+
+_stats = {"answered": 0, "passed": 0, "failed": 0}
+
+
+def _format_number(value: float) -> str:
+    return f"{round(value, 1):g}"
+
+
+def _normalize_query(text: str) -> str:
+    return " ".join(text.lower().strip().rstrip("?.!").split())
+
+
+def _parse_amount(text: str) -> Optional[Dict]:
+    """Parses "2 cups of flour" into an ingredient dict; the quantity must be written out."""
+    text = _ARTICLE.sub("1 ", text.strip())
+    if not text or not (text[0].isdigit() or text[0] in "½⅓⅔¼¾⅛"):
+        return None
+    return parse_ingredient_line(text)
+
+
+def answer_conversion(query: str) -> Optional[str]:
+    """Answers a unit conversion question, or returns None if it doesn't parse cleanly."""
+    for pattern in _CONVERSION_PATTERNS:
+        match = pattern.match(query)
+        if not match:
+            continue
+        to_unit = conversion_graph.normalize_unit(match.group("to").strip())
+        if to_unit is None:
+            continue
+        amount_text = _ARTICLE.sub("1 ", match.group("amount").strip())
+        units_only = _UNITS_ONLY.match(amount_text)
+        parsed = _parse_amount(amount_text)
+        if units_only and conversion_graph.normalize_unit(units_only.group("unit").strip()) is not None:
+            # Units only, as in "how many tbsp in 1 cup"
+            food = ""
+            quantity = float(units_only.group("quantity").replace(",", "."))
+            from_unit = conversion_graph.normalize_unit(units_only.group("unit").strip())
+        elif parsed is not None and conversion_graph.normalize_unit(parsed["unit"]) is not None:
+            food, quantity, from_unit = parsed["name"], parsed["quantity"], parsed["unit"]
+        else:
+            continue
+        result = convert_measurement(food, quantity, from_unit, to_unit)
+        if result["status"] != "success":
+            return None
+        template = CONVERSION_TEMPLATE if food else UNIT_CONVERSION_TEMPLATE
+        return template.format(
+            amount=_format_number(quantity),
+            from_unit=from_unit,
+            food=food,
+            converted=_format_number(result["converted_amount"]),
+            to_unit=to_unit
+        )
+    return None
+
+
+def answer_nutrition(query: str) -> Optional[str]:
+    """Answers a calories/macronutrients question, or returns None if any item doesn't parse or resolve exactly."""
+    for pattern in _NUTRITION_PATTERNS:
+        match = pattern.match(query)
+        if not match:
+            continue
+        item_texts = [text for text in _ITEM_SEPARATOR.split(match.group("items")) if text]
+        items: List[Dict] = []
+        for text in item_texts:
+            parsed = _parse_amount(text)
+            if parsed is None:
+                return None
+            items.append(to_calculator_units(parsed))
+        result = calculate_nutrition(items)
+        # Only exact names and registered aliases; approximate matches go to the agents
+        if result["status"] != "success" or result["items_not_found"] or result["resolved_names"]:
+            return None
+        macronutrients = {name: _format_number(value) for name, value in result["total_macronutrients"].items()}
+        return NUTRITION_TEMPLATE.format(
+            items=" and ".join(item_texts).capitalize(),
+            verb="contains" if len(item_texts) == 1 else "contain",
+            calories=_format_number(result["total_calories"]),
+            **macronutrients
+        )
+    return None
+
+
+def answer_locally(text: str) -> Optional[str]:
+    """Templated answer to a pure computation question, or None to leave it to the agents."""
+    query = _normalize_query(text)
+    answer = answer_nutrition(query) or answer_conversion(query)
+    _stats["answered" if answer is not None else "passed"] += 1
+    return answer
+
+
+def fast_path_stats() -> Dict:
+    """Questions answered without a model call, and questions passed to the agents (failed: by an error)."""
+    return dict(_stats)
+
+
+def fast_path_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """Before-model callback of the coordinator: answers computation questions without any model call."""
+    if not FAST_PATH_ENABLED:
+        return None
+    text = latest_user_text(llm_request)
+    if text is None:
+        return None
+    try:
+        answer = answer_locally(text)
+    except Exception:
+        # A question the local tools choke on is left to the agents
+        _stats["failed"] += 1
+        return None
+    if answer is None:
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=answer)]))
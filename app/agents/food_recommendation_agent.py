@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
 
 food_recommendation_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("FoodRecommendationAgent"),
     name="FoodRecommendationAgent",
     description="Recommends foods based on dietary preferences, health goals, and restrictions using web search",
     instruction="""You are a Personalized Food Recommendation Specialist who suggests foods based on individual needs and preferences.
@@ -48,5 +49,8 @@ food_recommendation_agent = LlmAgent(
     3. Provide meal ideas and preparation tips
     4. Include information about protein combining if relevant
     """,
-    tools=[google_search]
+    tools=[google_search],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 ) 
\ No newline at end of file
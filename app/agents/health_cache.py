@@ -0,0 +1,155 @@
+from typing import Optional
+import re
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from config import (
+    HEALTH_CACHE_DRAFT_SIMILARITY,
+    HEALTH_CACHE_ENABLED,
+    HEALTH_CACHE_MAX_ENTRIES,
+    HEALTH_CACHE_SIMILARITY,
+    HEALTH_CACHE_TTL_SECONDS,
+)
+from agents.response_cache import SemanticResponseCache, normalize_query
+from tools.health_condition_info import find_condition_terms
+
+# Topic-level cache for the health information workflow, which otherwise
+# runs researcher (with web search), editor and fact-checker in sequence for
+# every question, including conditions answered hundreds of times before.
+# Questions are reduced to a topic: the conditions they mention (aliases
+# resolve to the same condition) plus the remaining keywords. Only the
+# words of the alias that matched are dropped; qualifiers that change the
+# answer ("type 1", "gestational", "low"/"high") stay in the key. Entries
+# are scoped by the question's language, conditions and qualifiers, so a
+# type 1 answer is never served for type 2, nor an Indonesian answer to an
+# English question. Two caches with a TTL are kept:
+# - health_final_information per topic. A hit answers from the cache and
+#   skips the whole workflow.
+# - health_research_draft per condition and qualifiers (or per topic when no
+#   condition is named). A near-hit, such as a new question about a known
+#   condition, reuses the draft without a model call or web search, and only
+#   the editor and fact-checker run.
+
+CACHED_DRAFT_STATE_KEY = "temp:health_cached_draft"
+TOPIC_STATE_KEY = "temp:health_topic"
+
+# Words that don't change the topic of a health question
+_TOPIC_FILLER = {
+    "diet", "diets", "dietary", "food", "foods", "nutrition", "nutritional", "eat", "eating",
+    "information", "info", "explain", "know", "need", "should", "i", "how", "with", "and", "on",
+    "makanan", "untuk", "dan", "tentang", "penderita",
+}
+# Words that distinguish variants of a condition and so must stay in the key
+_QUALIFIERS = {
+    "type", "1", "2", "ii", "gestational", "pregnancy", "low", "high", "acute", "chronic",
+    "gestasional", "kehamilan", "hamil", "rendah", "tinggi", "akut", "kronis",
+}
+# Aliases that carry a qualifier inside one token
+_ALIAS_QUALIFIERS = {
+    "t1d": ("1", "type"), "dm1": ("1", "type"),
+    "t2d": ("2", "type"), "dm2": ("2", "type"),
+}
+# Common Indonesian words; a question with any of them is cached apart from English ones
+_INDONESIAN_WORDS = {
+    "apa", "apakah", "yang", "untuk", "dan", "atau", "dengan", "tentang", "bagi", "buat",
+    "makanan", "makan", "dimakan", "minuman", "penderita", "penyakit", "pantangan", "dihindari",
+    "boleh", "bisa", "tidak", "harus", "baik", "sehat", "saya", "cara",
+}
+_WORD = re.compile(r"\w+")
+
+final_cache = SemanticResponseCache(
+    max_entries=HEALTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=HEALTH_CACHE_TTL_SECONDS,
+    similarity=HEALTH_CACHE_SIMILARITY
+)
+draft_cache = SemanticResponseCache(
+    max_entries=HEALTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=HEALTH_CACHE_TTL_SECONDS,
+    similarity=HEALTH_CACHE_DRAFT_SIMILARITY
+)
+
+
+def question_language(text: str) -> str:
+    """"id" for a question with Indonesian words, otherwise "en"."""
+    return "id" if _INDONESIAN_WORDS.intersection(_WORD.findall(text.lower())) else "en"
+
+
+def health_topic(text: str) -> tuple:
+    """Returns (scope, condition topic, topic) of a health question.
+
+    Conditions are the names and aliases found as whole words in the text.
+    The scope is the question's language, conditions and qualifiers; cached
+    entries are only reused within the same scope. A question without a
+    recognised condition is scoped by its language alone. The condition topic
+    is the conditions plus qualifiers (empty when no condition is named), and
+    the topic adds the other keywords.
+    """
+    words = normalize_query(text)
+    terms = find_condition_terms(text)
+    language = question_language(text)
+    if not terms:
+        keywords = sorted({word for word in words if word not in _TOPIC_FILLER})
+        return language, "", " ".join(keywords)
+
+    conditions = sorted({condition for _, condition in terms})
+    qualifiers = {word for word in words if word in _QUALIFIERS}
+    matched_words = set()
+    for term, _ in terms:
+        for word in term.split():
+            qualifiers.update(_ALIAS_QUALIFIERS.get(word, ()))
+            if word not in _QUALIFIERS:
+                matched_words.add(word)
+    qualifiers = sorted(qualifiers)
+    keywords = sorted({
+        word for word in words
+        if word not in _TOPIC_FILLER and word not in matched_words and word not in _QUALIFIERS
+    })
+    scope = f"{language}:{' '.join(conditions)}:{' '.join(qualifiers)}"
+    return scope, " ".join(conditions + qualifiers), " ".join(conditions + qualifiers + keywords)
+
+
+def _user_text(callback_context) -> str:
+    user_content = callback_context.user_content
+    return " ".join(part.text for part in (user_content.parts or []) if part.text) if user_content else ""
+
+
+def health_cache_lookup_callback(callback_context) -> Optional[types.Content]:
+    """Before-agent callback of the workflow: answers a cached topic, or hands a cached draft to the researcher."""
+    if not HEALTH_CACHE_ENABLED:
+        return None
+    scope, condition_topic, topic = health_topic(_user_text(callback_context))
+    if not topic:
+        return None
+    callback_context.state[TOPIC_STATE_KEY] = topic
+    final_information = final_cache.lookup(topic, scope=scope)
+    if final_information is not None:
+        callback_context.state["health_final_information"] = final_information
+        return types.Content(role="model", parts=[types.Part(text=final_information)])
+    draft = draft_cache.lookup(condition_topic or topic, scope=scope)
+    if draft is not None:
+        callback_context.state[CACHED_DRAFT_STATE_KEY] = draft
+    return None
+
+
+def reuse_research_draft_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """Before-model callback of the researcher: returns the cached draft instead of researching again."""
+    draft = callback_context.state.get(CACHED_DRAFT_STATE_KEY)
+    if not draft:
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=draft)]))
+
+
+def health_cache_store_callback(callback_context) -> Optional[types.Content]:
+    """After-agent callback of the workflow: caches the final information and a freshly researched draft."""
+    if not HEALTH_CACHE_ENABLED:
+        return None
+    final_information = callback_context.state.get("health_final_information")
+    if not callback_context.state.get(TOPIC_STATE_KEY) or not final_information:
+        return None
+    scope, condition_topic, topic = health_topic(_user_text(callback_context))
+    final_cache.store(topic, final_information, scope=scope)
+    draft = callback_context.state.get("health_research_draft")
+    if draft and not callback_context.state.get(CACHED_DRAFT_STATE_KEY):
+        draft_cache.store(condition_topic or topic, draft, scope=scope)
+    return None
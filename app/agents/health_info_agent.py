@@ -1,10 +1,22 @@
+from typing import Optional
+
 from google.adk.agents import LlmAgent, SequentialAgent
+from google.adk.models import LlmResponse
 from google.adk.tools import google_search
-from config import MODEL_ID
+from google.genai import types
+
+from config import HEALTH_MERGED_EDIT_VERIFY, model_for
+from agents.health_cache import (
+    health_cache_lookup_callback,
+    health_cache_store_callback,
+    reuse_research_draft_callback,
+)
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from tools.health_condition_info import DISCLAIMER
 
 # 1. Research Agent: Searches for health information
 health_researcher_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("HealthResearcherAgent"),
     name="HealthResearcherAgent",
     description="Researches nutrition-related health information using web search",
     instruction="""You are a Health Information Researcher specialized in nutrition and health.
@@ -36,12 +48,17 @@ health_researcher_agent = LlmAgent(
     - Sources/references
     """,
     tools=[google_search],
-    output_key="health_research_draft"
+    output_key="health_research_draft",
+    # A draft cached for the same condition is reused without researching again;
+    # otherwise the model tier is escalated when needed
+    before_model_callback=[reuse_research_draft_callback, select_model_callback],
+    # Latency and cost are reported per model tier
+    after_model_callback=record_model_usage_callback
 )
 
 # 2. Editor Agent: Improves and structures the content
 health_editor_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("HealthEditorAgent"),
     name="HealthEditorAgent",
     description="Edits and improves health information for clarity and readability",
     instruction="""You are a Health Content Editor specialized in nutrition and health information.
@@ -72,12 +89,15 @@ health_editor_agent = LlmAgent(
     - Bullet points for lists
     - Maintained citations
     """,
-    output_key="health_edited_draft"
+    output_key="health_edited_draft",
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 )
 
 # 3. Fact-Checker Agent: Verifies information for accuracy
 health_fact_checker_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("HealthFactCheckerAgent"),
     name="HealthFactCheckerAgent",
     description="Verifies health information for accuracy and adds disclaimers",
     instruction="""You are a Health Information Fact-Checker specialized in nutrition and health content.
@@ -110,12 +130,15 @@ health_fact_checker_agent = LlmAgent(
     - Any corrections or additions needed
     - The required disclaimer at the end
     """,
-    output_key="health_final_information"
+    output_key="health_final_information",
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 )
 
 # 4. Main Health Information Agent: The entry point for health queries
 health_info_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("HealthInfoAgent"),
     name="HealthInfoAgent",
     description="Provides information about nutrition-related health conditions",
     instruction="""You are a Health Information Specialist focused on nutrition-related health conditions.
@@ -137,12 +160,79 @@ health_info_agent = LlmAgent(
     
     IMPORTANT:
     You are part of a workflow. Your role is to understand the user's question and formulate a clear query for the research process. The actual research, editing, and fact-checking will be handled by specialized agents in the workflow.
-    """
+    """,
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
+)
+
+
+def append_disclaimer_callback(callback_context, llm_response) -> Optional[LlmResponse]:
+    """After-model callback of the merged stage: appends the required disclaimer if it is missing."""
+    if llm_response.partial or llm_response.content is None or not llm_response.content.parts:
+        return None
+    text = "".join(part.text for part in llm_response.content.parts if part.text)
+    if not text or DISCLAIMER in text:
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=f"{text.rstrip()}\n\n{DISCLAIMER}")]))
+
+
+# 3b. Edit-and-Verify Agent: the editor and fact-checker in one pass, for the merged workflow
+health_edit_verify_agent = LlmAgent(
+    model=model_for("HealthEditVerifyAgent"),
+    name="HealthEditVerifyAgent",
+    description="Edits health information for readability and verifies it for accuracy in a single pass",
+    instruction="""You are a Health Content Editor and Fact-Checker specialized in nutrition and health information.
+    
+    TASK:
+    Turn the research draft into the final, clear and accurate health information in a single pass.
+    
+    PROCESS:
+    1. Read the research draft from the session state key 'health_research_draft'
+    2. Organize it with a logical flow, clear headings and bullet points, in plain language
+    3. While writing, verify each claim: correct or remove anything inaccurate or unsupported
+    4. Make sure no direct medical advice is given and the presentation is balanced
+    5. Keep all source citations
+    
+    GUIDELINES:
+    - Ensure all information is evidence-based and accurate
+    - Use plain language while maintaining accuracy
+    - Ensure a neutral, educational tone
+    - Do not write a disclaimer; the required disclaimer is appended automatically
+    
+    OUTPUT FORMAT:
+    Provide only the final health information with:
+    - Clear headings and subheadings
+    - Concise paragraphs
+    - Bullet points for lists
+    - Maintained citations
+    """,
+    output_key="health_final_information",
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=[record_model_usage_callback, append_disclaimer_callback]
 )
 
-# Create the sequential workflow
-health_info_workflow = SequentialAgent(
+# Create the sequential workflows
+health_info_three_stage_workflow = SequentialAgent(
     name="HealthInfoWorkflow",
     description="A sequential workflow for researching, editing, and fact-checking health information",
-    sub_agents=[health_researcher_agent, health_editor_agent, health_fact_checker_agent]
-) 
\ No newline at end of file
+    sub_agents=[health_researcher_agent, health_editor_agent, health_fact_checker_agent],
+    # Topics answered before skip the workflow (see agents/health_cache.py)
+    before_agent_callback=health_cache_lookup_callback,
+    after_agent_callback=health_cache_store_callback
+)
+
+# Merged variant: research, then one edit-and-verify stage instead of two full rewrites
+health_info_merged_workflow = SequentialAgent(
+    name="HealthInfoMergedWorkflow",
+    description="A sequential workflow for researching, then editing and fact-checking health information in one pass",
+    sub_agents=[
+        health_researcher_agent.clone(update={"name": "HealthMergedResearcherAgent"}),
+        health_edit_verify_agent,
+    ],
+    before_agent_callback=health_cache_lookup_callback,
+    after_agent_callback=health_cache_store_callback
+)
+
+health_info_workflow = health_info_merged_workflow if HEALTH_MERGED_EDIT_VERIFY else health_info_three_stage_workflow 
\ No newline at end of file
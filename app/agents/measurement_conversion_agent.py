@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
 
 measurement_conversion_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("MeasurementConversionAgent"),
     name="MeasurementConversionAgent",
     description="Converts food measurements between different units using web search",
     instruction="""You are a Food Measurement Conversion Specialist who helps users convert between different units of measurement for food ingredients.
@@ -47,5 +48,8 @@ measurement_conversion_agent = LlmAgent(
     3. Present the answer clearly with your calculation work
     4. Include any relevant notes about different types of flour if applicable
     """,
-    tools=[google_search]
+    tools=[google_search],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 ) 
\ No newline at end of file
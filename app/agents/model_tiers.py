@@ -0,0 +1,126 @@
+from typing import Dict, Optional, Tuple
+import time
+
+from google.adk.models import LlmResponse
+
+from config import (
+    AGENT_MODEL_TIERS,
+    DEFAULT_MODEL_TIER,
+    MODEL_ESCALATION_CONFIDENCE,
+    MODEL_ESCALATION_ENABLED,
+    MODEL_ESCALATION_PROMPT_TOKENS,
+    MODEL_TIER_PRICES,
+    MODEL_TIERS,
+)
+from agents.pre_router import get_pre_router, latest_user_text
+
+# Model tiers at run time. Agents get the model of their tier from config
+# (model_for), so cheap turns such as routing and editing run on the lite
+# model. Before each model call, a lite-tier agent is escalated to the
+# standard model when the turn looks hard:
+# - the routing confidence for the message is low;
+# - the prompt is long;
+# - the agent's previous call in the same turn failed or came back empty.
+# After each call, latency, tokens and cost are added up per tier.
+
+ESCALATION_TIERS = {"lite": "standard"}
+CHARS_PER_TOKEN = 4
+
+# (invocation id, agent) -> (start time, tier) of the call in flight
+_calls: Dict[Tuple[str, str], Tuple[float, str]] = {}
+# (invocation id, agent) of calls that failed, so the next one escalates
+_failed: Dict[Tuple[str, str], float] = {}
+FAILED_CALL_SECONDS = 300  # Failures older than this are forgotten
+
+_stats: Dict[str, Dict] = {}
+
+
+def _prompt_tokens(llm_request) -> int:
+    chars = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            chars += len(part.text or "")
+    return chars // CHARS_PER_TOKEN
+
+
+def escalation_reason(callback_context, llm_request) -> Optional[str]:
+    """Why a call should move to a larger model, or None."""
+    if (callback_context.invocation_id, callback_context.agent_name) in _failed:
+        return "previous_call_failed"
+    if _prompt_tokens(llm_request) > MODEL_ESCALATION_PROMPT_TOKENS:
+        return "long_prompt"
+    # Routing confidence only applies to calls answering the user's message itself
+    text = latest_user_text(llm_request)
+    user_content = callback_context.user_content
+    if text is not None and user_content is not None and text == " ".join(
+        part.text for part in (user_content.parts or []) if part.text
+    ):
+        _, confidence = get_pre_router().score(text)
+        if confidence < MODEL_ESCALATION_CONFIDENCE:
+            return "low_confidence"
+    return None
+
+
+def _tier_stats(tier: str) -> Dict:
+    return _stats.setdefault(tier, {
+        "calls": 0, "escalated_calls": 0, "failed_calls": 0,
+        "seconds": 0.0, "prompt_tokens": 0, "output_tokens": 0
+    })
+
+
+def select_model_callback(callback_context, llm_request) -> None:
+    """Before-model callback: escalates a lite-tier call when needed and starts timing it."""
+    agent_name = callback_context.agent_name
+    key = (callback_context.invocation_id, agent_name)
+    tier = AGENT_MODEL_TIERS.get(agent_name, DEFAULT_MODEL_TIER)
+    if MODEL_ESCALATION_ENABLED and tier in ESCALATION_TIERS:
+        if escalation_reason(callback_context, llm_request) is not None:
+            tier = ESCALATION_TIERS[tier]
+            llm_request.model = MODEL_TIERS[tier]
+            _tier_stats(tier)["escalated_calls"] += 1
+    _calls[key] = (time.perf_counter(), tier)
+    return None
+
+
+def record_model_usage_callback(callback_context, llm_response) -> Optional[LlmResponse]:
+    """After-model callback: adds the call's latency, tokens and cost to its tier; never changes the response."""
+    if llm_response.partial:
+        return None
+    key = (callback_context.invocation_id, callback_context.agent_name)
+    started = _calls.pop(key, None)
+    if started is None:
+        return None  # Answered by a callback, not a model
+    start, tier = started
+    stats = _tier_stats(tier)
+    stats["calls"] += 1
+    stats["seconds"] += time.perf_counter() - start
+    usage = llm_response.usage_metadata
+    if usage is not None:
+        stats["prompt_tokens"] += usage.prompt_token_count or 0
+        stats["output_tokens"] += usage.candidates_token_count or 0
+
+    now = time.time()
+    for failed in [failed for failed, at in _failed.items() if now - at > FAILED_CALL_SECONDS]:
+        del _failed[failed]
+    if llm_response.error_code or llm_response.content is None or not llm_response.content.parts:
+        stats["failed_calls"] += 1
+        _failed[key] = now
+    else:
+        _failed.pop(key, None)
+    return None
+
+
+def model_tier_stats() -> Dict[str, Dict]:
+    """Calls, escalations, latency, tokens and estimated cost (USD) per tier."""
+    report = {}
+    for tier, stats in _stats.items():
+        input_price, output_price = MODEL_TIER_PRICES.get(tier, (0.0, 0.0))
+        cost = (stats["prompt_tokens"] * input_price + stats["output_tokens"] * output_price) / 1e6
+        report[tier] = {
+            **stats,
+            "model": MODEL_TIERS.get(tier),
+            "seconds": round(stats["seconds"], 3),
+            "avg_latency_ms": round(stats["seconds"] * 1000 / stats["calls"], 1) if stats["calls"] else 0.0,
+            "cost_usd": round(cost, 6)
+        }
+    return report
@@ -1,9 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
 
 nutrition_info_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("NutritionInfoAgent"),
     name="NutritionInfoAgent",
     description="Provides detailed nutritional information about specific foods using web search",
     instruction="""You are a Nutrition Information Specialist who provides detailed nutritional data about foods.
@@ -41,5 +42,8 @@ nutrition_info_agent = LlmAgent(
     EXAMPLES:
     For a query about apples, search for current nutritional data about apples and provide information about calories, macronutrients, fiber, vitamins, minerals, and any notable health benefits, with proper citations.
     """,
-    tools=[google_search]
+    tools=[google_search],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback
 ) 
\ No newline at end of file
@@ -1,14 +1,29 @@
 from google.adk.agents import LlmAgent
-from config import MODEL_ID
-from tools import local_rag_tool
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from agents.prefetch import discard_prefetches_callback, use_prefetch_callback
+from agents.response_cache import cache_response_callback
+from agents.tool_compaction import compact_tool_output_callback
+from tools import local_rag_tool, recipe_scaling_tool
 
 # Nutritionist AI Agent: backed by local RAG knowledge source
 nutritionist_rag_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("NutritionistRAGAgent"),
     name="NutritionistRAGAgent",
     description="Nutritionist agent using RAG over prepared knowledge sources",
     instruction="""
 You are a licensed-style nutritionist assistant. Ground your answers using the provided RAG tool that accesses curated knowledge sources we maintain. Quote or summarize relevant snippets and keep advice educational.
+When the user wants a recipe scaled to a number of servings or asks for nutrition per serving of a recipe, call the recipe scaling tool once with all ingredient lines instead of converting and calculating each ingredient separately.
 """,
-    tools=[local_rag_tool],
+    tools=[local_rag_tool, recipe_scaling_tool],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    # Results prefetched while the coordinator was routing are used directly
+    before_tool_callback=use_prefetch_callback,
+    # Tool results are compacted to a token budget before the model sees them
+    after_tool_callback=compact_tool_output_callback,
+    # General answers are reused for similar questions through the response cache
+    after_model_callback=[record_model_usage_callback, cache_response_callback],
+    # The request ends with this specialist's answer; unused prefetches are dropped
+    after_agent_callback=discard_prefetches_callback,
 )
@@ -1,14 +1,27 @@
 from google.adk.agents import LlmAgent
-from config import MODEL_ID
-from tools import user_profile_tool, user_calorie_history_tool
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from agents.prefetch import discard_prefetches_callback, use_prefetch_callback
+from agents.tool_compaction import compact_tool_output_callback
+from tools import user_profile_tool, user_calorie_history_tool, daily_targets_tool
 
 # Personal AI Agent: hits backend APIs for user data and calorie history
 personal_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("PersonalAIAgent"),
     name="PersonalAIAgent",
     description="Personal agent accessing user profile and calorie history via backend APIs",
     instruction="""
 You help with personalization. Use the available API tools to retrieve user profile data and calorie history. Never invent user data; if missing, state what is needed.
+For calorie, BMR/TDEE or macronutrient needs, use the daily targets tool instead of calculating them yourself.
 """,
-    tools=[user_profile_tool, user_calorie_history_tool],
+    tools=[user_profile_tool, user_calorie_history_tool, daily_targets_tool],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    after_model_callback=record_model_usage_callback,
+    # Results prefetched while the coordinator was routing are used directly
+    before_tool_callback=use_prefetch_callback,
+    # Tool results are compacted to a token budget before the model sees them
+    after_tool_callback=compact_tool_output_callback,
+    # The request ends with this specialist's answer; unused prefetches are dropped
+    after_agent_callback=discard_prefetches_callback,
 )
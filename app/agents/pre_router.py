@@ -0,0 +1,359 @@
+"""
+Local pre-router for the NutriAgentCoordinator.
+
+Picking a specialist costs the coordinator a full model generation on every
+turn. The pre-router scores the user's message locally, with keyword rules
+and a TF-IDF + logistic regression classifier, and when it is confident it
+hands off to the specialist directly: the coordinator's before-model
+callback answers with a transfer_to_agent call instead of calling the
+model. Ambiguous messages still go to the model.
+
+The classifier is trained from labelled transcripts, one JSON object per
+line with the user message and the agent that handled it:
+    {"query": "what did I eat yesterday?", "agent": "PersonalAIAgent"}
+
+Run from the app directory to train a model file (set PRE_ROUTER_MODEL_PATH
+to use it) or to see how a message would be routed:
+    python -m agents.pre_router train transcripts.jsonl pre_router.json
+    python -m agents.pre_router route "latest research on intermittent fasting"
+Without a model file, the classifier is trained on SEED_EXAMPLES.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import re
+
+import numpy as np
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from config import (
+    FAN_OUT_ENABLED,
+    FAN_OUT_MIN_PROBABILITY,
+    PRE_ROUTER_ENABLED,
+    PRE_ROUTER_MIN_CONFIDENCE,
+    PRE_ROUTER_MODEL_PATH,
+)
+
+RESEARCH_AGENT = "ResearchAIAgent"
+RAG_AGENT = "NutritionistRAGAgent"
+PERSONAL_AGENT = "PersonalAIAgent"
+ROUTE_AGENTS = [RESEARCH_AGENT, RAG_AGENT, PERSONAL_AGENT]
+FAN_OUT_AGENT = "MultiDomainAgent"  # Runs several specialists concurrently (agents/fan_out_agent.py)
+
+# Phrases that settle the route on their own, English and Indonesian. They
+# skip the model at KEYWORD_CONFIDENCE, so they name the data or source
+# explicitly; generic words ("search", "did i") are left to the classifier.
+KEYWORD_RULES = {
+    PERSONAL_AGENT: [
+        r"\bmy (profile|account|data|history|calorie history|calories|intake|log|logs|goal|goals|weight|progress|targets?)\b",
+        r"\b(did|have) i (eat|eaten|ate|drink|drank|log|logged|consume|consumed|burn|burned|hit|reach|reached|meet|met)\b",
+        r"\b(i ate|i've eaten|i have eaten|i logged|i've logged)\b",
+        r"\b(profil|riwayat|data|target|berat badan|asupan) saya\b",
+        r"\bsaya (makan|konsumsi)\b",
+    ],
+    RESEARCH_AGENT: [
+        r"\b(latest|newest|recent|new|current) (research|study|studies|evidence|findings|guidelines|news|data)\b",
+        r"\b(in|since) 20\d\d\b",
+        r"\b(search|look up|google)( the)? (web|online|internet|for (research|studies|articles|news))\b",
+        r"\bgoogle (what|how|whether|if|the)\b",
+        r"\b(penelitian|studi|berita|riset) (terbaru|terkini)\b",
+    ],
+}
+KEYWORD_CONFIDENCE = 0.95
+
+# Built-in labelled examples, used when no trained model file is configured
+SEED_EXAMPLES = [
+    ("show my profile", PERSONAL_AGENT),
+    ("what is my calorie history for last week", PERSONAL_AGENT),
+    ("how many calories did I eat yesterday", PERSONAL_AGENT),
+    ("am I on track with my goal", PERSONAL_AGENT),
+    ("what are my daily calorie needs", PERSONAL_AGENT),
+    ("how much protein should I eat per day based on my weight", PERSONAL_AGENT),
+    ("update me on my progress this month", PERSONAL_AGENT),
+    ("compare my intake with my targets", PERSONAL_AGENT),
+    ("berapa kalori yang saya makan kemarin", PERSONAL_AGENT),
+    ("lihat profil saya", PERSONAL_AGENT),
+    ("berapa kebutuhan kalori harian saya", PERSONAL_AGENT),
+    ("latest research on intermittent fasting", RESEARCH_AGENT),
+    ("what do recent studies say about red meat and cancer", RESEARCH_AGENT),
+    ("new guidelines for sugar intake", RESEARCH_AGENT),
+    ("find news about the mediterranean diet", RESEARCH_AGENT),
+    ("search the web for ozempic and nutrition", RESEARCH_AGENT),
+    ("what is the current evidence on seed oils", RESEARCH_AGENT),
+    ("latest nutrition facts for avocado", RESEARCH_AGENT),
+    ("is there new research on artificial sweeteners", RESEARCH_AGENT),
+    ("penelitian terbaru tentang puasa", RESEARCH_AGENT),
+    ("berita terkini soal gula", RESEARCH_AGENT),
+    ("what foods are high in iron", RAG_AGENT),
+    ("how much fiber is in lentils", RAG_AGENT),
+    ("explain the difference between soluble and insoluble fiber", RAG_AGENT),
+    ("what should I eat for a healthy heart", RAG_AGENT),
+    ("is rice good for diabetes", RAG_AGENT),
+    ("what are good sources of vitamin d", RAG_AGENT),
+    ("scale this recipe to 6 servings", RAG_AGENT),
+    ("how many calories are in a banana", RAG_AGENT),
+    ("give me a vegetarian meal idea with protein", RAG_AGENT),
+    ("what is a balanced breakfast", RAG_AGENT),
+    ("makanan apa yang tinggi kalsium", RAG_AGENT),
+    ("apakah nasi merah lebih sehat", RAG_AGENT),
+]
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words and word bigrams."""
+    words = _TOKEN.findall(text.lower())
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+class RouteClassifier:
+    """TF-IDF features with a multinomial logistic regression over the route agents.
+
+    Args:
+        labels: Agent name of each output
+        vocabulary: Term -> feature index
+        idf: Inverse document frequency of each feature
+        weights: Feature weights, shape (features, labels)
+        bias: Bias of each label
+    """
+
+    def __init__(self, labels: List[str], vocabulary: Dict[str, int], idf: np.ndarray, weights: np.ndarray, bias: np.ndarray):
+        self.labels = labels
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+
+    def features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse L2-normalized TF-IDF vector of a text, as (indices, values)."""
+        counts: Dict[int, int] = {}
+        for term in tokenize(text):
+            index = self.vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+        indices = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * self.idf[indices]
+        norm = np.linalg.norm(values)
+        return indices, values / norm if norm > 0 else values
+
+    def predict(self, text: str) -> Dict[str, float]:
+        """Probability of every route agent."""
+        indices, values = self.features(text)
+        logits = values @ self.weights[indices] + self.bias
+        probabilities = np.exp(logits - logits.max())
+        probabilities /= probabilities.sum()
+        return dict(zip(self.labels, probabilities.tolist()))
+
+    @classmethod
+    def train(cls, examples: List[Tuple[str, str]], epochs: int = 300, learning_rate: float = 1.0, l2: float = 1e-3) -> "RouteClassifier":
+        """Fits the classifier to (text, agent) examples with full-batch gradient descent."""
+        labels = sorted({label for _, label in examples})
+        documents = [tokenize(text) for text, _ in examples]
+        vocabulary: Dict[str, int] = {}
+        for terms in documents:
+            for term in terms:
+                vocabulary.setdefault(term, len(vocabulary))
+        document_frequency = np.zeros(len(vocabulary))
+        for terms in documents:
+            document_frequency[[vocabulary[term] for term in set(terms)]] += 1
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+
+        classifier = cls(labels, vocabulary, idf, np.zeros((len(vocabulary), len(labels))), np.zeros(len(labels)))
+        x = np.zeros((len(examples), len(vocabulary)))
+        for row, (text, _) in enumerate(examples):
+            indices, values = classifier.features(text)
+            x[row, indices] = values
+        y = np.zeros((len(examples), len(labels)))
+        y[np.arange(len(examples)), [labels.index(label) for _, label in examples]] = 1
+
+        for _ in range(epochs):
+            logits = x @ classifier.weights + classifier.bias
+            probabilities = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            error = (probabilities - y) / len(examples)
+            classifier.weights -= learning_rate * (x.T @ error + l2 * classifier.weights)
+            classifier.bias -= learning_rate * error.sum(axis=0)
+        return classifier
+
+    def to_dict(self) -> Dict:
+        return {
+            "labels": self.labels,
+            "vocabulary": self.vocabulary,
+            "idf": self.idf.tolist(),
+            "weights": self.weights.tolist(),
+            "bias": self.bias.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RouteClassifier":
+        return cls(
+            data["labels"],
+            data["vocabulary"],
+            np.asarray(data["idf"], dtype=np.float64),
+            np.asarray(data["weights"], dtype=np.float64),
+            np.asarray(data["bias"], dtype=np.float64)
+        )
+
+
+def read_transcripts(path: str) -> List[Tuple[str, str]]:
+    """Reads (message, agent) examples from a JSONL file of labelled transcripts."""
+    examples = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                record = json.loads(line)
+                text = record.get("query") or record.get("text")
+                label = record.get("agent") or record.get("label")
+                if text and label in ROUTE_AGENTS:
+                    examples.append((text, label))
+    return examples
+
+
+class PreRouter:
+    """Routes a message to a specialist when keyword rules or the classifier are confident.
+
+    Args:
+        classifier: Trained route classifier
+        min_confidence: Lowest classifier probability that is routed locally
+    """
+
+    def __init__(self, classifier: RouteClassifier, min_confidence: float = PRE_ROUTER_MIN_CONFIDENCE):
+        self.classifier = classifier
+        self.min_confidence = min_confidence
+        self._rules = [
+            (agent, re.compile(pattern))
+            for agent, patterns in KEYWORD_RULES.items()
+            for pattern in patterns
+        ]
+        self.routed = {agent: 0 for agent in ROUTE_AGENTS + [FAN_OUT_AGENT]}
+        self.deferred = 0
+
+    def _matched(self, text: str) -> set:
+        return {agent for agent, rule in self._rules if rule.search(text)}
+
+    def score(self, text: str) -> Tuple[Optional[str], float]:
+        """Returns the best agent and its confidence; rules decide when exactly one agent's rules match."""
+        text = text.lower()
+        matched = self._matched(text)
+        if len(matched) == 1:
+            return matched.pop(), KEYWORD_CONFIDENCE
+        probabilities = self.classifier.predict(text)
+        agent = max(probabilities, key=probabilities.get)
+        return agent, probabilities[agent]
+
+    def domains(self, text: str, min_probability: float = FAN_OUT_MIN_PROBABILITY) -> List[str]:
+        """Every specialist a message needs: those whose rules match or whose probability is at least min_probability."""
+        text = text.lower()
+        matched = self._matched(text)
+        probabilities = self.classifier.predict(text)
+        return [
+            agent for agent in ROUTE_AGENTS
+            if agent in matched or probabilities.get(agent, 0.0) >= min_probability
+        ]
+
+    def route(self, text: str) -> Optional[str]:
+        """The agent to hand off to, or None to leave the decision to the model."""
+        if FAN_OUT_ENABLED and len(self._matched(text.lower())) > 1:
+            # Rules of several specialists match: run them together
+            self.routed[FAN_OUT_AGENT] += 1
+            return FAN_OUT_AGENT
+        agent, confidence = self.score(text)
+        if agent is None or confidence < self.min_confidence:
+            self.deferred += 1
+            return None
+        self.routed[agent] += 1
+        return agent
+
+    def stats(self) -> Dict:
+        """Messages routed locally per agent, and messages left to the model."""
+        total = sum(self.routed.values()) + self.deferred
+        return {
+            "routed": dict(self.routed),
+            "deferred_to_model": self.deferred,
+            "local_rate": round(sum(self.routed.values()) / total, 3) if total else 0.0
+        }
+
+
+_router: Optional[PreRouter] = None
+
+
+def get_pre_router() -> PreRouter:
+    """Returns the shared pre-router, loading or training its classifier on first use."""
+    global _router
+    if _router is None:
+        if PRE_ROUTER_MODEL_PATH:
+            with open(PRE_ROUTER_MODEL_PATH, encoding="utf-8") as fh:
+                classifier = RouteClassifier.from_dict(json.load(fh))
+        else:
+            classifier = RouteClassifier.train(SEED_EXAMPLES)
+        _router = PreRouter(classifier)
+    return _router
+
+
+def latest_user_text(llm_request) -> Optional[str]:
+    """Text of the request's last content if it is a fresh user message, else None."""
+    if not llm_request.contents:
+        return None
+    content = llm_request.contents[-1]
+    if content.role != "user" or not content.parts:
+        return None
+    if any(part.function_response is not None for part in content.parts):
+        return None
+    text = " ".join(part.text for part in content.parts if part.text)
+    return text or None
+
+
+def pre_route_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """Before-model callback of the coordinator: hands off without a model call when confident."""
+    if not PRE_ROUTER_ENABLED:
+        return None
+    text = latest_user_text(llm_request)
+    if text is None:
+        return None
+    agent = get_pre_router().route(text)
+    if agent is None:
+        return None
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(name="transfer_to_agent", args={"agent_name": agent}))]
+        )
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="Train a model file from labelled transcripts")
+    train.add_argument("transcripts", help="JSONL file with query and agent per line")
+    train.add_argument("out_path", help="Model file to write")
+    train.add_argument("--include-seed", action="store_true", help="Also train on the built-in examples")
+    route = commands.add_parser("route", help="Show how a message would be routed")
+    route.add_argument("message")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        examples = read_transcripts(args.transcripts)
+        if args.include_seed:
+            examples += SEED_EXAMPLES
+        classifier = RouteClassifier.train(examples)
+        with open(args.out_path, "w", encoding="utf-8") as fh:
+            json.dump(classifier.to_dict(), fh)
+        correct = sum(
+            max(classifier.predict(text).items(), key=lambda item: item[1])[0] == label
+            for text, label in examples
+        )
+        print(f"Trained on {len(examples)} examples, {len(classifier.vocabulary)} terms; "
+              f"training accuracy {correct / max(len(examples), 1):.1%}")
+    else:
+        router = get_pre_router()
+        agent, confidence = router.score(args.message)
+        decision = agent if confidence >= router.min_confidence else "model (coordinator)"
+        print(f"{decision}  [best: {agent}, confidence {confidence:.2f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import asyncio
+import inspect
+import re
+import time
+
+from config import PREFETCH_ENABLED, PREFETCH_MIN_PROBABILITY, PREFETCH_RAG_MIN_PROBABILITY, PREFETCH_WORKERS
+from agents.pre_router import PERSONAL_AGENT, RAG_AGENT, get_pre_router, latest_user_text
+from tools import local_rag_tool, user_profile_tool
+
+# Speculative prefetch while the coordinator is routing. Normally the RAG
+# lookup and the profile fetch only start after the coordinator has picked a
+# specialist and that specialist's model has decided to call the tool: two
+# model latencies before any I/O. Here both start in the background as soon
+# as a message arrives, when cheap signals suggest they will be needed (the
+# pre-router's probability for the specialist, and a known user id for the
+# profile). The specialist's tool call then takes the prefetched result from
+# a request-scoped cache, keyed on the tool and its normalized arguments.
+# Prefetches the request didn't use are discarded when it ends, and the hit
+# rate is reported per tool.
+#
+# The RAG prefetch searches for the user's message itself, but rag_query
+# ranks by the exact query text and the specialist usually writes a query of
+# its own, so a looser (semantic) match would hand it other results than it
+# asked for. It is therefore only started when the pre-router is confident
+# the Nutritionist agent will answer (PREFETCH_RAG_MIN_PROBABILITY).
+
+# Prefetched tools: name -> function; calls with the same normalized arguments use the prefetch.
+# The tools' own (memoized) functions are called, so a prefetch also fills the tool cache.
+PREFETCH_TOOLS = {tool.name: tool.func for tool in (local_rag_tool, user_profile_tool)}
+STALE_PREFETCH_SECONDS = 300  # Requests that never ended are swept after this long
+
+_USER_ID_PATTERN = re.compile(r"\buser(?:[ _-]?id)?\s*[:=#]?\s*([A-Za-z0-9_-]*\d[A-Za-z0-9_-]*)\b", re.IGNORECASE)
+_USER_ID_STATE_KEYS = ("user_id", "user:user_id", "user:id")
+
+_executor: Optional[ThreadPoolExecutor] = None
+# invocation id -> (start time, {(tool name, arguments): future})
+_prefetches: Dict[str, Tuple[float, Dict[Tuple, Future]]] = {}
+# tool name -> prefetches started, used and discarded
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+    return _executor
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return value
+
+
+def prefetch_key(tool_name: str, args: Dict) -> Optional[Tuple]:
+    """Cache key of a tool call: the tool and its arguments with defaults filled in, or None if they don't bind."""
+    try:
+        bound = inspect.signature(PREFETCH_TOOLS[tool_name]).bind(**args)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    return (tool_name,) + tuple(sorted((name, _normalize_value(value)) for name, value in bound.arguments.items()))
+
+
+def find_user_id(text: str, state) -> Optional[str]:
+    """The user id from session state, or one written in the message ("user 42", "user_id: abc1")."""
+    for key in _USER_ID_STATE_KEYS:
+        if state.get(key):
+            return str(state.get(key))
+    match = _USER_ID_PATTERN.search(text)
+    return match.group(1) if match else None
+
+
+def _tool_stats(tool_name: str) -> Dict[str, int]:
+    return _stats.setdefault(tool_name, {"started": 0, "used": 0, "discarded": 0})
+
+
+def _discard(invocation_id: str) -> None:
+    _, futures = _prefetches.pop(invocation_id, (0.0, {}))
+    for key, future in futures.items():
+        future.cancel()
+        _tool_stats(key[0])["discarded"] += 1
+
+
+def start_prefetches(invocation_id: str, text: str, state) -> int:
+    """Starts the prefetches a message warrants; returns how many were started."""
+    now = time.time()
+    for stale in [key for key, (started, _) in _prefetches.items() if now - started > STALE_PREFETCH_SECONDS]:
+        _discard(stale)
+    if invocation_id in _prefetches:
+        return 0
+
+    router = get_pre_router()
+    domains = router.domains(text, PREFETCH_MIN_PROBABILITY)
+    calls = []
+    if RAG_AGENT in router.domains(text, PREFETCH_RAG_MIN_PROBABILITY):
+        calls.append(("rag_query", {"query": text}))
+    user_id = find_user_id(text, state)
+    if PERSONAL_AGENT in domains and user_id:
+        calls.append(("get_user_profile", {"user_id": user_id}))
+
+    futures = {}
+    for tool_name, args in calls:
+        futures[prefetch_key(tool_name, args)] = _get_executor().submit(PREFETCH_TOOLS[tool_name], **args)
+        _tool_stats(tool_name)["started"] += 1
+    _prefetches[invocation_id] = (now, futures)
+    return len(futures)
+
+
+def _with_hit_rate(stats: Dict[str, int]) -> Dict:
+    return {**stats, "hit_rate": round(stats["used"] / stats["started"], 3) if stats["started"] else 0.0}
+
+
+def prefetch_stats() -> Dict:
+    """Prefetches started, used by a specialist's tool call and discarded unused, in total and per tool."""
+    total = {field: sum(stats[field] for stats in _stats.values()) for field in ("started", "used", "discarded")}
+    return {**_with_hit_rate(total), "tools": {name: _with_hit_rate(stats) for name, stats in _stats.items()}}
+
+
+def prefetch_callback(callback_context, llm_request) -> None:
+    """Before-model callback of the coordinator: starts prefetches for a new message, never answers."""
+    if not PREFETCH_ENABLED:
+        return None
+    text = latest_user_text(llm_request)
+    if text is not None:
+        start_prefetches(callback_context.invocation_id, text, callback_context.state)
+    return None
+
+
+async def use_prefetch_callback(tool, args, tool_context) -> Optional[Dict]:
+    """Before-tool callback of the specialists: answers a tool call from this request's prefetch."""
+    if tool.name not in PREFETCH_TOOLS:
+        return None
+    _, futures = _prefetches.get(tool_context.invocation_id, (0.0, {}))
+    future = futures.pop(prefetch_key(tool.name, args), None)
+    if future is None or future.cancelled():
+        return None
+    _tool_stats(tool.name)["used"] += 1
+    return await asyncio.wrap_future(future)
+
+
+def discard_prefetches_callback(callback_context) -> None:
+    """After-agent callback of the agents that end a request: drops its unused prefetches."""
+    _discard(callback_context.invocation_id)
+    return None
@@ -1,14 +1,26 @@
 from google.adk.agents import LlmAgent
-from config import MODEL_ID
+from config import model_for
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from agents.prefetch import discard_prefetches_callback
+from agents.response_cache import cache_response_callback
+from agents.tool_compaction import compact_tool_output_callback
 from tools import web_search, latest_nutrition_facts_tool
 
 # Research AI Agent: can use web search and latest nutrition facts API
 research_agent = LlmAgent(
-    model=MODEL_ID,
+    model=model_for("ResearchAIAgent"),
     name="ResearchAIAgent",
     description="Researches nutrition topics using web search and latest nutrition facts API",
     instruction="""
 You are a research specialist. Use web search for broad context and the latest nutrition facts API for concrete data points. Always cite sources and prefer authoritative references.
 """,
     tools=[web_search, latest_nutrition_facts_tool],
+    # The model tier is escalated when needed, and latency and cost are reported per tier
+    before_model_callback=select_model_callback,
+    # Tool results are compacted to a token budget before the model sees them
+    after_tool_callback=compact_tool_output_callback,
+    # General answers are reused for similar questions through the response cache
+    after_model_callback=[record_model_usage_callback, cache_response_callback],
+    # The request ends with this specialist's answer; unused prefetches are dropped
+    after_agent_callback=discard_prefetches_callback,
 )
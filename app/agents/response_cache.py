@@ -0,0 +1,244 @@
+from typing import Dict, List, Optional
+import re
+import time
+import zlib
+
+import numpy as np
+from google.adk.models import LlmResponse
+from google.genai import types
+
+from config import (
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_SIMILARITY,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from agents.pre_router import KEYWORD_CONFIDENCE, PERSONAL_AGENT, get_pre_router, latest_user_text
+
+# Semantic response cache in front of the coordinator. General questions
+# that are practically the same ("is avocado healthy?", "Is an avocado
+# healthy") get the answer a specialist gave before, without running the
+# coordinator, the specialist or its tools again. Queries are normalized and
+# embedded locally (hashed words and character trigrams, L2-normalized), and
+# a cached answer is reused when its query's cosine similarity reaches
+# RESPONSE_CACHE_SIMILARITY. A bag of words can't tell "more potassium" from
+# "less potassium" or vitamin A from vitamin D, so the words that change the
+# meaning (numbers, the letter after "vitamin", more/less, high/low,
+# ordinals, negations) form an exact-match scope, and the embedding only
+# absorbs typos, plurals and word order. Entries expire after RESPONSE_CACHE_TTL_SECONDS
+# and the least recently used entry is evicted when the cache is full.
+# Personal questions, and anything answered by PersonalAIAgent, are never
+# cached or served from the cache. Neither are follow-ups: only the first
+# user message of a session is looked up or stored, since "is it safe?"
+# means something else in every conversation. Queries with fewer than
+# MIN_QUERY_WORDS words besides stopwords and pronouns are skipped too.
+
+EMBEDDING_DIMENSIONS = 1024
+TRIGRAM_WEIGHT = 0.5  # Character trigrams smooth over typos and plurals; words dominate
+
+# Personal-route probability from which a query counts as personal
+PERSONAL_BYPASS_PROBABILITY = 0.3
+
+# Fewest normalized words, not counting pronouns, of a cacheable query
+MIN_QUERY_WORDS = 2
+_PRONOUNS = {
+    "this", "that", "these", "those", "they", "them", "he", "she", "him", "her", "one", "ones",
+    "ini", "tersebut", "dia", "mereka", "nya",
+}
+
+# Words dropped before embedding; negations are kept on purpose
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "do", "does", "can", "could", "would",
+    "please", "tell", "me", "about", "of", "to", "for", "it", "its", "what", "whats",
+    "apa", "apakah", "itu", "yang", "tolong",
+}
+_WORD = re.compile(r"\w+")
+_CONTRACTED_NOT = re.compile(r"n['’]t\b")
+
+# Words that turn a question into a different one; they must match exactly
+_MEANING_WORDS = {
+    "more", "less", "fewer", "most", "least", "higher", "lower", "high", "low",
+    "increase", "decrease", "raise", "reduce", "before", "after",
+    "first", "second", "third", "fourth", "not", "no", "never", "without", "nor",
+    "lebih", "kurang", "tinggi", "rendah", "tidak", "bukan", "jangan", "tanpa",
+    "sebelum", "sesudah", "setelah", "pertama", "kedua", "ketiga",
+}
+# Words followed by a letter or code that names the nutrient ("vitamin a", "vitamin b12")
+_NAMING_WORDS = {"vitamin", "vitamins", "vit"}
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(_CONTRACTED_NOT.sub(" not", text.lower()))
+
+
+def normalize_query(text: str) -> List[str]:
+    """Lowercase words without punctuation and stopwords; the "a" of "vitamin a" is kept."""
+    words = _words(text)
+    return [
+        word for i, word in enumerate(words)
+        if word not in _STOPWORDS or (i > 0 and words[i - 1] in _NAMING_WORDS)
+    ]
+
+
+def meaning_scope(text: str) -> str:
+    """The words of a query that change its meaning, in order: numbers, vitamin letters, more/less, negations."""
+    words = _words(text)
+    return " ".join(
+        word for i, word in enumerate(words)
+        if word in _MEANING_WORDS or any(c.isdigit() for c in word) or (i > 0 and words[i - 1] in _NAMING_WORDS)
+    )
+
+
+def embed_query(text: str) -> np.ndarray:
+    """Hashed bag of words and character trigrams of the normalized query, with unit length."""
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+    for word in normalize_query(text):
+        vector[zlib.crc32(word.encode("utf-8")) % EMBEDDING_DIMENSIONS] += 1.0
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(("#" + padded[i:i + 3]).encode("utf-8")) % EMBEDDING_DIMENSIONS] += TRIGRAM_WEIGHT
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class SemanticResponseCache:
+    """Answers keyed on query embeddings, with a similarity threshold, TTL and LRU eviction.
+
+    An optional scope partitions the entries: a lookup only matches entries
+    stored with exactly the same scope, however similar the queries are.
+
+    Args:
+        max_entries: Most answers kept
+        ttl_seconds: Seconds an answer stays valid
+        similarity: Lowest cosine similarity at which a cached answer is reused
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        similarity: float = RESPONSE_CACHE_SIMILARITY
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self.embeddings = np.zeros((max_entries, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        self.expires = np.zeros(max_entries)  # 0 marks a free slot
+        self.last_used = np.zeros(max_entries)
+        self.scopes = np.full(max_entries, "", dtype=object)
+        self.queries: List[Optional[str]] = [None] * max_entries
+        self.answers: List[Optional[str]] = [None] * max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def _best(self, embedding: np.ndarray, now: float, scope: str) -> Optional[int]:
+        """Slot of the most similar live entry of the scope at or above the threshold."""
+        similarities = self.embeddings @ embedding
+        similarities[(self.expires <= now) | (self.scopes != scope)] = -1.0
+        slot = int(np.argmax(similarities))
+        return slot if similarities[slot] >= self.similarity else None
+
+    def lookup(self, query: str, scope: str = "") -> Optional[str]:
+        now = time.time()
+        slot = self._best(embed_query(query), now, scope)
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.last_used[slot] = now
+        return self.answers[slot]
+
+    def store(self, query: str, answer: str, scope: str = "") -> None:
+        now = time.time()
+        embedding = embed_query(query)
+        if not embedding.any():
+            return
+        # A near-identical query replaces its entry instead of taking a new slot
+        slot = self._best(embedding, now, scope)
+        if slot is None:
+            free = np.flatnonzero(self.expires <= now)
+            if len(free):
+                slot = int(free[0])
+            else:
+                slot = int(np.argmin(self.last_used))
+                self.evictions += 1
+        self.embeddings[slot] = embedding
+        self.expires[slot] = now + self.ttl_seconds
+        self.last_used[slot] = now
+        self.scopes[slot] = scope
+        self.queries[slot] = query
+        self.answers[slot] = answer
+
+    def clear(self) -> None:
+        self.expires[:] = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": int(np.count_nonzero(self.expires > time.time())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+response_cache = SemanticResponseCache()
+
+
+def is_personal(text: str) -> bool:
+    """Whether a query is about the user's own data, judged by the pre-router."""
+    router = get_pre_router()
+    agent, confidence = router.score(text)
+    if agent == PERSONAL_AGENT and confidence >= KEYWORD_CONFIDENCE:
+        return True
+    return router.classifier.predict(text).get(PERSONAL_AGENT, 0.0) >= PERSONAL_BYPASS_PROBABILITY
+
+
+def is_first_turn(callback_context) -> bool:
+    """Whether the current user message is the first one of the session."""
+    user_messages = [
+        event for event in callback_context.session.events
+        if event.author == "user" and event.content and any(part.text for part in event.content.parts or [])
+    ]
+    return len(user_messages) <= 1
+
+
+def is_cacheable(callback_context, text: str) -> bool:
+    """Whether a query may be answered from or stored in the cache, apart from being personal."""
+    words = [word for word in normalize_query(text) if word not in _PRONOUNS]
+    return len(words) >= MIN_QUERY_WORDS and is_first_turn(callback_context)
+
+
+def cached_response_callback(callback_context, llm_request) -> Optional[LlmResponse]:
+    """Before-model callback of the coordinator: serves a cached answer to a general question."""
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    text = latest_user_text(llm_request)
+    if text is None:
+        return None
+    if not is_cacheable(callback_context, text) or is_personal(text):
+        response_cache.bypassed += 1
+        return None
+    answer = response_cache.lookup(text, scope=meaning_scope(text))
+    if answer is None:
+        return None
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=answer)]))
+
+
+def cache_response_callback(callback_context, llm_response) -> Optional[LlmResponse]:
+    """After-model callback of the general specialists: caches their final answer to the user's question."""
+    if not RESPONSE_CACHE_ENABLED or llm_response.partial or llm_response.content is None:
+        return None
+    parts = llm_response.content.parts or []
+    if not parts or any(part.function_call is not None for part in parts):
+        return None
+    answer = "".join(part.text for part in parts if part.text)
+    user_content = callback_context.user_content
+    query = " ".join(part.text for part in (user_content.parts or []) if part.text) if user_content else ""
+    if answer and query and is_cacheable(callback_context, query) and not is_personal(query):
+        response_cache.store(query, answer, scope=meaning_scope(query))
+    return None
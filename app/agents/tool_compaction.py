@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import json
+
+from config import TOOL_COMPACTION_ENABLED, TOOL_TOKEN_BUDGET
+
+# Compaction of tool results before they go back to the model. Every tool
+# result becomes part of the prompt of every later generation in the turn,
+# so full backend JSON, 2000-character RAG excerpts and fields that only
+# echo the call's arguments are paid for again and again. The after-tool
+# callback of the specialists:
+# - drops null fields, echoed arguments and fields of no use to the model;
+# - rounds floats;
+# - only when the result is still over the tool's token budget, shortens
+#   long strings and lists, noting how much was left out, and tightens these
+#   limits step by step until it fits.
+# Bytes and estimated tokens saved are counted per tool and per turn.
+
+CHARS_PER_TOKEN = 4
+
+# Fields that never help the model answer
+DROPPED_FIELDS = {"hint", "source"}
+# Fields kept even when they repeat an argument
+KEPT_FIELDS = {"status", "error_message"}
+
+# Estimated tokens a tool result may take; TOOL_TOKEN_BUDGET for other tools
+TOOL_TOKEN_BUDGETS = {
+    "rag_query": 700,
+    "get_user_profile": 400,
+    "get_user_calorie_history": 800,
+    "get_latest_nutrition_facts": 400,
+}
+
+FLOAT_DECIMALS = 2
+
+# (list items, string characters) kept for results over budget, from the first pass to the tightest
+LIMITS = [(20, 1000), (10, 500), (5, 250), (3, 120), (1, 60)]
+
+RECENT_TURNS = 100
+
+_tool_stats: Dict[str, Dict] = {}
+_turn_stats: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def _round(value: float) -> float:
+    if value == 0 or abs(value) >= 1:
+        return round(value, FLOAT_DECIMALS)
+    return float(f"{value:.{FLOAT_DECIMALS}g}")
+
+
+def _compact_value(value: Any, max_items: Optional[int], max_chars: Optional[int]) -> Any:
+    if isinstance(value, float):
+        return _round(value)
+    if isinstance(value, str):
+        if max_chars is not None and len(value) > max_chars:
+            return f"{value[:max_chars]}... [{len(value) - max_chars} more characters]"
+        return value
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            if item is None or key in DROPPED_FIELDS:
+                continue
+            compacted[key] = _compact_value(item, max_items, max_chars)
+        return compacted
+    if isinstance(value, (list, tuple)):
+        items = [_compact_value(item, max_items, max_chars) for item in value[:max_items]]
+        if max_items is not None and len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more items")
+        return items
+    return value
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def compact_result(result: Dict, args: Optional[Dict] = None, token_budget: int = TOOL_TOKEN_BUDGET) -> Dict:
+    """Returns a compacted copy of a tool result that fits token_budget where possible.
+
+    Args:
+        result: The tool's result
+        args: The arguments of the call; top-level fields repeating them are dropped
+        token_budget: Estimated tokens the compacted result may take
+    """
+    args = args or {}
+    result = {
+        key: value for key, value in result.items()
+        if key in KEPT_FIELDS or not (key in args and value == args[key])
+    }
+    # Lists and strings are only shortened when the result is over budget
+    for max_items, max_chars in [(None, None)] + LIMITS:
+        compacted = _compact_value(result, max_items, max_chars)
+        if _size(compacted) <= token_budget * CHARS_PER_TOKEN:
+            break
+    return compacted
+
+
+def _record(name: str, invocation_id: str, before: int, after: int) -> None:
+    tool = _tool_stats.setdefault(name, {"calls": 0, "bytes_before": 0, "bytes_after": 0})
+    turn = _turn_stats.setdefault(invocation_id, {"calls": 0, "bytes_before": 0, "bytes_after": 0})
+    for stats in (tool, turn):
+        stats["calls"] += 1
+        stats["bytes_before"] += before
+        stats["bytes_after"] += after
+    _turn_stats.move_to_end(invocation_id)
+    while len(_turn_stats) > RECENT_TURNS:
+        _turn_stats.popitem(last=False)
+
+
+def _with_savings(stats: Dict) -> Dict:
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    return {**stats, "bytes_saved": saved, "tokens_saved": saved // CHARS_PER_TOKEN}
+
+
+def compaction_stats() -> Dict:
+    """Bytes and estimated tokens saved per tool, and per turn for the most recent turns."""
+    return {
+        "tools": {name: _with_savings(stats) for name, stats in _tool_stats.items()},
+        "turns": {invocation_id: _with_savings(stats) for invocation_id, stats in _turn_stats.items()}
+    }
+
+
+def compact_tool_output_callback(tool, args, tool_context, tool_response) -> Optional[Dict]:
+    """After-tool callback of the specialists: hands the model a compacted result."""
+    if not TOOL_COMPACTION_ENABLED or not isinstance(tool_response, dict):
+        return None
+    budget = TOOL_TOKEN_BUDGETS.get(tool.name, TOOL_TOKEN_BUDGET)
+    compacted = compact_result(tool_response, args, budget)
+    _record(tool.name, tool_context.invocation_id, _size(tool_response), _size(compacted))
+    return compacted
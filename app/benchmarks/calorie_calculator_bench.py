@@ -0,0 +1,64 @@
+"""
+Benchmark: calculate_nutrition per meal vs calculate_nutrition_batch.
+
+Run from the app directory:
+    python -m benchmarks.calorie_calculator_bench --meals 50 --items 300
+"""
+
+import argparse
+import math
+import random
+import time
+
+from tools.calorie_calculator import calculate_nutrition, calculate_nutrition_batch
+from tools.food_store import UNITS, get_food_store
+
+
+def make_meals(num_meals: int, items_per_meal: int, seed: int = 0):
+    rng = random.Random(seed)
+    names = list(get_food_store().names) + ["unknown food"]
+    meals = []
+    for _ in range(num_meals):
+        food_items = []
+        for _ in range(items_per_meal):
+            unit = rng.choice(UNITS)
+            quantity = rng.uniform(10, 250) if unit == "g" else rng.uniform(0.25, 3)
+            food_items.append({"name": rng.choice(names), "quantity": round(quantity, 2), "unit": unit})
+        meals.append(food_items)
+    return meals
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=50)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    meals = make_meals(args.meals, args.items)
+
+    # Both paths must agree before their timings mean anything
+    loop_results = [calculate_nutrition(food_items) for food_items in meals]
+    batch_results = calculate_nutrition_batch(meals)["meals"]
+    for loop_result, batch_result in zip(loop_results, batch_results):
+        assert math.isclose(loop_result.get("total_calories", 0), batch_result.get("total_calories", 0), abs_tol=0.11)
+
+    loop_time = best_of(lambda: [calculate_nutrition(food_items) for food_items in meals], args.repeat)
+    batch_time = best_of(lambda: calculate_nutrition_batch(meals), args.repeat)
+
+    print(f"{args.meals} meals x {args.items} items")
+    print(f"  loop:  {loop_time * 1000:8.2f} ms")
+    print(f"  batch: {batch_time * 1000:8.2f} ms  ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: analyze_diet per user-day vs analyze_cohort for the whole table.
+
+Run from the app directory:
+    python -m benchmarks.diet_cohort_bench --users 2000 --days 7 --items 8
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from tools.diet_analysis import analyze_diet
+from tools.diet_cohort import analyze_cohort
+from tools.food_store import get_food_store
+
+
+def make_table(num_users: int, num_days: int, items_per_day: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    rows = num_users * num_days * items_per_day
+    users = np.repeat(np.arange(num_users), num_days * items_per_day).astype(str)
+    days = np.tile(np.repeat(np.arange(num_days), items_per_day), num_users).astype(str)
+    food_ids = rng.integers(0, len(get_food_store()), rows)
+    grams = rng.uniform(20, 250, rows).round(1)
+    return users, days, food_ids, grams
+
+
+def per_user_day_logs(users, days, food_ids, grams):
+    names = get_food_store().names
+    logs = {}
+    for user, day, food_id, amount in zip(users.tolist(), days.tolist(), food_ids.tolist(), grams.tolist()):
+        logs.setdefault((user, day), []).append({"food": names[food_id], "quantity": amount, "unit": "g"})
+    return logs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--items", type=int, default=8)
+    args = parser.parse_args()
+
+    table = make_table(args.users, args.days, args.items)
+    logs = per_user_day_logs(*table)
+
+    start = time.perf_counter()
+    loop_results = {key: analyze_diet(log) for key, log in logs.items()}
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = analyze_cohort(*table)
+    cohort_time = time.perf_counter() - start
+
+    # Both paths must agree before their timings mean anything
+    for i, key in enumerate(zip(results["user"].tolist(), results["day"].tolist())):
+        expected = loop_results[key]
+        assert math.isclose(expected["total_calories"], round(results["calories"][i], 1), abs_tol=0.11)
+        assert ("Low fiber intake" in expected["nutritional_analysis"]["gaps"]) == results["low_fiber"][i]
+
+    print(f"{len(logs)} user-days, {len(table[0])} rows")
+    print(f"  analyze_diet loop: {loop_time * 1000:9.1f} ms")
+    print(f"  analyze_cohort:    {cohort_time * 1000:9.1f} ms  ({loop_time / cohort_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
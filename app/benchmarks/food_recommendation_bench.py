@@ -0,0 +1,100 @@
+"""
+Benchmark: a linear scan over the food catalog vs the bitset-indexed FoodCatalog.
+
+Synthetic catalogs are built from variants of the built-in foods, and the
+same queries are answered by both paths at every size.
+
+Run from the app directory:
+    python -m benchmarks.food_recommendation_bench --sizes 11 1000 10000 --queries 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from tools.food_recommendation import FOOD_CATALOG, FoodCatalog
+
+QUERIES = [
+    (["vegetarian"], ["heart health"], ["nuts"], "protein"),
+    (["vegan", "keto"], [], [], None),
+    ([], ["weight"], ["dairy", "fish"], "fiber"),
+    (["paleo"], ["brain health", "muscle"], [], None),
+    ([], [], ["soy"], "vitamin c"),
+]
+
+
+def make_catalog(size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    base = list(FOOD_CATALOG.items())
+    tags = sorted({tag for _, food in base for tag in food["dietary_tags"]})
+    benefits = sorted({benefit for _, food in base for benefit in food["benefits"]})
+    foods = {}
+    for i in range(size):
+        name, food = base[i % len(base)]
+        if i >= len(base):
+            name = f"{name} {i}"
+            food = {
+                **food,
+                "dietary_tags": rng.choice(tags, rng.integers(1, 4), replace=False).tolist(),
+                "benefits": rng.choice(benefits, rng.integers(1, 4), replace=False).tolist(),
+            }
+        foods[name] = food
+    return foods
+
+
+def linear_filter(foods, dietary_preferences, health_goals, allergies, nutrient_focus):
+    """The per-food loop recommend_foods used before the catalog was indexed."""
+    matches = []
+    for food_name, food_info in foods.items():
+        if any(allergy in food_info["allergies"] for allergy in allergies):
+            continue
+        if dietary_preferences and not any(
+            pref.replace(" ", "_") in food_info["dietary_tags"] for pref in dietary_preferences
+        ):
+            continue
+        if nutrient_focus and nutrient_focus not in [n.lower() for n in food_info["nutrients"]]:
+            continue
+        if health_goals and not any(
+            goal in benefit.lower() for goal in health_goals for benefit in food_info["benefits"]
+        ):
+            continue
+        matches.append(food_name)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 1000, 10000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        foods = make_catalog(size)
+        catalog = FoodCatalog(foods)
+        queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+
+        start = time.perf_counter()
+        linear_results = [linear_filter(foods, *query) for query in queries]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        indexed_results = []
+        for preferences, goals, allergies, nutrient_focus in queries:
+            candidates = catalog.members(catalog.filter(preferences, goals, allergies, nutrient_focus))
+            catalog.score(candidates, preferences, goals, nutrient_focus)
+            indexed_results.append(candidates)
+        indexed_time = time.perf_counter() - start
+
+        # Both paths must select the same foods before their timings mean anything
+        for expected, candidates in zip(linear_results, indexed_results):
+            assert expected == [catalog.names[i] for i in candidates.tolist()]
+
+        per_query = 1e6 / len(queries)
+        print(f"{size} foods, {len(queries)} queries")
+        print(f"  linear scan:  {linear_time * per_query:9.1f} µs/query")
+        print(f"  bitset index: {indexed_time * per_query:9.1f} µs/query  ({linear_time / indexed_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
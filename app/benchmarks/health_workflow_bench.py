@@ -0,0 +1,133 @@
+"""
+Benchmark: the three-stage health workflow (researcher, editor, fact-checker)
+vs the merged variant (researcher, edit-and-verify).
+
+Both workflows answer the same questions with the health cache disabled,
+and the prompt and output tokens of every model call and the wall time per
+question are compared. Only --live runs measure anything: they call the
+configured models (GOOGLE_API_KEY must be set), so the merged stage's real
+output length and latency decide the result.
+
+Without --live the models are simulated: every stage writes a fixed
+DRAFT_TOKENS document with a fixed time-to-first-token plus per-token time.
+The difference then follows from the number of stages alone (two instead
+of three) by construction; a simulated run only checks the wiring and
+illustrates the stage count, and no savings are reported for it.
+
+Run from the app directory:
+    python -m benchmarks.health_workflow_bench --questions 6
+    python -m benchmarks.health_workflow_bench --live --questions 3
+"""
+
+from typing import AsyncGenerator, Dict, List
+import argparse
+import asyncio
+import time
+
+from google.adk.models import BaseLlm, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+import agents.health_cache as health_cache
+from agents.health_info_agent import health_info_merged_workflow, health_info_three_stage_workflow
+
+QUESTIONS = [
+    "What should I eat with type 2 diabetes?",
+    "Which foods help lower high blood pressure?",
+    "Diet tips for iron deficiency anemia",
+    "What foods should I avoid with gout?",
+    "How can diet help with high cholesterol?",
+    "Makanan apa yang baik untuk penderita maag?",
+]
+
+CHARS_PER_TOKEN = 4
+DRAFT_TOKENS = 900  # Length of a simulated research draft
+TIME_TO_FIRST_TOKEN = 0.4  # Seconds, simulated
+SECONDS_PER_OUTPUT_TOKEN = 0.004  # Simulated
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class SimulatedLlm(BaseLlm):
+    """Writes a draft, or rewrites the draft it was given at the same length."""
+
+    async def generate_content_async(self, llm_request, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        prompt = str(llm_request.config.system_instruction or "") + "".join(
+            part.text or "" for content in llm_request.contents for part in (content.parts or [])
+        )
+        output_tokens = DRAFT_TOKENS
+        await asyncio.sleep(TIME_TO_FIRST_TOKEN + output_tokens * SECONDS_PER_OUTPUT_TOKEN)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="word " * output_tokens)]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=_tokens(prompt),
+                candidates_token_count=output_tokens
+            )
+        )
+
+
+async def run_workflow(workflow, questions: List[str]) -> Dict:
+    runner = InMemoryRunner(agent=workflow, app_name="health_workflow_bench")
+    totals = {"model_calls": 0, "prompt_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+    for question in questions:
+        session = await runner.session_service.create_session(app_name="health_workflow_bench", user_id="bench")
+        start = time.perf_counter()
+        async for event in runner.run_async(
+            user_id="bench",
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=question)])
+        ):
+            usage = event.usage_metadata
+            if usage is not None:
+                totals["model_calls"] += 1
+                totals["prompt_tokens"] += usage.prompt_token_count or 0
+                totals["output_tokens"] += usage.candidates_token_count or 0
+        totals["seconds"] += time.perf_counter() - start
+    return totals
+
+
+async def run(live: bool, questions: List[str]):
+    health_cache.HEALTH_CACHE_ENABLED = False
+    if not live:
+        for workflow in (health_info_three_stage_workflow, health_info_merged_workflow):
+            for agent in workflow.sub_agents:
+                # The name keeps google_search's Gemini model check satisfied
+                agent.model = SimulatedLlm(model="gemini-simulated")
+
+    results = {
+        "three-stage": await run_workflow(health_info_three_stage_workflow, questions),
+        "merged": await run_workflow(health_info_merged_workflow, questions),
+    }
+    count = len(questions)
+    print(f"{count} questions, {'live' if live else 'simulated (stage-count illustration only)'} models")
+    for name, totals in results.items():
+        print(
+            f"  {name:12} {totals['model_calls'] / count:4.1f} calls  "
+            f"{totals['prompt_tokens'] / count:8.0f} prompt tokens  "
+            f"{totals['output_tokens'] / count:7.0f} output tokens  "
+            f"{totals['seconds'] / count:6.2f} s per question"
+        )
+    if not live:
+        print("  simulated stages all write the same length; run with --live to measure savings")
+        return
+    baseline, merged = results["three-stage"], results["merged"]
+    print(
+        f"  merged saves {1 - merged['output_tokens'] / baseline['output_tokens']:.0%} output tokens, "
+        f"{1 - merged['prompt_tokens'] / baseline['prompt_tokens']:.0%} prompt tokens, "
+        f"{1 - merged['seconds'] / baseline['seconds']:.0%} time"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="Call the configured model instead of simulating it")
+    args = parser.parse_args()
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(args.questions)]
+    asyncio.run(run(args.live, questions))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,4 +13,124 @@ MODEL_ID = os.getenv("MODEL_ID", "gemini-2.0-flash")
 
 # Backend base URL for external API calls (personal agent, latest nutrition facts)
 # Example: https://api.your-backend.com
-BE_URL = os.getenv("BE_URL", "http://localhost:8000")
\ No newline at end of file
+BE_URL = os.getenv("BE_URL", "http://localhost:8000")
+
+# Food composition store file written by tools/food_importer.py.
+# Leave empty to use the built-in demonstration foods.
+FOOD_STORE_PATH = os.getenv("FOOD_STORE_PATH", "")
+
+# Local pre-router in front of the coordinator (agents/pre_router.py).
+# Messages it routes with at least PRE_ROUTER_MIN_CONFIDENCE skip the
+# coordinator's model call. PRE_ROUTER_MODEL_PATH is a model file trained
+# from labelled transcripts; leave empty to use the built-in examples.
+PRE_ROUTER_ENABLED = os.getenv("PRE_ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+PRE_ROUTER_MIN_CONFIDENCE = float(os.getenv("PRE_ROUTER_MIN_CONFIDENCE", "0.8"))
+PRE_ROUTER_MODEL_PATH = os.getenv("PRE_ROUTER_MODEL_PATH", "")
+
+# Answer pure computation questions (unit conversions, calories of given
+# amounts) from the local tools without any model call (agents/fast_path.py).
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Semantic response cache for general questions (agents/response_cache.py).
+# Personal questions and PersonalAIAgent answers are never cached.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "21600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.9"))
+
+# Multi-domain questions run the specialists they need concurrently and merge
+# their answers (agents/fan_out_agent.py). A specialist joins the fan-out when
+# its keyword rules match or the pre-router gives it at least
+# FAN_OUT_MIN_PROBABILITY.
+FAN_OUT_ENABLED = os.getenv("FAN_OUT_ENABLED", "true").lower() in ("1", "true", "yes")
+FAN_OUT_MIN_PROBABILITY = float(os.getenv("FAN_OUT_MIN_PROBABILITY", "0.25"))
+
+# Speculative prefetch of the RAG lookup and profile fetch while the
+# coordinator routes (agents/prefetch.py). A tool is prefetched when the
+# pre-router gives its specialist at least PREFETCH_MIN_PROBABILITY, and the
+# RAG lookup only from PREFETCH_RAG_MIN_PROBABILITY: it is keyed on the
+# message, and the specialist mostly searches with a query of its own.
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_MIN_PROBABILITY = float(os.getenv("PREFETCH_MIN_PROBABILITY", "0.3"))
+PREFETCH_RAG_MIN_PROBABILITY = float(os.getenv("PREFETCH_RAG_MIN_PROBABILITY", "0.7"))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+
+# Topic-level cache for the health information workflow (agents/health_cache.py).
+# A topic with cached final information skips the workflow; a question about a
+# condition with a cached research draft (at least HEALTH_CACHE_DRAFT_SIMILARITY)
+# skips only the research stage.
+HEALTH_CACHE_ENABLED = os.getenv("HEALTH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+HEALTH_CACHE_TTL_SECONDS = float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "86400"))
+HEALTH_CACHE_MAX_ENTRIES = int(os.getenv("HEALTH_CACHE_MAX_ENTRIES", "500"))
+HEALTH_CACHE_SIMILARITY = float(os.getenv("HEALTH_CACHE_SIMILARITY", "0.95"))
+HEALTH_CACHE_DRAFT_SIMILARITY = float(os.getenv("HEALTH_CACHE_DRAFT_SIMILARITY", "0.8"))
+
+# Use the health workflow variant with one combined edit-and-verify stage
+# instead of separate editor and fact-checker stages (agents/health_info_agent.py).
+HEALTH_MERGED_EDIT_VERIFY = os.getenv("HEALTH_MERGED_EDIT_VERIFY", "false").lower() in ("1", "true", "yes")
+
+# Tool result caching (tools/tool_cache.py). TOOL_CACHE_BACKEND is "memory"
+# (an LRU per process) or "sqlite" (a cache file at TOOL_CACHE_PATH shared by
+# all workers on the host).
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+TOOL_CACHE_BACKEND = os.getenv("TOOL_CACHE_BACKEND", "memory")
+TOOL_CACHE_PATH = os.getenv("TOOL_CACHE_PATH", "tool_cache.sqlite3")
+
+# Compact tool results before they reach the model (agents/tool_compaction.py).
+# TOOL_TOKEN_BUDGET is the estimated token budget of tools without their own.
+TOOL_COMPACTION_ENABLED = os.getenv("TOOL_COMPACTION_ENABLED", "true").lower() in ("1", "true", "yes")
+TOOL_TOKEN_BUDGET = int(os.getenv("TOOL_TOKEN_BUDGET", "1000"))
+
+# Model tiers. Every agent runs on the tier set for it in AGENT_MODEL_TIERS
+# (standard, i.e. MODEL_ID, by default). Override per agent with e.g.
+# AGENT_MODEL_TIERS="HealthEditorAgent=standard,ResearchAIAgent=pro".
+MODEL_TIERS = {
+    "lite": os.getenv("MODEL_LITE_ID", "gemini-2.0-flash-lite"),
+    "standard": MODEL_ID,
+    "pro": os.getenv("MODEL_PRO_ID", "gemini-2.5-pro"),
+}
+DEFAULT_MODEL_TIER = "standard"
+
+
+def _parse_agent_tiers(value: str) -> dict:
+    """Parses "Agent=tier,..." overrides; raises ValueError for an unknown tier or a malformed entry."""
+    tiers = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        agent, _, tier = (part.strip() for part in item.partition("="))
+        if not agent or tier not in MODEL_TIERS:
+            raise ValueError(
+                f"AGENT_MODEL_TIERS entry '{item.strip()}' must be Agent=tier with tier one of {', '.join(MODEL_TIERS)}"
+            )
+        tiers[agent] = tier
+    return tiers
+
+
+AGENT_MODEL_TIERS = {
+    # Routing and editing turns don't need the larger model
+    "NutriAgentCoordinator": "lite",
+    "HealthEditorAgent": "lite",
+    **_parse_agent_tiers(os.getenv("AGENT_MODEL_TIERS", "")),
+}
+
+# A lite-tier call moves up to the standard tier when the routing confidence
+# is below MODEL_ESCALATION_CONFIDENCE, the prompt is longer than
+# MODEL_ESCALATION_PROMPT_TOKENS, or the agent's previous call in the same
+# turn failed (agents/model_tiers.py).
+MODEL_ESCALATION_ENABLED = os.getenv("MODEL_ESCALATION_ENABLED", "true").lower() in ("1", "true", "yes")
+MODEL_ESCALATION_CONFIDENCE = float(os.getenv("MODEL_ESCALATION_CONFIDENCE", "0.5"))
+MODEL_ESCALATION_PROMPT_TOKENS = int(os.getenv("MODEL_ESCALATION_PROMPT_TOKENS", "6000"))
+
+# Prices per tier in USD per million (input, output) tokens, for cost reporting.
+# Update them to the current prices of the configured models.
+MODEL_TIER_PRICES = {
+    "lite": (0.075, 0.30),
+    "standard": (0.10, 0.40),
+    "pro": (1.25, 10.00),
+}
+
+
+def model_for(agent_name: str) -> str:
+    """The model ID of an agent's tier."""
+    return MODEL_TIERS[AGENT_MODEL_TIERS.get(agent_name, DEFAULT_MODEL_TIER)]
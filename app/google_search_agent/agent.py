@@ -1,11 +1,12 @@
 from google.adk.agents import Agent
 from google.adk.tools import google_search  # Import the tool
+from config import model_for
 
 root_agent = Agent(
    # A unique name for the agent.
    name="basic_search_agent",
-   # The Large Language Model (LLM) that agent will use.
-   model="gemini-2.0-flash-exp",
+   # The Large Language Model (LLM) that agent will use, from its tier in config.
+   model=model_for("basic_search_agent"),
    # model="gemini-2.0-flash-live-001",  # New streaming model version as of Feb 2025
    # A short description of the agent's purpose.
    description="Agent to answer questions using Google Search.",
@@ -1,12 +1,18 @@
 from google.adk.agents import Agent
-from config import MODEL_ID
+from config import model_for
 from agents.research_agent import research_agent
 from agents.nutritionist_rag_agent import nutritionist_rag_agent
 from agents.personal_agent import personal_agent
+from agents.fan_out_agent import multi_domain_agent
+from agents.fast_path import fast_path_callback
+from agents.model_tiers import record_model_usage_callback, select_model_callback
+from agents.prefetch import discard_prefetches_callback, prefetch_callback
+from agents.pre_router import pre_route_callback
+from agents.response_cache import cached_response_callback
 
 # Entry point coordinator for the 4-agent schema (1 coordinator + 3 specialists)
 root_agent = Agent(
-    model=MODEL_ID,
+    model=model_for("NutriAgentCoordinator"),
     name="NutriAgentCoordinator",
     description="Coordinator that delegates to Research, Nutritionist (RAG), and Personal agents",
     instruction="""
@@ -20,11 +26,20 @@ ROUTING RULES:
 - If the task needs domain guidance, explanations, or knowledge-base grounding → NutritionistRAGAgent
 - If the task needs user data (profile, history, personalization) → PersonalAIAgent
 
-Prefer a single handoff. If a query spans domains, choose the primary intent; mention any limitations.
+Prefer a single handoff. If a query needs more than one specialist at once (for example the user's own data together with guidance or research) → MultiDomainAgent, which runs them concurrently and merges their answers.
 """,
     sub_agents=[
         research_agent,
         nutritionist_rag_agent,
         personal_agent,
-    ]
+        multi_domain_agent,
+    ],
+    # Computation questions are answered locally, repeated general questions from
+    # the response cache and confident messages handed off locally, all without a
+    # coordinator model call. Likely RAG and profile lookups start meanwhile and
+    # are dropped unused when the coordinator answers itself. Otherwise the lite
+    # model routes, escalated to the standard one when the message is ambiguous.
+    before_model_callback=[fast_path_callback, cached_response_callback, prefetch_callback, pre_route_callback, select_model_callback],
+    after_model_callback=record_model_usage_callback,
+    after_agent_callback=discard_prefetches_callback
 )
\ No newline at end of file
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Modules import each other from the app directory ("from config import ..."),
+# as when the agents are run from app/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,29 @@
+import pytest
+
+from agents.fast_path import answer_locally
+
+
+@pytest.mark.parametrize("question", [
+    "calories in 1 cup spinach and 2 tbsp almond butter",
+    "calories in 1 cup of rice milk",
+    "calories in 2 apple pies",
+    "calories in 1 banana bread",
+    "calories in 100 g salmon oil",
+])
+def test_approximate_food_matches_fall_through(question):
+    assert answer_locally(question) is None
+
+
+@pytest.mark.parametrize("question", ["calories in 1/0 cup rice", "calories in rice", "calories in 1 cup dragonfruit jam"])
+def test_unparsed_or_unknown_items_fall_through(question):
+    assert answer_locally(question) is None
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("calories in 1 cup rice", "1 cup rice contains about 234 kcal"),
+    ("calories in 1 cup nasi putih", "1 cup nasi putih contains about 234 kcal"),
+    ("calories in 150 g chicken breast and 1 cup rice", "150 g chicken breast and 1 cup rice contain about"),
+    ("how many grams is 2 cups of flour", "2 cup of flour is about 250.8 g."),
+])
+def test_exact_names_and_aliases_are_answered(question, expected):
+    assert answer_locally(question).startswith(expected)
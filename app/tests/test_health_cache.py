@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+import agents.health_cache as health_cache
+from agents.health_cache import health_topic
+
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    monkeypatch.setattr(health_cache, "HEALTH_CACHE_ENABLED", True)
+    health_cache.final_cache.clear()
+    health_cache.draft_cache.clear()
+
+
+def _context(text):
+    return SimpleNamespace(user_content=types.Content(role="user", parts=[types.Part(text=text)]), state={})
+
+
+def _ask(text):
+    """Runs the workflow's cache callbacks around a fake run; returns "final", "draft" or "miss"."""
+    context = _context(text)
+    if health_cache.health_cache_lookup_callback(context) is not None:
+        return "final"
+    hit = "draft" if context.state.get(health_cache.CACHED_DRAFT_STATE_KEY) else "miss"
+    context.state["health_final_information"] = f"final for {text}"
+    context.state["health_research_draft"] = f"draft for {text}"
+    health_cache.health_cache_store_callback(context)
+    return hit
+
+
+def test_qualifiers_and_language_are_in_the_scope():
+    scopes = {health_topic(text)[0] for text in [
+        "type 1 diabetes diet", "type 2 diabetes diet", "diet for diabetes", "makanan untuk penderita diabetes",
+    ]}
+    assert len(scopes) == 4
+    assert health_topic("What should I eat with T2D?")[0] == health_topic("type 2 diabetes diet")[0]
+
+
+@pytest.mark.parametrize("text", ["hi", "blood", "blood pressure", "low sodium foods"])
+def test_text_without_a_condition_is_not_scoped_to_one(text):
+    scope, condition_topic, _ = health_topic(text)
+    assert scope in ("en", "id")
+    assert condition_topic == ""
+
+
+def test_other_variants_of_a_condition_miss():
+    assert _ask("type 1 diabetes diet") == "miss"
+    assert _ask("type 2 diabetes diet") == "miss"
+    assert _ask("makanan untuk penderita diabetes") == "miss"
+    assert _ask("diet for high blood pressure") == "miss"
+    assert _ask("diet for low blood pressure") == "miss"
+
+
+def test_same_topic_hits_and_same_condition_reuses_the_draft():
+    assert _ask("diet for type 2 diabetes") == "miss"
+    assert _ask("Diet for type 2 diabetes?") == "final"
+    assert _ask("which snacks are best with type 2 diabetes") == "draft"
+
+
+@pytest.mark.parametrize("text", ["hi", "blood"])
+def test_unrelated_text_gets_no_condition_draft(text):
+    assert _ask("diet for diabetes") == "miss"
+    assert _ask(text) == "miss"
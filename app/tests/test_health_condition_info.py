@@ -0,0 +1,32 @@
+import pytest
+
+from tools.health_condition_info import find_condition_terms, get_health_condition_info, match_conditions
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("What should I eat with DM2 and high blood pressure?", ["diabetes", "hypertension"]),
+    ("makanan untuk penderita darah tinggi", ["hypertension"]),
+    ("Type-2 Diabetes?", ["diabetes"]),
+    ("peanut allergy snacks", ["food allergies"]),
+    ("lactose", ["lactose intolerance"]),
+    ("irritable bowel", ["irritable bowel syndrome"]),
+])
+def test_match_conditions(text, expected):
+    assert match_conditions(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "blood pressure", "low blood pressure diet", "allergy", "allergies", "pollen allergy",
+    "milk", "food", "hi", "blood", "in", "admin panel", "",
+])
+def test_match_conditions_negatives(text):
+    assert match_conditions(text) == []
+
+
+def test_find_condition_terms_reports_the_matched_alias():
+    assert find_condition_terms("type 1 diabetes diet") == [("type 1 diabetes", "diabetes"), ("diabetes", "diabetes")]
+    assert find_condition_terms("hi there") == []
+
+
+def test_unknown_condition_is_an_error():
+    assert get_health_condition_info("blood pressure")["status"] == "error"
@@ -0,0 +1,24 @@
+import pytest
+
+from tools.meal_plan import meal_plan_tool
+
+
+@pytest.fixture
+def memoized_plan_meals():
+    plan_meals = meal_plan_tool.func
+    if not hasattr(plan_meals, "cache"):
+        pytest.skip("tool caching is disabled")
+    plan_meals.cache.backend.clear()
+    return plan_meals
+
+
+def test_cached_plan_reports_no_solve_time(memoized_plan_meals):
+    hits = memoized_plan_meals.cache.hits
+    first = memoized_plan_meals(2000, protein_target=120)
+    assert first["status"] == "success" and first["search_complete"]
+    assert first["solve_time_ms"] > 0
+
+    cached = memoized_plan_meals(calorie_target=2000, protein_target=120)
+    assert memoized_plan_meals.cache.hits == hits + 1
+    assert cached["solve_time_ms"] == 0.0
+    assert cached["plan"] == first["plan"]
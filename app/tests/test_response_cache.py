@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmResponse
+from google.genai import types
+
+import agents.response_cache as response_cache_module
+from agents.response_cache import SemanticResponseCache, meaning_scope, normalize_query
+
+
+def _remember(cache, query):
+    cache.store(query, f"answer to {query}", scope=meaning_scope(query))
+
+
+def _recall(cache, query):
+    return cache.lookup(query, scope=meaning_scope(query))
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("should people with kidney disease eat more potassium", "should people with kidney disease eat less potassium"),
+    ("how much vitamin d should an adult take daily", "how much vitamin a should an adult take daily"),
+    ("how much vitamin b12 does a vegan need", "how much vitamin b6 does a vegan need"),
+    ("which foods are safe in the first trimester", "which foods are safe in the third trimester"),
+    ("foods high in sodium to avoid", "foods low in sodium to avoid"),
+    ("can diabetics eat bananas", "can diabetics not eat bananas"),
+    ("is it ok to eat fruit before a workout", "is it ok to eat fruit after a workout"),
+    ("how much protein is in 100 g of tofu", "how much protein is in 200 g of tofu"),
+])
+def test_questions_that_differ_in_meaning_do_not_collide(stored, asked):
+    cache = SemanticResponseCache(similarity=0.5)
+    _remember(cache, stored)
+    assert _recall(cache, asked) is None
+    assert _recall(cache, stored) == f"answer to {stored}"
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("is avocado healthy?", "Is an avocado healthy"),
+    ("benefits of green tea for weight loss", "green tea benefits for weight loss"),
+    ("how much vitamin d should an adult take daily", "how much vitamin D should adults take daily?"),
+    ("which foods are rich in magnesium", "which foods are rich in magnesum"),
+])
+def test_rewordings_and_typos_still_hit(stored, asked):
+    cache = SemanticResponseCache(similarity=0.8)
+    _remember(cache, stored)
+    assert _recall(cache, asked) == f"answer to {stored}"
+
+
+def test_vitamin_letter_is_not_a_stopword():
+    assert normalize_query("is vitamin a good for the eyes") == ["vitamin", "a", "good", "eyes"]
+    assert meaning_scope("Don't take vitamin A with vitamin D") == "not a d"
+    assert meaning_scope("is avocado healthy") == ""
+
+
+def _context(text, user_messages=1):
+    events = [
+        SimpleNamespace(author="user", content=types.Content(role="user", parts=[types.Part(text=text)]))
+        for _ in range(user_messages)
+    ]
+    return SimpleNamespace(
+        session=SimpleNamespace(events=events),
+        user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+def _answer(context, text):
+    response = LlmResponse(content=types.Content(role="model", parts=[types.Part(text=f"answer to {text}")]))
+    response_cache_module.cache_response_callback(context, response)
+
+
+def _cached(context, text):
+    request = SimpleNamespace(contents=[types.Content(role="user", parts=[types.Part(text=text)])])
+    response = response_cache_module.cached_response_callback(context, request)
+    return response.content.parts[0].text if response is not None else None
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SemanticResponseCache()
+    monkeypatch.setattr(response_cache_module, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    return cache
+
+
+def test_callbacks_scope_first_turn_answers_by_meaning(cache):
+    stored = "how much vitamin d should an adult take daily"
+    _answer(_context(stored), stored)
+    assert _cached(_context(stored), stored) == f"answer to {stored}"
+    other = "how much vitamin a should an adult take daily"
+    assert _cached(_context(other), other) is None
+
+
+def test_callbacks_skip_follow_ups(cache):
+    stored = "is green tea good for weight loss"
+    _answer(_context(stored, user_messages=2), stored)
+    assert cache.stats()["entries"] == 0
+    _answer(_context(stored), stored)
+    assert _cached(_context(stored, user_messages=2), stored) is None
@@ -2,6 +2,10 @@ from google.adk.tools import google_search
 from .nutrition_latest import latest_nutrition_facts_tool
 from .personal_api import user_profile_tool, user_calorie_history_tool
 from .local_rag import local_rag_tool
+from .recipe_scaling import recipe_scaling_tool
+from .ingredient_parser import food_log_parser_tool
+from .meal_plan import meal_plan_tool
+from .daily_targets import daily_targets_tool
 
 # Create a web search tool for agents to use
 web_search = google_search
@@ -12,4 +16,8 @@ __all__ = [
     "user_profile_tool",
     "user_calorie_history_tool",
     "local_rag_tool",
+    "recipe_scaling_tool",
+    "food_log_parser_tool",
+    "meal_plan_tool",
+    "daily_targets_tool",
 ]
\ No newline at end of file
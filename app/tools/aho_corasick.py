@@ -0,0 +1,58 @@
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+# Aho–Corasick automaton for finding many phrases in a text at once. The
+# patterns are compiled into a trie with failure links, so one left-to-right
+# pass over the text reports every occurrence of every pattern, however many
+# patterns there are.
+
+
+class AhoCorasick:
+    """Multi-pattern matcher over a fixed list of patterns.
+
+    Args:
+        patterns: Strings to search for; matches report their index in this list
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+
+        # Trie of all patterns
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(index)
+
+        # Failure links, breadth first from the root's children (which fail to the root);
+        # each state also reports the patterns of its failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yields (start, end, pattern index) for every occurrence, in order of end position."""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._outputs[state]:
+                yield position + 1 - len(self.patterns[index]), position + 1, index
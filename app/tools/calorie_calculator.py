@@ -1,7 +1,20 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, List, Optional
 
-def calculate_nutrition(food_items: List[Dict]) -> Dict:
+import numpy as np
+
+from .daily_targets import DailyTargets, fetch_daily_targets
+from .food_store import MACRONUTRIENT_SLICE, MACRONUTRIENTS, NUTRIENT_COLUMNS, get_food_store, unit_code
+from .tool_cache import memoize
+
+
+def _percent_of_daily_target(targets: DailyTargets, totals: np.ndarray) -> Dict:
+    """Calories and macronutrients as a percentage of the personal daily targets."""
+    percent = targets.percent_of(totals)[:MACRONUTRIENT_SLICE.stop]
+    return dict(zip(NUTRIENT_COLUMNS, percent.tolist()))
+
+
+def calculate_nutrition(food_items: List[Dict], user_id: Optional[str] = None) -> Dict:
     """Calculates total calories and macronutrients for a list of food items.
     
     Use this tool when the user wants to know the nutritional content of a meal,
@@ -15,6 +28,7 @@ def calculate_nutrition(food_items: List[Dict]) -> Dict:
                 "quantity": amount of the food (e.g., 100),
                 "unit": unit of measurement (e.g., "g", "oz", "cup", "piece")
             }
+        user_id: The user whose personal daily targets the totals are compared with (optional)
     
     Returns:
         A dictionary with the following structure:
@@ -29,141 +43,56 @@ def calculate_nutrition(food_items: List[Dict]) -> Dict:
             },
             "items_calculated": list of food items successfully calculated,
             "items_not_found": list of food items not found in the database,
+            "resolved_names": approximate name matches, mapping the given name to the database food used,
+            "percent_of_daily_target": calories, protein, carbohydrates, fat and fiber as a percentage
+                of the user's daily targets (only with user_id),
+            "targets_error": why personal targets could not be used (only if they could not),
             "error_message": description of error (only if status is "error")
         }
     """
-    # In a real implementation, this would query a nutrition database API
-    # For demonstration, we'll use a small mock database
-    
-    food_database = {
-        "apple": {
-            "base_quantity": 100,  # g
-            "base_unit": "g",
-            "calories": 52,
-            "protein": 0.3,
-            "carbohydrates": 13.8,
-            "fat": 0.2,
-            "fiber": 2.4
-        },
-        "banana": {
-            "base_quantity": 100,
-            "base_unit": "g",
-            "calories": 89,
-            "protein": 1.1,
-            "carbohydrates": 22.8,
-            "fat": 0.3,
-            "fiber": 2.6
-        },
-        "chicken breast": {
-            "base_quantity": 100,
-            "base_unit": "g",
-            "calories": 165,
-            "protein": 31,
-            "carbohydrates": 0,
-            "fat": 3.6,
-            "fiber": 0
-        },
-        "rice": {
-            "base_quantity": 100,
-            "base_unit": "g",
-            "calories": 130,
-            "protein": 2.7,
-            "carbohydrates": 28,
-            "fat": 0.3,
-            "fiber": 0.4
-        },
-        "broccoli": {
-            "base_quantity": 100,
-            "base_unit": "g",
-            "calories": 34,
-            "protein": 2.8,
-            "carbohydrates": 6.6,
-            "fat": 0.4,
-            "fiber": 2.6
-        }
-    }
-    
-    # Unit conversion factors (simplified)
-    unit_conversions = {
-        "g": 1,
-        "oz": 28,  # 1 oz ≈ 28g
-        "cup": {  # Approximate values, would be different for different foods
-            "rice": 180,  # 1 cup of rice ≈ 180g
-            "broccoli": 90,  # 1 cup of chopped broccoli ≈ 90g
-            "default": 150  # Default assumption
-        },
-        "piece": {
-            "apple": 180,  # 1 medium apple ≈ 180g
-            "banana": 120,  # 1 medium banana ≈ 120g
-            "default": 100  # Default assumption
-        }
-    }
+    store = get_food_store()
     
-    # Initialize totals
-    total_calories = 0
-    total_protein = 0
-    total_carbohydrates = 0
-    total_fat = 0
-    total_fiber = 0
+    # Running totals, in NUTRIENT_COLUMNS order
+    totals = np.zeros(len(NUTRIENT_COLUMNS))
     
     items_calculated = []
     items_not_found = []
+    resolved_names = {}
     
     # Calculate nutrition for each food item
     for item in food_items:
         food_name = item["name"].lower()
-        quantity = item["quantity"]
-        unit = item["unit"].lower()
+        food_id, confidence = store.resolve(food_name)
         
-        if food_name in food_database:
-            # Convert to grams based on unit
-            if unit == "g":
-                quantity_in_grams = quantity
-            elif unit == "oz":
-                quantity_in_grams = quantity * unit_conversions["oz"]
-            elif unit == "cup":
-                if food_name in unit_conversions["cup"]:
-                    quantity_in_grams = quantity * unit_conversions["cup"][food_name]
-                else:
-                    quantity_in_grams = quantity * unit_conversions["cup"]["default"]
-            elif unit == "piece":
-                if food_name in unit_conversions["piece"]:
-                    quantity_in_grams = quantity * unit_conversions["piece"][food_name]
-                else:
-                    quantity_in_grams = quantity * unit_conversions["piece"]["default"]
-            else:
-                # Default to assuming the unit is the same as the base unit
-                quantity_in_grams = quantity
-            
-            # Calculate scaling factor
-            scaling_factor = quantity_in_grams / food_database[food_name]["base_quantity"]
-            
-            # Add to totals
-            food_data = food_database[food_name]
-            total_calories += food_data["calories"] * scaling_factor
-            total_protein += food_data["protein"] * scaling_factor
-            total_carbohydrates += food_data["carbohydrates"] * scaling_factor
-            total_fat += food_data["fat"] * scaling_factor
-            total_fiber += food_data["fiber"] * scaling_factor
-            
+        if food_id is not None:
+            quantity_in_grams = store.grams(food_id, item["quantity"], item["unit"])
+            totals += store.nutrients_for(food_id, quantity_in_grams)
             items_calculated.append(food_name)
+            if confidence < 1.0:
+                resolved_names[food_name] = store.names[food_id]
         else:
             items_not_found.append(food_name)
     
     # Prepare the result
     if len(items_calculated) > 0:
-        return {
+        result = {
             "status": "success",
-            "total_calories": round(total_calories, 1),
+            "total_calories": round(float(totals[0]), 1),
             "total_macronutrients": {
-                "protein": round(total_protein, 1),
-                "carbohydrates": round(total_carbohydrates, 1),
-                "fat": round(total_fat, 1),
-                "fiber": round(total_fiber, 1)
+                nutrient: round(float(value), 1)
+                for nutrient, value in zip(MACRONUTRIENTS, totals[MACRONUTRIENT_SLICE])
             },
             "items_calculated": items_calculated,
-            "items_not_found": items_not_found
+            "items_not_found": items_not_found,
+            "resolved_names": resolved_names
         }
+        if user_id:
+            targets, targets_error = fetch_daily_targets(user_id)
+            if targets is not None:
+                result["percent_of_daily_target"] = _percent_of_daily_target(targets, totals)
+            else:
+                result["targets_error"] = targets_error
+        return result
     else:
         return {
             "status": "error",
@@ -171,5 +100,124 @@ def calculate_nutrition(food_items: List[Dict]) -> Dict:
             "items_not_found": items_not_found
         }
 
-# Create the Function Tool
-calorie_calculator_tool = FunctionTool(func=calculate_nutrition) 
\ No newline at end of file
+def calculate_nutrition_batch(meals: List[List[Dict]], include_items: bool = False, user_id: Optional[str] = None) -> Dict:
+    """Calculates total calories and macronutrients for many meals in one call.
+    
+    Use this tool instead of calling calculate_nutrition repeatedly when the user
+    wants totals for several meals, recipes, or a whole meal plan at once.
+    
+    Args:
+        meals: A list of meals, each a list of food item dictionaries in the same
+            format accepted by calculate_nutrition ("name", "quantity", "unit")
+        include_items: Whether to include the per-item calories and macronutrients
+        user_id: The user whose personal daily targets each meal is compared with (optional);
+            every successful meal then has "percent_of_daily_target" as in calculate_nutrition
+    
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "meals": list with one calculate_nutrition result per meal, in order,
+            "targets_error": why personal targets could not be used (only if they could not),
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    if not meals:
+        return {
+            "status": "error",
+            "error_message": "No meals provided for calculation."
+        }
+    
+    store = get_food_store()
+    targets, targets_error = fetch_daily_targets(user_id) if user_id else (None, None)
+    
+    # Resolve names and units into flat arrays; items of meal m occupy
+    # positions offsets[m]:offsets[m + 1]
+    offsets = np.cumsum([0] + [len(food_items) for food_items in meals])
+    meal_index = np.repeat(np.arange(len(meals)), np.diff(offsets))
+    items = [item for food_items in meals for item in food_items]
+    names = [item["name"].lower() for item in items]
+    units = [item["unit"] for item in items]
+    
+    # Each distinct name and unit is resolved only once
+    name_matches = {name: store.resolve(name) for name in set(names)}
+    unit_codes = {unit: unit_code(unit) for unit in set(units)}
+    resolved_names = {
+        name: store.names[food_id]
+        for name, (food_id, confidence) in name_matches.items()
+        if food_id is not None and confidence < 1.0
+    }
+    
+    ids = np.array([name_matches[name][0] if name_matches[name][0] is not None else -1 for name in names], dtype=np.intp)
+    found = ids >= 0
+    ids[~found] = 0
+    scale = np.zeros(len(ids))
+    if found.any():
+        quantities = np.array([item["quantity"] for item in items], dtype=np.float64)
+        codes = np.array([unit_codes[unit] for unit in units], dtype=np.intp)
+        scale[found] = store.grams_batch(ids[found], quantities[found], codes[found]) / 100.0
+    
+    # weights[m, k] holds the 100 g portions of the k-th distinct food in meal m,
+    # so every meal total comes out of a single matrix product
+    distinct_ids, column = np.unique(ids[found], return_inverse=True)
+    weights = np.zeros((len(meals), len(distinct_ids)))
+    np.add.at(weights, (meal_index[found], column), scale[found])
+    totals = weights @ store.nutrients[distinct_ids]
+    
+    if include_items:
+        item_nutrients = scale[:, None] * store.nutrients[ids]
+    
+    is_found = found.tolist()
+    results = []
+    for m in range(len(meals)):
+        in_meal = range(offsets[m], offsets[m + 1])
+        items_calculated = [names[i] for i in in_meal if is_found[i]]
+        items_not_found = [names[i] for i in in_meal if not is_found[i]]
+        
+        if not items_calculated:
+            results.append({
+                "status": "error",
+                "error_message": "None of the provided food items were found in the database.",
+                "items_not_found": items_not_found
+            })
+            continue
+        
+        result = {
+            "status": "success",
+            "total_calories": round(float(totals[m, 0]), 1),
+            "total_macronutrients": {
+                nutrient: round(float(value), 1)
+                for nutrient, value in zip(MACRONUTRIENTS, totals[m, MACRONUTRIENT_SLICE])
+            },
+            "items_calculated": items_calculated,
+            "items_not_found": items_not_found,
+            "resolved_names": {name: resolved_names[name] for name in items_calculated if name in resolved_names}
+        }
+        if targets is not None:
+            result["percent_of_daily_target"] = _percent_of_daily_target(targets, totals[m])
+        if include_items:
+            result["items"] = [
+                {
+                    "name": names[i],
+                    "calories": round(float(item_nutrients[i, 0]), 1),
+                    "macronutrients": {
+                        nutrient: round(float(value), 1)
+                        for nutrient, value in zip(MACRONUTRIENTS, item_nutrients[i, MACRONUTRIENT_SLICE])
+                    }
+                }
+                for i in in_meal if is_found[i]
+            ]
+        results.append(result)
+    
+    response = {
+        "status": "success",
+        "meals": results
+    }
+    if targets_error is not None:
+        response["targets_error"] = targets_error
+    return response
+
+# Create the Function Tools
+# Short TTL: results with a user_id include targets from the saved profile
+calorie_calculator_tool = FunctionTool(func=memoize(calculate_nutrition, ttl_seconds=60))
+calorie_calculator_batch_tool = FunctionTool(func=memoize(calculate_nutrition_batch, ttl_seconds=60))
\ No newline at end of file
@@ -0,0 +1,295 @@
+from google.adk.tools import FunctionTool
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .food_store import (
+    MACRONUTRIENT_SLICE,
+    MACRONUTRIENTS,
+    MICRONUTRIENT_SLICE,
+    MICRONUTRIENTS,
+    format_micronutrient,
+)
+from .personal_api import user_profile_tool
+from .tool_cache import memoize
+
+# Personal daily targets derived from a user profile: BMR (Mifflin-St Jeor),
+# TDEE from the activity level, a calorie target for the goal, macronutrient
+# grams and micronutrient RDAs for the user's sex and age. The computation is
+# deterministic, so targets are cached per profile version and reused by
+# analyze_diet and the calorie calculator for gap checks.
+
+ACTIVITY_FACTORS = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "active": 1.725,
+    "very_active": 1.9,
+}
+DEFAULT_ACTIVITY_LEVEL = "light"
+
+# Calories added to the TDEE for each goal
+GOAL_CALORIE_ADJUSTMENTS = {
+    "lose": -500,
+    "maintain": 0,
+    "gain": 300,
+}
+DEFAULT_GOAL = "maintain"
+
+# Protein per kg of body weight for each goal
+PROTEIN_GRAMS_PER_KG = {
+    "lose": 1.6,
+    "maintain": 1.0,
+    "gain": 1.8,
+}
+FAT_CALORIE_PERCENT = 30
+FIBER_GRAMS_PER_1000_KCAL = 14
+
+# Lowest calorie target set without medical supervision
+MIN_CALORIES = {"male": 1500, "female": 1200}
+
+TARGET_CACHE_SIZE = 1024  # Profile versions whose targets are kept
+
+# Adult RDAs (or AIs), male and female, in the store's micronutrient units
+_MICRONUTRIENT_RDA = {
+    "vitamin_a": (900, 700),  # µg RAE
+    "vitamin_b6": (1.3, 1.3),
+    "vitamin_b12": (2.4, 2.4),  # µg
+    "vitamin_c": (90, 75),
+    "vitamin_d": (15, 15),  # µg
+    "vitamin_e": (15, 15),
+    "vitamin_k": (120, 90),  # µg
+    "thiamin": (1.2, 1.1),
+    "riboflavin": (1.3, 1.1),
+    "niacin": (16, 14),
+    "folate": (400, 400),  # µg DFE
+    "calcium": (1000, 1000),
+    "iron": (8, 18),
+    "magnesium": (400, 310),
+    "phosphorus": (700, 700),
+    "potassium": (3400, 2600),
+    "selenium": (55, 55),  # µg
+}
+
+# Age-dependent RDAs: (nutrient, from age, male, female)
+_MICRONUTRIENT_RDA_BY_AGE = [
+    ("magnesium", 31, 420, 320),
+    ("vitamin_b6", 51, 1.7, 1.5),
+    ("iron", 51, 8, 8),
+    ("calcium", 51, 1000, 1200),
+    ("calcium", 71, 1200, 1200),
+    ("vitamin_d", 71, 20, 20),
+]
+
+_SEXES = {
+    "male": "male", "m": "male", "man": "male", "pria": "male", "laki-laki": "male", "laki laki": "male",
+    "female": "female", "f": "female", "woman": "female", "wanita": "female", "perempuan": "female",
+}
+_GOALS = {
+    "lose": "lose", "lose weight": "lose", "weight loss": "lose", "fat loss": "lose", "cut": "lose",
+    "maintain": "maintain", "maintenance": "maintain", "maintain weight": "maintain",
+    "gain": "gain", "gain weight": "gain", "weight gain": "gain", "muscle gain": "gain", "bulk": "gain",
+}
+
+
+def _field(profile: Dict, *names):
+    for name in names:
+        value = profile.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def read_profile(profile: Dict) -> Tuple[str, int, float, float, str, str]:
+    """Reads (sex, age, weight_kg, height_cm, activity_level, goal) from profile fields.
+
+    Accepts "sex" or "gender", "age" or "birth_date", "weight_kg" or
+    "weight", "height_cm" or "height", and optional "activity_level" and
+    "goal". Raises ValueError if a required field is missing or invalid.
+    """
+    sex = _SEXES.get(str(_field(profile, "sex", "gender") or "").strip().lower())
+    if sex is None:
+        raise ValueError("Profile needs a sex or gender of male or female")
+
+    age = _field(profile, "age")
+    if age is None:
+        birth_date = _field(profile, "birth_date", "date_of_birth", "birthdate")
+        if birth_date is None:
+            raise ValueError("Profile needs an age or birth date")
+        born = date.fromisoformat(str(birth_date)[:10])
+        today = date.today()
+        age = today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+    weight = _field(profile, "weight_kg", "weight")
+    height = _field(profile, "height_cm", "height")
+    if weight is None or height is None:
+        raise ValueError("Profile needs a weight (kg) and height (cm)")
+    age, weight, height = int(age), float(weight), float(height)
+    if not (18 <= age <= 120) or weight <= 0 or height <= 0:
+        raise ValueError("Targets are only computed for adults with a valid weight and height")
+
+    activity_level = str(_field(profile, "activity_level", "activity") or DEFAULT_ACTIVITY_LEVEL).strip().lower().replace(" ", "_")
+    if activity_level not in ACTIVITY_FACTORS:
+        raise ValueError(f"Unknown activity level '{activity_level}', expected one of {list(ACTIVITY_FACTORS)}")
+    goal = _GOALS.get(str(_field(profile, "goal", "weight_goal") or DEFAULT_GOAL).strip().lower())
+    if goal is None:
+        raise ValueError(f"Unknown goal, expected one of {list(GOAL_CALORIE_ADJUSTMENTS)}")
+    return sex, age, weight, height, activity_level, goal
+
+
+class DailyTargets:
+    """Daily calorie, macronutrient and micronutrient targets of one profile.
+
+    Args:
+        bmr: Basal metabolic rate in kcal
+        tdee: Total daily energy expenditure in kcal
+        nutrients: Daily targets in NUTRIENT_COLUMNS order
+    """
+
+    def __init__(self, bmr: float, tdee: float, nutrients: np.ndarray):
+        self.bmr = bmr
+        self.tdee = tdee
+        self.nutrients = nutrients
+        self.nutrients.flags.writeable = False
+
+    @classmethod
+    def compute(cls, sex: str, age: int, weight_kg: float, height_cm: float, activity_level: str, goal: str) -> "DailyTargets":
+        bmr = 10 * weight_kg + 6.25 * height_cm - 5 * age + (5 if sex == "male" else -161)
+        tdee = bmr * ACTIVITY_FACTORS[activity_level]
+        calories = max(tdee + GOAL_CALORIE_ADJUSTMENTS[goal], MIN_CALORIES[sex])
+
+        protein = PROTEIN_GRAMS_PER_KG[goal] * weight_kg
+        fat = calories * FAT_CALORIE_PERCENT / 100 / 9
+        carbohydrates = max(calories - protein * 4 - fat * 9, 0) / 4
+        fiber = calories / 1000 * FIBER_GRAMS_PER_1000_KCAL
+
+        column = 0 if sex == "male" else 1
+        rda = {nutrient: values[column] for nutrient, values in _MICRONUTRIENT_RDA.items()}
+        for nutrient, from_age, male, female in _MICRONUTRIENT_RDA_BY_AGE:
+            if age >= from_age:
+                rda[nutrient] = male if sex == "male" else female
+
+        nutrients = np.array(
+            [calories, protein, carbohydrates, fat, fiber] + [rda[nutrient] for nutrient in MICRONUTRIENTS],
+            dtype=np.float64
+        )
+        return cls(bmr, tdee, nutrients)
+
+    def percent_of(self, totals: np.ndarray) -> np.ndarray:
+        """Intake as a percentage of each target, in NUTRIENT_COLUMNS order."""
+        return np.round(totals / self.nutrients * 100, 1)
+
+    def to_dict(self) -> Dict:
+        return {
+            "bmr": round(self.bmr),
+            "tdee": round(self.tdee),
+            "calories": round(float(self.nutrients[0])),
+            "macronutrients": {
+                nutrient: round(float(value), 1)
+                for nutrient, value in zip(MACRONUTRIENTS, self.nutrients[MACRONUTRIENT_SLICE])
+            },
+            "micronutrients": {
+                nutrient: format_micronutrient(nutrient, amount)
+                for nutrient, amount in zip(MICRONUTRIENTS, self.nutrients[MICRONUTRIENT_SLICE].tolist())
+            }
+        }
+
+
+_cache: "OrderedDict[Tuple, DailyTargets]" = OrderedDict()
+
+
+def get_daily_targets(profile: Dict, user_id: Optional[str] = None) -> DailyTargets:
+    """Returns the targets of a profile, computing them once per profile version.
+
+    Profiles with a "version" or "updated_at" field are cached under the
+    user and that version; other profiles under their target-relevant
+    fields. Raises ValueError for incomplete profiles (see read_profile).
+    """
+    version = _field(profile, "version", "profile_version", "updated_at")
+    user_id = user_id or _field(profile, "user_id", "id")
+    fields = None
+    if version is not None and user_id is not None:
+        key = ("version", str(user_id), str(version))
+    else:
+        fields = read_profile(profile)
+        key = ("fields",) + fields
+
+    targets = _cache.get(key)
+    if targets is not None:
+        _cache.move_to_end(key)
+        return targets
+    targets = DailyTargets.compute(*(fields or read_profile(profile)))
+    _cache[key] = targets
+    if len(_cache) > TARGET_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return targets
+
+
+def fetch_daily_targets(user_id: str) -> Tuple[Optional[DailyTargets], Optional[str]]:
+    """Loads a user's profile from the backend and returns (targets, error message)."""
+    # The profile tool's own (memoized) function, so repeated calls share its cache
+    response = user_profile_tool.func(user_id)
+    if response["status"] != "success":
+        return None, response["error_message"]
+    profile = response.get("data")
+    if isinstance(profile, dict) and isinstance(profile.get("profile"), dict):
+        profile = profile["profile"]
+    if not isinstance(profile, dict):
+        return None, f"The profile of user {user_id} has an unexpected format; expected an object of profile fields."
+    try:
+        return get_daily_targets(profile, user_id), None
+    except ValueError as exc:
+        return None, str(exc)
+
+
+def calculate_daily_targets(user_id: Optional[str] = None, profile: Optional[Dict] = None) -> Dict:
+    """Calculates a user's daily calorie, macronutrient and micronutrient targets.
+
+    Use this tool when the user asks how many calories or how much protein, carbohydrate,
+    fat, fiber or a vitamin or mineral they need per day. Give the user_id to read the
+    saved profile, or the profile fields directly.
+
+    Args:
+        user_id: The user whose saved profile to use
+        profile: Profile fields, if there is no saved profile:
+            {
+                "sex": "male" or "female",
+                "age": age in years (or "birth_date": "YYYY-MM-DD"),
+                "weight_kg": body weight in kg,
+                "height_cm": height in cm,
+                "activity_level": "sedentary", "light", "moderate", "active" or "very_active" (optional),
+                "goal": "lose", "maintain" or "gain" (optional)
+            }
+
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "bmr": basal metabolic rate in kcal,
+            "tdee": total daily energy expenditure in kcal,
+            "calories": daily calorie target for the goal,
+            "macronutrients": daily protein, carbohydrates, fat and fiber targets in grams,
+            "micronutrients": daily vitamin and mineral targets with their units,
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    if profile:
+        try:
+            targets = get_daily_targets(profile, user_id)
+        except ValueError as exc:
+            return {"status": "error", "error_message": str(exc)}
+    elif user_id:
+        targets, error = fetch_daily_targets(user_id)
+        if targets is None:
+            return {"status": "error", "error_message": error}
+    else:
+        return {
+            "status": "error",
+            "error_message": "A user_id or profile is required to calculate daily targets."
+        }
+    return {"status": "success", **targets.to_dict()}
+
+# Create the Function Tool
+# Short TTL: targets read from a saved profile follow profile edits
+daily_targets_tool = FunctionTool(func=memoize(calculate_daily_targets, ttl_seconds=60))
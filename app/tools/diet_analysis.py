@@ -1,249 +1,155 @@
 from google.adk.tools import FunctionTool
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-def analyze_diet(food_log: List[Dict]) -> Dict:
-    """Analyzes a user's diet based on their food log and provides nutritional insights.
-    
-    Use this tool when the user wants to analyze their diet, identify nutritional
-    gaps or excesses, or get feedback on their eating patterns.
+import numpy as np
+
+from .food_store import (
+    FOOD_GROUPS,
+    MACRONUTRIENT_SLICE,
+    MICRONUTRIENT_SLICE,
+    MICRONUTRIENTS,
+    NUTRIENT_COLUMNS,
+    format_micronutrient,
+    get_food_store,
+)
+from .daily_targets import DailyTargets, fetch_daily_targets
+from .tool_cache import memoize
+
+# Adult daily values (FDA), in the store's micronutrient units
+MICRONUTRIENT_DAILY_VALUES = {
+    "vitamin_a": 900,  # µg RAE
+    "vitamin_b6": 1.7,
+    "vitamin_b12": 2.4,  # µg
+    "vitamin_c": 90,
+    "vitamin_d": 20,  # µg
+    "vitamin_e": 15,
+    "vitamin_k": 120,  # µg
+    "thiamin": 1.2,
+    "riboflavin": 1.3,
+    "niacin": 16,
+    "folate": 400,  # µg DFE
+    "calcium": 1300,
+    "iron": 18,
+    "magnesium": 420,
+    "phosphorus": 1250,
+    "potassium": 4700,
+    "selenium": 55,  # µg
+}
+_DAILY_VALUES = np.array([MICRONUTRIENT_DAILY_VALUES[nutrient] for nutrient in MICRONUTRIENTS], dtype=np.float64)
+
+# Daily targets behind the strengths and gaps, unless personal targets are given
+MIN_PROTEIN_PERCENT = 15  # Share of macronutrient calories
+MIN_FIBER_GRAMS = 25
+MIN_FRUIT_SERVINGS = 2
+MIN_VEGETABLE_SERVINGS = 3
+
+# Calories within this percentage of a personal target count as on target
+CALORIE_TARGET_TOLERANCE_PERCENT = 10
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+class DietTotals:
+    """Running nutrient, food group and meal totals of a food log.
     
     Args:
-        food_log: A list of dictionaries representing the user's food intake, each containing:
-            {
-                "food": name of the food consumed (e.g., "apple", "chicken breast"),
-                "quantity": amount of the food (e.g., 100),
-                "unit": unit of measurement (e.g., "g", "oz", "cup", "piece"),
-                "meal_type": type of meal (e.g., "breakfast", "lunch", "dinner", "snack"),
-                "time": time of consumption (optional)
-            }
-    
-    Returns:
-        A dictionary with the following structure:
-        {
-            "status": "success" or "error",
-            "total_calories": total calories consumed,
-            "macronutrient_distribution": {
-                "protein_percent": percentage of calories from protein,
-                "carbohydrates_percent": percentage of calories from carbs,
-                "fat_percent": percentage of calories from fat
-            },
-            "nutritional_analysis": {
-                "strengths": list of nutritional strengths in the diet,
-                "gaps": list of potential nutritional gaps,
-                "recommendations": list of suggestions for improvement
-            },
-            "meal_pattern_analysis": analysis of meal timing and distribution,
-            "error_message": description of error (only if status is "error")
-        }
+        totals: Nutrient totals in NUTRIENT_COLUMNS order
+        food_group_counts: Items eaten per entry of FOOD_GROUPS
+        meal_counts: Items eaten per entry of MEAL_TYPES
     """
-    # In a real implementation, this would use a comprehensive nutritional analysis system
-    # For demonstration, we'll use a simplified approach with mock data
-    
-    # Food database with nutritional information
-    food_database = {
-        "apple": {
-            "calories": 52,
-            "protein": 0.3,
-            "carbohydrates": 13.8,
-            "fat": 0.2,
-            "fiber": 2.4,
-            "vitamins": ["vitamin C"],
-            "minerals": ["potassium"],
-            "food_group": "fruit"
-        },
-        "banana": {
-            "calories": 89,
-            "protein": 1.1,
-            "carbohydrates": 22.8,
-            "fat": 0.3,
-            "fiber": 2.6,
-            "vitamins": ["vitamin C", "vitamin B6"],
-            "minerals": ["potassium", "magnesium"],
-            "food_group": "fruit"
-        },
-        "chicken breast": {
-            "calories": 165,
-            "protein": 31,
-            "carbohydrates": 0,
-            "fat": 3.6,
-            "fiber": 0,
-            "vitamins": ["vitamin B6", "niacin"],
-            "minerals": ["phosphorus", "selenium"],
-            "food_group": "protein"
-        },
-        "salmon": {
-            "calories": 206,
-            "protein": 22,
-            "carbohydrates": 0,
-            "fat": 13,
-            "fiber": 0,
-            "vitamins": ["vitamin D", "vitamin B12"],
-            "minerals": ["selenium", "phosphorus"],
-            "food_group": "protein"
-        },
-        "broccoli": {
-            "calories": 34,
-            "protein": 2.8,
-            "carbohydrates": 6.6,
-            "fat": 0.4,
-            "fiber": 2.6,
-            "vitamins": ["vitamin C", "vitamin K", "folate"],
-            "minerals": ["potassium", "calcium"],
-            "food_group": "vegetable"
-        },
-        "spinach": {
-            "calories": 23,
-            "protein": 2.9,
-            "carbohydrates": 3.6,
-            "fat": 0.4,
-            "fiber": 2.2,
-            "vitamins": ["vitamin A", "vitamin K", "folate"],
-            "minerals": ["iron", "calcium"],
-            "food_group": "vegetable"
-        },
-        "brown rice": {
-            "calories": 112,
-            "protein": 2.6,
-            "carbohydrates": 23.5,
-            "fat": 0.9,
-            "fiber": 1.8,
-            "vitamins": ["niacin", "vitamin B6"],
-            "minerals": ["magnesium", "phosphorus"],
-            "food_group": "grain"
-        },
-        "white bread": {
-            "calories": 74,
-            "protein": 2.6,
-            "carbohydrates": 13.8,
-            "fat": 1,
-            "fiber": 0.8,
-            "vitamins": ["thiamin", "folate"],
-            "minerals": ["calcium", "iron"],
-            "food_group": "grain"
-        },
-        "greek yogurt": {
-            "calories": 59,
-            "protein": 10,
-            "carbohydrates": 3.6,
-            "fat": 0.4,
-            "fiber": 0,
-            "vitamins": ["vitamin B12", "riboflavin"],
-            "minerals": ["calcium", "phosphorus"],
-            "food_group": "dairy"
-        },
-        "almonds": {
-            "calories": 164,
-            "protein": 6,
-            "carbohydrates": 6,
-            "fat": 14,
-            "fiber": 3.5,
-            "vitamins": ["vitamin E", "riboflavin"],
-            "minerals": ["magnesium", "phosphorus"],
-            "food_group": "nuts"
-        }
-    }
-    
-    # Unit conversion factors (simplified)
-    unit_conversions = {
-        "g": 1,
-        "oz": 28,  # 1 oz ≈ 28g
-        "cup": {  # Approximate values, would be different for different foods
-            "rice": 180,  # 1 cup of rice ≈ 180g
-            "broccoli": 90,  # 1 cup of chopped broccoli ≈ 90g
-            "default": 150  # Default assumption
-        },
-        "piece": {
-            "apple": 180,  # 1 medium apple ≈ 180g
-            "banana": 120,  # 1 medium banana ≈ 120g
-            "default": 100  # Default assumption
-        }
-    }
-    
-    # Initialize counters
-    total_calories = 0
-    total_protein = 0
-    total_carbohydrates = 0
-    total_fat = 0
-    total_fiber = 0
-    
-    # Track food groups and nutrients
-    food_groups = {
-        "fruit": 0,
-        "vegetable": 0,
-        "protein": 0,
-        "grain": 0,
-        "dairy": 0,
-        "nuts": 0
-    }
     
-    vitamins_consumed = set()
-    minerals_consumed = set()
+    def __init__(
+        self,
+        totals: Optional[np.ndarray] = None,
+        food_group_counts: Optional[np.ndarray] = None,
+        meal_counts: Optional[np.ndarray] = None
+    ):
+        self.totals = totals if totals is not None else np.zeros(len(NUTRIENT_COLUMNS))
+        self.food_group_counts = food_group_counts if food_group_counts is not None else np.zeros(len(FOOD_GROUPS))
+        self.meal_counts = meal_counts if meal_counts is not None else np.zeros(len(MEAL_TYPES))
     
-    # Track meal patterns
-    meals = {
-        "breakfast": 0,
-        "lunch": 0,
-        "dinner": 0,
-        "snack": 0
-    }
-    
-    # Items not found in the database
-    items_not_found = []
-    
-    # Process each food item in the log
-    for item in food_log:
-        food_name = item["food"].lower()
-        quantity = item["quantity"]
-        unit = item["unit"].lower()
+    def add(self, store, item: Dict) -> Tuple[Optional[int], float]:
+        """Adds one food log item and returns its resolved (food_id, confidence)."""
+        food_name = item["food" if "food" in item else "name"].lower()
         meal_type = item["meal_type"].lower() if "meal_type" in item else "snack"
         
         # Update meal count
-        if meal_type in meals:
-            meals[meal_type] += 1
+        if meal_type in MEAL_TYPES:
+            self.meal_counts[MEAL_TYPES.index(meal_type)] += 1
         
-        if food_name in food_database:
-            # Convert to grams based on unit
-            if unit == "g":
-                quantity_in_grams = quantity
-            elif unit == "oz":
-                quantity_in_grams = quantity * unit_conversions["oz"]
-            elif unit == "cup":
-                if food_name in unit_conversions["cup"]:
-                    quantity_in_grams = quantity * unit_conversions["cup"][food_name]
-                else:
-                    quantity_in_grams = quantity * unit_conversions["cup"]["default"]
-            elif unit == "piece":
-                if food_name in unit_conversions["piece"]:
-                    quantity_in_grams = quantity * unit_conversions["piece"][food_name]
-                else:
-                    quantity_in_grams = quantity * unit_conversions["piece"]["default"]
-            else:
-                # Default to assuming the unit is grams
-                quantity_in_grams = quantity
-            
-            # Calculate scaling factor
-            scaling_factor = quantity_in_grams / 100  # Assuming database values are per 100g
-            
-            # Add to totals
-            food_data = food_database[food_name]
-            total_calories += food_data["calories"] * scaling_factor
-            total_protein += food_data["protein"] * scaling_factor
-            total_carbohydrates += food_data["carbohydrates"] * scaling_factor
-            total_fat += food_data["fat"] * scaling_factor
-            total_fiber += food_data["fiber"] * scaling_factor
+        food_id, confidence = store.resolve(food_name)
+        if food_id is not None:
+            quantity_in_grams = store.grams(food_id, item["quantity"], item["unit"])
+            self.totals += store.nutrients_for(food_id, quantity_in_grams)
             
             # Update food group count
-            if "food_group" in food_data and food_data["food_group"] in food_groups:
-                food_groups[food_data["food_group"]] += 1
-            
-            # Update vitamins and minerals
-            for vitamin in food_data["vitamins"]:
-                vitamins_consumed.add(vitamin)
-            
-            for mineral in food_data["minerals"]:
-                minerals_consumed.add(mineral)
-        else:
-            items_not_found.append(food_name)
+            self.food_group_counts[store.food_groups[food_id]] += 1
+        return food_id, confidence
+    
+    def merge(self, other: "DietTotals") -> None:
+        """Adds another set of totals to these."""
+        self.totals += other.totals
+        self.food_group_counts += other.food_group_counts
+        self.meal_counts += other.meal_counts
+    
+    def assess(self, days: int = 1, targets: Optional[DailyTargets] = None) -> Dict:
+        """Runs assess_diet on the per-day average over ``days`` days."""
+        return assess_diet(self.totals / days, self.food_group_counts / days, self.meal_counts / days, targets)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "totals": self.totals.tolist(),
+            "food_group_counts": self.food_group_counts.tolist(),
+            "meal_counts": self.meal_counts.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DietTotals":
+        return cls(
+            np.asarray(data["totals"], dtype=np.float64),
+            np.asarray(data["food_group_counts"], dtype=np.float64),
+            np.asarray(data["meal_counts"], dtype=np.float64)
+        )
+
+
+def assess_diet(
+    totals: np.ndarray,
+    food_group_counts: np.ndarray,
+    meal_counts: np.ndarray,
+    targets: Optional[DailyTargets] = None
+) -> Dict:
+    """Turns one day of totals into the analysis part of analyze_diet's result.
+    
+    For longer periods pass per-day averages; the counts are then fractional.
+    
+    Args:
+        totals: Nutrient totals in NUTRIENT_COLUMNS order
+        food_group_counts: Items eaten per entry of FOOD_GROUPS
+        meal_counts: Items eaten per entry of MEAL_TYPES
+        targets: Personal daily targets; fiber and micronutrient gaps are then
+            checked against them, and calorie and protein gaps are added
+    
+    Returns:
+        The "total_calories", "macronutrient_distribution", "nutritional_analysis",
+        "micronutrient_analysis" and "meal_pattern_analysis" fields of analyze_diet,
+        and "target_comparison" if targets were given
+    """
+    total_calories = float(totals[0])
+    total_protein, total_carbohydrates, total_fat, total_fiber = totals[MACRONUTRIENT_SLICE].tolist()
+    food_groups = dict(zip(FOOD_GROUPS, food_group_counts.tolist()))
+    meals = dict(zip(MEAL_TYPES, meal_counts.tolist()))
+    
+    # Micronutrient intake as a percentage of the daily values
+    micronutrient_totals = totals[MICRONUTRIENT_SLICE]
+    percent_of_daily_value = np.round(micronutrient_totals / _DAILY_VALUES * 100, 1)
+    below_daily_value = [MICRONUTRIENTS[i] for i in np.flatnonzero(percent_of_daily_value < 100)]
+    
+    # Intake as a percentage of the personal targets
+    min_fiber_grams = MIN_FIBER_GRAMS
+    if targets is not None:
+        percent_of_target = targets.percent_of(totals)
+        below_target = [MICRONUTRIENTS[i] for i in np.flatnonzero(percent_of_target[MICRONUTRIENT_SLICE] < 100)]
+        min_fiber_grams = float(targets.nutrients[NUTRIENT_COLUMNS.index("fiber")])
     
     # Calculate macronutrient distribution (calories)
     protein_calories = total_protein * 4  # 4 calories per gram of protein
@@ -268,32 +174,60 @@ def analyze_diet(food_log: List[Dict]) -> Dict:
     recommendations = []
     
     # Check protein intake
-    if protein_percent >= 15:
+    if protein_percent >= MIN_PROTEIN_PERCENT:
         strengths.append("Adequate protein intake")
     else:
         gaps.append("Low protein intake")
         recommendations.append("Consider adding more lean protein sources like chicken, fish, tofu, or legumes")
     
+    # Check calories and protein against the personal targets
+    if targets is not None:
+        calorie_percent = percent_of_target[0]
+        if calorie_percent < 100 - CALORIE_TARGET_TOLERANCE_PERCENT:
+            gaps.append("Calories below your daily target")
+            recommendations.append("Add nutrient-dense foods or snacks to reach your calorie target")
+        elif calorie_percent > 100 + CALORIE_TARGET_TOLERANCE_PERCENT:
+            gaps.append("Calories above your daily target")
+            recommendations.append("Reduce portion sizes or energy-dense foods to stay near your calorie target")
+        else:
+            strengths.append("Calories close to your daily target")
+        if percent_of_target[NUTRIENT_COLUMNS.index("protein")] < 100:
+            gaps.append("Protein below your daily target")
+            recommendations.append("Add a protein source to more of your meals to reach your protein target")
+    
     # Check fiber intake
-    if total_fiber >= 25:
+    if total_fiber >= min_fiber_grams:
         strengths.append("Good fiber intake")
     else:
         gaps.append("Low fiber intake")
         recommendations.append("Increase consumption of fruits, vegetables, and whole grains")
     
     # Check food group diversity
-    if food_groups["fruit"] >= 2:
+    if food_groups["fruit"] >= MIN_FRUIT_SERVINGS:
         strengths.append("Good fruit consumption")
     else:
         gaps.append("Low fruit intake")
         recommendations.append("Try to include more fruits in your diet")
     
-    if food_groups["vegetable"] >= 3:
+    if food_groups["vegetable"] >= MIN_VEGETABLE_SERVINGS:
         strengths.append("Good vegetable consumption")
     else:
         gaps.append("Low vegetable intake")
         recommendations.append("Add more vegetables to your meals")
     
+    # Check micronutrients
+    if targets is not None:
+        if below_target:
+            gaps.append("Below your daily target for " + ", ".join(nutrient.replace("_", " ") for nutrient in below_target))
+            recommendations.append("Vary your food choices to cover more vitamins and minerals")
+        else:
+            strengths.append("Meets your daily targets for vitamins and minerals")
+    elif below_daily_value:
+        gaps.append("Below the daily value for " + ", ".join(nutrient.replace("_", " ") for nutrient in below_daily_value))
+        recommendations.append("Vary your food choices to cover more vitamins and minerals")
+    else:
+        strengths.append("Meets the daily values for vitamins and minerals")
+    
     # Check meal patterns
     meal_pattern_analysis = ""
     if meals["breakfast"] == 0:
@@ -308,24 +242,128 @@ def analyze_diet(food_log: List[Dict]) -> Dict:
     else:
         meal_pattern_analysis += "You have a good meal frequency. "
     
-    # Prepare the result
-    if len(food_log) > 0:
-        return {
-            "status": "success",
-            "total_calories": round(total_calories, 1),
+    analysis = {
+        "total_calories": round(total_calories, 1),
+        "macronutrient_distribution": {
+            "protein_percent": protein_percent,
+            "carbohydrates_percent": carb_percent,
+            "fat_percent": fat_percent
+        },
+        "nutritional_analysis": {
+            "strengths": strengths,
+            "gaps": gaps,
+            "recommendations": recommendations
+        },
+        "micronutrient_analysis": {
+            "intake": {
+                nutrient: format_micronutrient(nutrient, amount)
+                for nutrient, amount in zip(MICRONUTRIENTS, micronutrient_totals.tolist())
+            },
+            "percent_of_daily_value": dict(zip(MICRONUTRIENTS, percent_of_daily_value.tolist())),
+            "below_daily_value": below_daily_value
+        },
+        "meal_pattern_analysis": meal_pattern_analysis
+    }
+    if targets is not None:
+        analysis["micronutrient_analysis"]["percent_of_target"] = dict(
+            zip(MICRONUTRIENTS, percent_of_target[MICRONUTRIENT_SLICE].tolist())
+        )
+        analysis["micronutrient_analysis"]["below_target"] = below_target
+        analysis["target_comparison"] = {
+            nutrient: {
+                "target": round(float(target), 1),
+                "intake": round(float(intake), 1),
+                "percent": float(percent)
+            }
+            for nutrient, target, intake, percent in zip(
+                NUTRIENT_COLUMNS[:MACRONUTRIENT_SLICE.stop],
+                targets.nutrients.tolist(),
+                totals.tolist(),
+                percent_of_target.tolist()
+            )
+        }
+    return analysis
+
+
+def analyze_diet(food_log: List[Dict], user_id: Optional[str] = None) -> Dict:
+    """Analyzes a user's diet based on their food log and provides nutritional insights.
+    
+    Use this tool when the user wants to analyze their diet, identify nutritional
+    gaps or excesses, or get feedback on their eating patterns.
+    
+    Args:
+        food_log: A list of dictionaries representing the user's food intake, each containing:
+            {
+                "food": name of the food consumed (e.g., "apple", "chicken breast"); "name" is also accepted,
+                "quantity": amount of the food (e.g., 100),
+                "unit": unit of measurement (e.g., "g", "oz", "cup", "piece"),
+                "meal_type": type of meal (e.g., "breakfast", "lunch", "dinner", "snack"),
+                "time": time of consumption (optional)
+            }
+        user_id: The user whose saved profile sets personal daily targets (optional);
+            without it, gaps are checked against general adult daily values
+    
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "total_calories": total calories consumed,
             "macronutrient_distribution": {
-                "protein_percent": protein_percent,
-                "carbohydrates_percent": carb_percent,
-                "fat_percent": fat_percent
+                "protein_percent": percentage of calories from protein,
+                "carbohydrates_percent": percentage of calories from carbs,
+                "fat_percent": percentage of calories from fat
             },
             "nutritional_analysis": {
-                "strengths": strengths,
-                "gaps": gaps,
-                "recommendations": recommendations
+                "strengths": list of nutritional strengths in the diet,
+                "gaps": list of potential nutritional gaps,
+                "recommendations": list of suggestions for improvement
+            },
+            "micronutrient_analysis": {
+                "intake": total amount of each vitamin and mineral, with its unit,
+                "percent_of_daily_value": intake as a percentage of the adult daily value,
+                "below_daily_value": micronutrients below their daily value,
+                "percent_of_target": intake as a percentage of the personal target (only with user_id),
+                "below_target": micronutrients below their personal target (only with user_id)
             },
-            "meal_pattern_analysis": meal_pattern_analysis,
-            "items_not_found": items_not_found
+            "meal_pattern_analysis": analysis of meal timing and distribution,
+            "target_comparison": calories, protein, carbohydrates, fat and fiber against
+                the personal targets, each as {"target", "intake", "percent"} (only with user_id),
+            "targets_error": why personal targets could not be used (only if they could not),
+            "items_not_found": list of food items not found in the database,
+            "resolved_names": approximate name matches, mapping the given name to the database food used,
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    store = get_food_store()
+    diet_totals = DietTotals()
+    
+    # Items not found in the database, and approximate name matches
+    items_not_found = []
+    resolved_names = {}
+    
+    # Process each food item in the log
+    for item in food_log:
+        food_id, confidence = diet_totals.add(store, item)
+        food_name = item["food" if "food" in item else "name"].lower()
+        if food_id is None:
+            items_not_found.append(food_name)
+        elif confidence < 1.0:
+            resolved_names[food_name] = store.names[food_id]
+    
+    # Personal targets, if the user's profile allows them
+    targets, targets_error = fetch_daily_targets(user_id) if user_id else (None, None)
+    
+    # Prepare the result
+    if len(food_log) > 0:
+        result = {
+            "status": "success",
+            **diet_totals.assess(targets=targets),
+            "items_not_found": items_not_found,
+            "resolved_names": resolved_names
         }
+        if targets_error is not None:
+            result["targets_error"] = targets_error
+        return result
     else:
         return {
             "status": "error",
@@ -333,4 +371,5 @@ def analyze_diet(food_log: List[Dict]) -> Dict:
         }
 
 # Create the Function Tool
-diet_analysis_tool = FunctionTool(func=analyze_diet) 
\ No newline at end of file
+# Short TTL: results with a user_id include targets from the saved profile
+diet_analysis_tool = FunctionTool(func=memoize(analyze_diet, ttl_seconds=60))
\ No newline at end of file
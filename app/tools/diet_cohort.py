@@ -0,0 +1,190 @@
+"""
+Vectorized diet analysis for many users at once.
+
+Takes a long-format food log table with one row per eaten item
+(user, day, food_id, grams) and computes, for every (user, day), the same
+totals, macronutrient percentages, food group counts and gap flags that
+analyze_diet produces for a single day, using grouped NumPy reductions
+instead of a per-item loop. Results are written out in one pass.
+
+Run from the app directory:
+    python -m tools.diet_cohort food_log.csv results.csv
+    python -m tools.diet_cohort food_log.npz results.npz
+    python -m tools.diet_cohort food_log.nlog results.csv
+
+A CSV input has the header user,day,food_id,grams; an .npz input holds
+arrays with those names; an .nlog input is a food log file written by
+tools/food_log_importer.py and is read through memory-mapped columns.
+Rows whose food_id is negative are counted as not found.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import argparse
+import csv
+
+import numpy as np
+
+from .diet_analysis import (
+    MICRONUTRIENT_DAILY_VALUES,
+    MIN_FIBER_GRAMS,
+    MIN_FRUIT_SERVINGS,
+    MIN_PROTEIN_PERCENT,
+    MIN_VEGETABLE_SERVINGS,
+)
+from .food_log_importer import FoodLogTable
+from .food_store import FOOD_GROUPS, MICRONUTRIENTS, NUTRIENT_COLUMNS, get_food_store
+
+LOG_COLUMNS = ["user", "day", "food_id", "grams"]
+
+_DAILY_VALUES = np.array([MICRONUTRIENT_DAILY_VALUES[nutrient] for nutrient in MICRONUTRIENTS], dtype=np.float64)
+
+
+def _factorize(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the distinct values and the code of every element."""
+    uniques, codes = np.unique(values, return_inverse=True)
+    return uniques, codes.reshape(-1)
+
+
+def analyze_cohort(users, days, food_ids, grams) -> Dict[str, np.ndarray]:
+    """Analyzes every (user, day) of a long-format food log.
+
+    Args:
+        users: User of every row
+        days: Day of every row (e.g. ISO date strings)
+        food_ids: Food store ID of every row; negative for foods not found
+        grams: Grams eaten in every row
+
+    Returns:
+        Column arrays with one entry per (user, day), sorted by user and day:
+        "user", "day", "items", "items_not_found", one column per nutrient in
+        NUTRIENT_COLUMNS, "protein_percent", "carbohydrates_percent",
+        "fat_percent", a "<group>_servings" column per food group, the flags
+        "low_protein", "low_fiber", "low_fruit", "low_vegetable", and a
+        "<nutrient>_below_daily_value" flag per micronutrient
+    """
+    store = get_food_store()
+    food_ids = np.asarray(food_ids, dtype=np.int64)
+    grams = np.asarray(grams, dtype=np.float64)
+
+    # One group per (user, day)
+    user_values, user_codes = _factorize(np.asarray(users))
+    day_values, day_codes = _factorize(np.asarray(days))
+    group_keys, groups = _factorize(user_codes * len(day_values) + day_codes)
+    num_groups = len(group_keys)
+
+    found = food_ids >= 0
+    found_ids = food_ids[found]
+    found_groups = groups[found]
+    scale = grams[found] / 100.0
+
+    results = {
+        "user": user_values[group_keys // len(day_values)],
+        "day": day_values[group_keys % len(day_values)],
+        "items": np.bincount(groups, minlength=num_groups),
+        "items_not_found": np.bincount(groups[~found], minlength=num_groups),
+    }
+
+    # Nutrient totals, one grouped sum per column
+    totals = np.empty((num_groups, len(NUTRIENT_COLUMNS)))
+    for j, nutrient in enumerate(NUTRIENT_COLUMNS):
+        totals[:, j] = np.bincount(found_groups, weights=store.nutrients[found_ids, j] * scale, minlength=num_groups)
+        results[nutrient] = totals[:, j]
+
+    # Macronutrient distribution (calories), as in analyze_diet
+    macro_calories = np.column_stack([
+        totals[:, NUTRIENT_COLUMNS.index("protein")] * 4,
+        totals[:, NUTRIENT_COLUMNS.index("carbohydrates")] * 4,
+        totals[:, NUTRIENT_COLUMNS.index("fat")] * 9,
+    ])
+    total_macro_calories = macro_calories.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        percents = np.where(total_macro_calories > 0, np.round(macro_calories / total_macro_calories * 100, 1), 0.0)
+    results["protein_percent"] = percents[:, 0]
+    results["carbohydrates_percent"] = percents[:, 1]
+    results["fat_percent"] = percents[:, 2]
+
+    # Food group counts from one bincount over (group, food group) pairs
+    food_group_counts = np.bincount(
+        found_groups * len(FOOD_GROUPS) + store.food_groups[found_ids],
+        minlength=num_groups * len(FOOD_GROUPS)
+    ).reshape(num_groups, len(FOOD_GROUPS))
+    for k, food_group in enumerate(FOOD_GROUPS):
+        results[f"{food_group}_servings"] = food_group_counts[:, k]
+
+    # Gap flags
+    results["low_protein"] = percents[:, 0] < MIN_PROTEIN_PERCENT
+    results["low_fiber"] = totals[:, NUTRIENT_COLUMNS.index("fiber")] < MIN_FIBER_GRAMS
+    results["low_fruit"] = food_group_counts[:, FOOD_GROUPS.index("fruit")] < MIN_FRUIT_SERVINGS
+    results["low_vegetable"] = food_group_counts[:, FOOD_GROUPS.index("vegetable")] < MIN_VEGETABLE_SERVINGS
+    micronutrient_start = NUTRIENT_COLUMNS.index(MICRONUTRIENTS[0])
+    percent_of_daily_value = np.round(totals[:, micronutrient_start:] / _DAILY_VALUES * 100, 1)
+    for k, nutrient in enumerate(MICRONUTRIENTS):
+        results[f"{nutrient}_below_daily_value"] = percent_of_daily_value[:, k] < 100
+
+    return results
+
+
+def read_food_log_table(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Reads a (user, day, food_id, grams) table from a CSV or .npz file."""
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return tuple(data[column] for column in LOG_COLUMNS)
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = [column.strip().lower() for column in next(reader)]
+        indices = [header.index(column) for column in LOG_COLUMNS]
+        rows = [[row[index] for index in indices] for row in reader if row]
+    columns = list(zip(*rows)) if rows else [(), (), (), ()]
+    return (
+        np.asarray(columns[0], dtype=str),
+        np.asarray(columns[1], dtype=str),
+        np.asarray(columns[2], dtype=np.int64),
+        np.asarray(columns[3], dtype=np.float64),
+    )
+
+
+def analyze_food_log_file(path: str) -> Dict[str, np.ndarray]:
+    """Runs analyze_cohort on a food log file, with user names and ISO dates in the results."""
+    table = FoodLogTable.open(path)
+    results = analyze_cohort(table.user, table.day, table.food_id, table.grams)
+    results["user"] = np.array([table.users[code] for code in results["user"].tolist()], dtype=str)
+    results["day"] = (np.datetime64("1970-01-01") + results["day"].astype("timedelta64[D]")).astype(str)
+    return results
+
+
+def write_cohort_results(path: str, results: Dict[str, np.ndarray]) -> None:
+    """Writes analyze_cohort results to a CSV or .npz file in one pass."""
+    if path.endswith(".npz"):
+        np.savez(path, **results)
+        return
+    columns = list(results)
+    values = []
+    for column in columns:
+        array = results[column]
+        if array.dtype.kind == "f":
+            array = np.round(array, 1)
+        elif array.dtype.kind == "b":
+            array = array.astype(np.int8)
+        values.append(array.tolist())
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        writer.writerows(zip(*values))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("in_path", help="Food log table (.csv, .npz or .nlog)")
+    parser.add_argument("out_path", help="Results file (.csv or .npz)")
+    args = parser.parse_args(argv)
+
+    if args.in_path.endswith(".nlog"):
+        results = analyze_food_log_file(args.in_path)
+    else:
+        results = analyze_cohort(*read_food_log_table(args.in_path))
+    write_cohort_results(args.out_path, results)
+    print(f"Wrote {len(results['user'])} user-days to {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .diet_analysis import DietTotals
+from .food_store import get_food_store
+
+# Streaming diet analysis for long food logs. Entries are consumed one at a
+# time in date order; only the open day and week are kept, so memory stays
+# constant however many months of logs pass through. Each closed period is
+# emitted with the same strengths, gaps and recommendations as analyze_diet.
+# The open aggregates can be saved with state() and resumed later.
+
+STATE_VERSION = 1
+
+
+def _entry_date(entry: Dict) -> date:
+    """Reads the day of a log entry from its "date" or "time" (ISO 8601)."""
+    value = entry.get("date") or entry.get("time")
+    if value is None:
+        raise ValueError(f"Food log entry has no date: {entry}")
+    if isinstance(value, date):
+        return value if type(value) is date else value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _week_start(day: date) -> date:
+    """Monday of the ISO week that contains ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+class StreamingDietAnalyzer:
+    """Incremental per-day and per-week diet analysis over an iterator of log entries.
+
+    Entries use the analyze_diet item format plus a "date" (or ISO "time").
+    They must arrive in date order; entries for a day that has already been
+    emitted are counted in ``late_entries`` and skipped.
+
+    Args:
+        state: A dictionary previously returned by ``state()``, to resume from
+    """
+
+    def __init__(self, state: Optional[Dict] = None):
+        self.store = get_food_store()
+        self.day: Optional[date] = None
+        self.day_totals = DietTotals()
+        self.day_items = 0
+        self.day_not_found = 0
+        self.week: Optional[date] = None
+        self.week_totals = DietTotals()
+        self.week_days = 0
+        self.week_items = 0
+        self.late_entries = 0
+        if state is not None:
+            self._restore(state)
+
+    def feed(self, entries: Iterable[Dict]) -> Iterator[Dict]:
+        """Consumes entries and yields the summary of every day and week that closes."""
+        for entry in entries:
+            day = _entry_date(entry)
+            if self.day is not None and day < self.day:
+                self.late_entries += 1
+                continue
+            if day != self.day:
+                yield from self._close_day()
+                if self.week is not None and _week_start(day) != self.week:
+                    yield from self._close_week()
+                self.day = day
+                self.week = _week_start(day)
+
+            food_id, _ = self.day_totals.add(self.store, entry)
+            self.day_items += 1
+            if food_id is None:
+                self.day_not_found += 1
+
+    def close(self) -> List[Dict]:
+        """Emits the open day and week, e.g. at the end of the log."""
+        summaries = list(self._close_day())
+        summaries.extend(self._close_week())
+        return summaries
+
+    def _close_day(self) -> Iterator[Dict]:
+        if self.day is None or self.day_items == 0:
+            return
+        yield {
+            "period": "day",
+            "start": self.day.isoformat(),
+            "end": self.day.isoformat(),
+            "days_logged": 1,
+            "items": self.day_items,
+            "items_not_found": self.day_not_found,
+            **self.day_totals.assess()
+        }
+        self.week_totals.merge(self.day_totals)
+        self.week_days += 1
+        self.week_items += self.day_items
+        self.day_totals = DietTotals()
+        self.day_items = 0
+        self.day_not_found = 0
+
+    def _close_week(self) -> Iterator[Dict]:
+        if self.week is None or self.week_days == 0:
+            return
+        # Weekly figures are averages per logged day, so the daily targets apply
+        yield {
+            "period": "week",
+            "start": self.week.isoformat(),
+            "end": (self.week + timedelta(days=6)).isoformat(),
+            "days_logged": self.week_days,
+            "items": self.week_items,
+            **self.week_totals.assess(self.week_days)
+        }
+        self.week_totals = DietTotals()
+        self.week_days = 0
+        self.week_items = 0
+
+    def state(self) -> Dict:
+        """Returns the open aggregates as a JSON-serializable dictionary."""
+        return {
+            "version": STATE_VERSION,
+            "day": self.day.isoformat() if self.day is not None else None,
+            "day_totals": self.day_totals.to_dict(),
+            "day_items": self.day_items,
+            "day_not_found": self.day_not_found,
+            "week": self.week.isoformat() if self.week is not None else None,
+            "week_totals": self.week_totals.to_dict(),
+            "week_days": self.week_days,
+            "week_items": self.week_items,
+            "late_entries": self.late_entries
+        }
+
+    def _restore(self, state: Dict) -> None:
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported diet analyzer state version: {state.get('version')}")
+        self.day = date.fromisoformat(state["day"]) if state["day"] else None
+        self.day_totals = DietTotals.from_dict(state["day_totals"])
+        self.day_items = state["day_items"]
+        self.day_not_found = state["day_not_found"]
+        self.week = date.fromisoformat(state["week"]) if state["week"] else None
+        self.week_totals = DietTotals.from_dict(state["week_totals"])
+        self.week_days = state["week_days"]
+        self.week_items = state["week_items"]
+        self.late_entries = state["late_entries"]
+
+
+def analyze_diet_history(entries: Iterable[Dict], state: Optional[Dict] = None) -> Iterator[Dict]:
+    """Yields day and week summaries for a whole food log, closing the last period at the end."""
+    analyzer = StreamingDietAnalyzer(state)
+    yield from analyzer.feed(entries)
+    yield from analyzer.close()
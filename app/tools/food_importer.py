@@ -0,0 +1,384 @@
+"""
+Offline importer that converts food composition CSV exports into a food store file.
+
+The output is the memory-mapped columnar format read by ``FoodStore.open``;
+point FOOD_STORE_PATH at it to make the nutrition tools use the full dataset.
+
+Run from the app directory:
+    python -m tools.food_importer tkpi TKPI.csv foods.store
+    python -m tools.food_importer fdc food.csv food_nutrient.csv foods.store
+    python -m tools.food_importer csv foods.csv foods.store --name-column Name \
+        --column "calories=Energy (kcal)" --column "vitamin_d=Vitamin D (IU):IU"
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import csv
+
+import numpy as np
+
+from .food_store import (
+    FOOD_GROUPS,
+    MICRONUTRIENT_UNITS,
+    NUTRIENT_COLUMNS,
+    micronutrient_factor,
+    normalize_food_name,
+    write_food_store,
+)
+
+# A column spec maps a nutrient to candidate CSV headers and a factor that
+# converts the CSV unit to the store unit (kcal, grams, or the micronutrient
+# units in MICRONUTRIENT_UNITS per 100 g)
+ColumnSpec = Dict[str, Tuple[Sequence[str], float]]
+
+# Tabel Komposisi Pangan Indonesia (TKPI); values are per 100 g edible portion
+TKPI_NAME_COLUMNS = ["nama bahan", "nama bahan makanan"]
+TKPI_CODE_COLUMNS = ["kode", "kode bahan"]
+TKPI_COLUMNS: ColumnSpec = {
+    "calories": (["energi (kal)", "energi (kkal)", "energi"], 1.0),
+    "protein": (["protein (g)", "protein"], 1.0),
+    "fat": (["lemak (g)", "lemak"], 1.0),
+    "carbohydrates": (["kh (g)", "karbohidrat (g)", "karbohidrat"], 1.0),
+    "fiber": (["serat (g)", "serat"], 1.0),
+    "calcium": (["kalsium (mg)", "kalsium (ca) (mg)", "kalsium"], 1.0),
+    "phosphorus": (["fosfor (mg)", "fosfor (p) (mg)", "fosfor"], 1.0),
+    "iron": (["besi (mg)", "besi (fe) (mg)", "besi"], 1.0),
+    "potassium": (["kalium (mg)", "kalium (k) (mg)", "kalium"], 1.0),
+    "vitamin_a": (["retinol (mcg)", "retinol (µg)", "retinol (vit. a) (mcg)", "retinol"], 1.0),
+    "thiamin": (["thiamin (mg)", "thiamin (vit. b1) (mg)", "thiamin"], 1.0),
+    "riboflavin": (["riboflavin (mg)", "riboflavin (vit. b2) (mg)", "riboflavin"], 1.0),
+    "niacin": (["niasin (mg)", "niasin"], 1.0),
+    "vitamin_c": (["vit c (mg)", "vit. c (mg)", "vitamin c (mg)", "vit c"], 1.0),
+}
+
+# The first letter of a TKPI code identifies its food group
+TKPI_FOOD_GROUPS = {
+    "a": "grain",  # Serealia
+    "c": "nuts",  # Kacang-kacangan, biji-bijian
+    "d": "vegetable",  # Sayuran
+    "e": "fruit",  # Buah
+    "f": "protein",  # Daging dan unggas
+    "g": "protein",  # Ikan, kerang, udang
+    "h": "protein",  # Telur
+    "j": "dairy",  # Susu
+}
+
+# USDA FoodData Central nutrient IDs; FDC reports every nutrient in the
+# same unit as the store
+FDC_NUTRIENTS = {
+    1008: ("calories", 1.0),
+    1003: ("protein", 1.0),
+    1005: ("carbohydrates", 1.0),
+    1004: ("fat", 1.0),
+    1079: ("fiber", 1.0),
+    1106: ("vitamin_a", 1.0),
+    1175: ("vitamin_b6", 1.0),
+    1178: ("vitamin_b12", 1.0),
+    1162: ("vitamin_c", 1.0),
+    1114: ("vitamin_d", 1.0),
+    1109: ("vitamin_e", 1.0),
+    1185: ("vitamin_k", 1.0),
+    1165: ("thiamin", 1.0),
+    1166: ("riboflavin", 1.0),
+    1167: ("niacin", 1.0),
+    1177: ("folate", 1.0),
+    1087: ("calcium", 1.0),
+    1089: ("iron", 1.0),
+    1090: ("magnesium", 1.0),
+    1091: ("phosphorus", 1.0),
+    1092: ("potassium", 1.0),
+    1103: ("selenium", 1.0),
+}
+
+# Foundation foods often only report Atwater energy; used when 1008 is missing
+FDC_FALLBACK_ENERGY = (2047, 2048)
+
+FDC_FOOD_GROUPS = {
+    "1": "dairy",  # Dairy and Egg Products
+    "5": "protein",  # Poultry Products
+    "7": "protein",  # Sausages and Luncheon Meats
+    "8": "grain",  # Breakfast Cereals
+    "9": "fruit",  # Fruits and Fruit Juices
+    "10": "protein",  # Pork Products
+    "11": "vegetable",  # Vegetables and Vegetable Products
+    "12": "nuts",  # Nut and Seed Products
+    "13": "protein",  # Beef Products
+    "15": "protein",  # Finfish and Shellfish Products
+    "16": "protein",  # Legumes and Legume Products
+    "17": "protein",  # Lamb, Veal, and Game Products
+    "18": "grain",  # Baked Products
+    "20": "grain",  # Cereal Grains and Pasta
+}
+
+
+def _normalize_header(header: str) -> str:
+    return " ".join(header.strip().lower().split())
+
+
+def _parse_number(value: str) -> float:
+    """Parses a CSV cell; blanks, dashes and trace amounts count as zero."""
+    value = value.strip().lower()
+    if value in ("", "-", "tr", "n/a", "na"):
+        return 0.0
+    if "," in value and "." not in value:
+        # Decimal comma, as used in Indonesian exports
+        value = value.replace(",", ".")
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def _open_csv(path: str):
+    fh = open(path, "r", encoding="utf-8-sig", newline="")
+    sample = fh.read(8192)
+    fh.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    return fh, csv.reader(fh, dialect)
+
+
+def _find_column(headers: List[str], candidates: Sequence[str]) -> Optional[int]:
+    for candidate in candidates:
+        candidate = _normalize_header(candidate)
+        if candidate in headers:
+            return headers.index(candidate)
+    return None
+
+
+def import_wide_csv(
+    csv_path: str,
+    out_path: str,
+    name_columns: Sequence[str],
+    columns: ColumnSpec,
+    group_columns: Sequence[str] = (),
+    food_groups: Optional[Dict[str, str]] = None,
+    group_prefix_length: Optional[int] = None,
+    aliases_csv: Optional[str] = None
+) -> int:
+    """Imports a CSV with one food per row and one column per nutrient.
+
+    Args:
+        csv_path: Path of the CSV export
+        out_path: Path of the food store file to write
+        name_columns: Candidate headers for the food name column
+        columns: Nutrient column spec (candidate headers and unit factor)
+        group_columns: Candidate headers for a column that identifies the food group
+        food_groups: Maps values of the group column to names in FOOD_GROUPS
+        group_prefix_length: Only match this many leading characters of the group value
+        aliases_csv: Optional CSV of (alias, food name) rows, e.g. local food names
+
+    Returns:
+        The number of foods written.
+    """
+    fh, reader = _open_csv(csv_path)
+    with fh:
+        headers = [_normalize_header(header) for header in next(reader)]
+        name_index = _find_column(headers, name_columns)
+        if name_index is None:
+            raise ValueError(f"None of the name columns {list(name_columns)} found in {csv_path}")
+        group_index = _find_column(headers, group_columns) if group_columns else None
+
+        column_indices = []
+        for nutrient, (candidates, factor) in columns.items():
+            index = _find_column(headers, candidates)
+            if index is not None:
+                column_indices.append((NUTRIENT_COLUMNS.index(nutrient), index, factor))
+
+        names = []
+        rows = []
+        groups = []
+        for row in reader:
+            if len(row) <= name_index or not row[name_index].strip():
+                continue
+            values = np.zeros(len(NUTRIENT_COLUMNS))
+            for column, index, factor in column_indices:
+                if index < len(row):
+                    values[column] = _parse_number(row[index]) * factor
+            names.append(row[name_index])
+            rows.append(values)
+
+            group = "other"
+            if group_index is not None and group_index < len(row):
+                value = row[group_index].strip().lower()
+                if group_prefix_length:
+                    value = value[:group_prefix_length]
+                group = (food_groups or {}).get(value, "other")
+            groups.append(FOOD_GROUPS.index(group))
+
+    return _write(out_path, names, rows, groups, aliases_csv)
+
+
+def import_tkpi(csv_path: str, out_path: str, aliases_csv: Optional[str] = None) -> int:
+    """Imports a CSV export of the Indonesian TKPI food composition table."""
+    return import_wide_csv(
+        csv_path,
+        out_path,
+        name_columns=TKPI_NAME_COLUMNS,
+        columns=TKPI_COLUMNS,
+        group_columns=TKPI_CODE_COLUMNS,
+        food_groups=TKPI_FOOD_GROUPS,
+        group_prefix_length=1,
+        aliases_csv=aliases_csv
+    )
+
+
+def import_fdc(
+    food_csv: str,
+    food_nutrient_csv: str,
+    out_path: str,
+    data_types: Optional[Iterable[str]] = None,
+    aliases_csv: Optional[str] = None
+) -> int:
+    """Imports a USDA FoodData Central CSV export (food.csv + food_nutrient.csv).
+
+    Args:
+        food_csv: Path of food.csv
+        food_nutrient_csv: Path of food_nutrient.csv
+        out_path: Path of the food store file to write
+        data_types: Only import these FDC data types (e.g. "sr_legacy_food")
+        aliases_csv: Optional CSV of (alias, food name) rows
+
+    Returns:
+        The number of foods written.
+    """
+    data_types = set(data_types) if data_types else None
+
+    rows_by_fdc_id: Dict[str, int] = {}
+    names = []
+    groups = []
+    fh, reader = _open_csv(food_csv)
+    with fh:
+        headers = [_normalize_header(header) for header in next(reader)]
+        id_index = headers.index("fdc_id")
+        description_index = headers.index("description")
+        type_index = headers.index("data_type") if "data_type" in headers else None
+        category_index = headers.index("food_category_id") if "food_category_id" in headers else None
+        for row in reader:
+            if data_types is not None and type_index is not None and row[type_index] not in data_types:
+                continue
+            rows_by_fdc_id[row[id_index]] = len(names)
+            names.append(row[description_index])
+            category = row[category_index].strip() if category_index is not None else ""
+            groups.append(FOOD_GROUPS.index(FDC_FOOD_GROUPS.get(category, "other")))
+
+    nutrients = np.full((len(names), len(NUTRIENT_COLUMNS)), np.nan)
+    fallback_energy = np.full(len(names), np.nan)
+    columns = {nutrient_id: (NUTRIENT_COLUMNS.index(nutrient), factor) for nutrient_id, (nutrient, factor) in FDC_NUTRIENTS.items()}
+    fh, reader = _open_csv(food_nutrient_csv)
+    with fh:
+        headers = [_normalize_header(header) for header in next(reader)]
+        id_index = headers.index("fdc_id")
+        nutrient_index = headers.index("nutrient_id")
+        amount_index = headers.index("amount")
+        for row in reader:
+            food_row = rows_by_fdc_id.get(row[id_index])
+            if food_row is None:
+                continue
+            nutrient_id = int(row[nutrient_index])
+            if nutrient_id in columns:
+                column, factor = columns[nutrient_id]
+                nutrients[food_row, column] = _parse_number(row[amount_index]) * factor
+            elif nutrient_id in FDC_FALLBACK_ENERGY:
+                fallback_energy[food_row] = _parse_number(row[amount_index])
+
+    calories = NUTRIENT_COLUMNS.index("calories")
+    missing_energy = np.isnan(nutrients[:, calories])
+    nutrients[missing_energy, calories] = fallback_energy[missing_energy]
+    return _write(out_path, names, np.nan_to_num(nutrients), groups, aliases_csv)
+
+
+def read_aliases(csv_path: str, names: List[str]) -> List[Tuple[str, int]]:
+    """Reads (alias, food name) rows and resolves the food names to food IDs.
+
+    Rows whose food name is not among ``names`` are skipped.
+    """
+    ids = {}
+    for food_id, name in enumerate(names):
+        ids.setdefault(normalize_food_name(name), food_id)
+    aliases = []
+    fh, reader = _open_csv(csv_path)
+    with fh:
+        for row in reader:
+            if len(row) < 2:
+                continue
+            food_id = ids.get(normalize_food_name(row[1]))
+            if food_id is not None:
+                aliases.append((row[0], food_id))
+    return aliases
+
+
+def _write(out_path: str, names: List[str], rows, groups: List[int], aliases_csv: Optional[str] = None) -> int:
+    nutrients = np.asarray(rows, dtype=np.float64).reshape(len(names), len(NUTRIENT_COLUMNS))
+    # Portion weights are not part of these datasets; the store falls back to defaults
+    unknown = np.full(len(names), np.nan)
+    aliases = read_aliases(aliases_csv, names) if aliases_csv else None
+    write_food_store(out_path, names, nutrients, np.asarray(groups, dtype=np.int8), unknown, unknown, aliases)
+    return len(names)
+
+
+def _parse_column_option(option: str) -> Tuple[str, Tuple[List[str], float]]:
+    nutrient, _, header = option.partition("=")
+    nutrient = nutrient.strip()
+    if nutrient not in NUTRIENT_COLUMNS:
+        raise argparse.ArgumentTypeError(f"Unknown nutrient '{nutrient}', expected one of {NUTRIENT_COLUMNS}")
+    factor = 1.0
+    prefix, separator, suffix = header.rpartition(":")
+    if separator:
+        try:
+            factor = float(suffix)
+            header = prefix
+        except ValueError:
+            # A unit such as "ug" or "IU" instead of a numeric factor
+            if nutrient in MICRONUTRIENT_UNITS:
+                try:
+                    factor = micronutrient_factor(nutrient, suffix)
+                    header = prefix
+                except ValueError as error:
+                    raise argparse.ArgumentTypeError(str(error))
+    return nutrient, ([header], factor)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="format", required=True)
+
+    tkpi = subparsers.add_parser("tkpi", help="Tabel Komposisi Pangan Indonesia CSV export")
+    tkpi.add_argument("csv_path")
+    tkpi.add_argument("out_path")
+
+    fdc = subparsers.add_parser("fdc", help="USDA FoodData Central CSV export")
+    fdc.add_argument("food_csv")
+    fdc.add_argument("food_nutrient_csv")
+    fdc.add_argument("out_path")
+    fdc.add_argument("--data-type", action="append", dest="data_types", help="Only import this data type (repeatable)")
+
+    generic = subparsers.add_parser("csv", help="Any CSV with one food per row")
+    generic.add_argument("csv_path")
+    generic.add_argument("out_path")
+    generic.add_argument("--name-column", required=True)
+    generic.add_argument(
+        "--column",
+        action="append",
+        required=True,
+        type=_parse_column_option,
+        help="nutrient=CSV header[:factor or unit], e.g. 'vitamin_d=Vitamin D (IU):IU' (repeatable)"
+    )
+
+    for subparser in (tkpi, fdc, generic):
+        subparser.add_argument("--aliases", help="CSV of (alias, food name) rows, e.g. local food names")
+
+    args = parser.parse_args(argv)
+    if args.format == "tkpi":
+        count = import_tkpi(args.csv_path, args.out_path, args.aliases)
+    elif args.format == "fdc":
+        count = import_fdc(args.food_csv, args.food_nutrient_csv, args.out_path, args.data_types, args.aliases)
+    else:
+        count = import_wide_csv(args.csv_path, args.out_path, [args.name_column], dict(args.column), aliases_csv=args.aliases)
+    print(f"Wrote {count} foods to {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
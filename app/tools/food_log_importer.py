@@ -0,0 +1,305 @@
+"""
+Bulk importer that converts partner food-log exports into a columnar food log file.
+
+CSV and JSONL exports are parsed in chunks, so memory stays bounded however
+large the export is. Food names are resolved and quantities converted to
+grams through the shared food store; each chunk is appended to per-column
+files that are assembled into one memory-mapped file at the end. Analysis
+tools read the columns as zero-copy slices, e.g.:
+    python -m tools.diet_cohort food_log.nlog results.csv
+
+Run from the app directory:
+    python -m tools.food_log_importer export.csv food_log.nlog
+    python -m tools.food_log_importer export.jsonl food_log.nlog
+
+Each row needs a user, a date (or ISO timestamp), and either a food name,
+quantity and unit, or a free-text entry such as "1 1/2 cups cooked rice".
+"""
+
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+from .diet_analysis import MEAL_TYPES
+from .food_store import (
+    UNITS,
+    StringTable,
+    get_food_store,
+    normalize_food_name,
+    read_section_file,
+    write_section_file,
+)
+from .ingredient_parser import parse_ingredient_line
+from .measurement_conversion import conversion_graph
+
+DEFAULT_CHUNK_ROWS = 50000
+
+# Accepted field names, first match wins
+USER_FIELDS = ["user", "user_id", "userid"]
+DATE_FIELDS = ["date", "day", "time", "timestamp", "datetime"]
+FOOD_FIELDS = ["food", "name", "food_name"]
+QUANTITY_FIELDS = ["quantity", "amount", "qty"]
+UNIT_FIELDS = ["unit", "units"]
+MEAL_FIELDS = ["meal_type", "meal"]
+ENTRY_FIELDS = ["entry", "text", "description"]
+
+_LOG_MAGIC = b"NUTRLOG\x01"
+_EPOCH = date(1970, 1, 1)
+
+# Column name -> little-endian dtype of the food log file
+LOG_COLUMN_DTYPES = {
+    "user": "<u4",  # Index into the user table
+    "day": "<i4",  # Days since 1970-01-01
+    "food_id": "<i4",  # Food store ID, -1 when not found
+    "grams": "<f4",
+    "meal": "i1",  # Index into MEAL_TYPES, -1 when not given
+}
+
+
+def _field(row: Dict, names: List[str]):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _read_rows(path: str) -> Iterator[Dict]:
+    """Yields rows as dicts with lowercase keys, from CSV or JSONL (empty for a malformed JSONL line)."""
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                # A malformed or non-object line becomes an empty row, counted as skipped
+                yield {key.lower(): value for key, value in row.items()} if isinstance(row, dict) else {}
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as fh:
+            for row in csv.DictReader(fh):
+                yield {key.strip().lower(): value for key, value in row.items() if key is not None}
+
+
+def _chunks(rows: Iterable[Dict], chunk_rows: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class FoodLogImporter:
+    """Converts food log rows into columns, one chunk at a time.
+
+    Args:
+        out_path: Food log file to write
+        chunk_rows: Rows parsed and converted per chunk
+    """
+
+    def __init__(self, out_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.out_path = out_path
+        self.chunk_rows = chunk_rows
+        self.store = get_food_store()
+        self.user_codes: Dict[str, int] = {}
+        self.unit_conversions: Dict[str, Optional[Tuple[int, float]]] = {}
+        self.rows = 0
+        self.skipped_rows = 0
+        self.foods_not_found: Dict[str, int] = {}
+        self.unknown_units: Dict[str, int] = {}
+        self._column_paths = {column: f"{out_path}.{column}.part" for column in LOG_COLUMN_DTYPES}
+        self._column_files = {}
+
+    def _unit_conversion(self, unit: str) -> Optional[Tuple[int, float]]:
+        """Maps a unit to (store unit code, factor), e.g. "tbsp" -> (cup, 1/16)."""
+        if unit not in self.unit_conversions:
+            conversion = None
+            if unit in UNITS:
+                conversion = (UNITS.index(unit), 1.0)
+            else:
+                normalized = conversion_graph.normalize_unit(unit)
+                dimension = conversion_graph.dimension_of.get(normalized) if normalized else None
+                if dimension == "weight":
+                    conversion = (UNITS.index("g"), conversion_graph.factor("", normalized, "g"))
+                elif dimension == "volume":
+                    conversion = (UNITS.index("cup"), conversion_graph.factor("", normalized, "cup"))
+                elif normalized is not None:
+                    conversion = (UNITS.index("piece"), 1.0)
+            self.unit_conversions[unit] = conversion
+        return self.unit_conversions[unit]
+
+    def _parse_row(self, row: Dict) -> Optional[Tuple[str, date, str, float, str, int]]:
+        user = _field(row, USER_FIELDS)
+        day = _field(row, DATE_FIELDS)
+        if user is None or day is None:
+            return None
+        food = _field(row, FOOD_FIELDS)
+        if food is not None:
+            quantity = _field(row, QUANTITY_FIELDS)
+            unit = _field(row, UNIT_FIELDS) or "g"
+            quantity = float(str(quantity).replace(",", ".")) if quantity is not None else 1.0
+        else:
+            entry = _field(row, ENTRY_FIELDS)
+            parsed = parse_ingredient_line(entry) if entry is not None else None
+            if parsed is None:
+                return None
+            food, quantity, unit = parsed["name"], parsed["quantity"], parsed["unit"]
+        meal = str(_field(row, MEAL_FIELDS) or "").strip().lower()
+        meal_code = MEAL_TYPES.index(meal) if meal in MEAL_TYPES else -1
+        return str(user), date.fromisoformat(str(day)[:10]), normalize_food_name(str(food)), quantity, str(unit).strip().lower(), meal_code
+
+    def add_chunk(self, rows: List[Dict]) -> None:
+        """Parses, resolves and appends one chunk of rows to the column files."""
+        parsed_rows = []
+        for row in rows:
+            try:
+                parsed = self._parse_row(row)
+            except ValueError:
+                parsed = None
+            if parsed is None:
+                self.skipped_rows += 1
+                continue
+            conversion = self._unit_conversion(parsed[4])
+            if conversion is None:
+                self.unknown_units[parsed[4]] = self.unknown_units.get(parsed[4], 0) + 1
+                self.skipped_rows += 1
+                continue
+            parsed_rows.append(parsed + conversion)
+        if not parsed_rows:
+            return
+
+        users, days, names, quantities, _, meals, unit_codes, factors = zip(*parsed_rows)
+
+        # Names repeat heavily within a chunk, so each distinct name is resolved once
+        name_ids = {}
+        for name in set(names):
+            food_id, _ = self.store.resolve(name)
+            name_ids[name] = food_id if food_id is not None else -1
+        food_ids = np.array([name_ids[name] for name in names], dtype=np.int64)
+        missing = food_ids < 0
+        for name in np.asarray(names, dtype=object)[missing].tolist():
+            self.foods_not_found[name] = self.foods_not_found.get(name, 0) + 1
+
+        grams = self.store.grams_batch(
+            np.where(missing, 0, food_ids),
+            np.asarray(quantities, dtype=np.float64) * np.asarray(factors, dtype=np.float64),
+            np.asarray(unit_codes)
+        )
+        user_codes = np.array([self.user_codes.setdefault(user, len(self.user_codes)) for user in users], dtype=np.int64)
+        day_numbers = np.array([(day - _EPOCH).days for day in days], dtype=np.int64)
+
+        columns = {
+            "user": user_codes,
+            "day": day_numbers,
+            "food_id": food_ids,
+            "grams": grams,
+            "meal": np.asarray(meals, dtype=np.int64),
+        }
+        for column, values in columns.items():
+            if column not in self._column_files:
+                self._column_files[column] = open(self._column_paths[column], "wb")
+            values.astype(LOG_COLUMN_DTYPES[column]).tofile(self._column_files[column])
+        self.rows += len(parsed_rows)
+
+    def finish(self) -> Dict:
+        """Assembles the column files into the food log file and returns an import report."""
+        for fh in self._column_files.values():
+            fh.close()
+        arrays = {}
+        for column, dtype in LOG_COLUMN_DTYPES.items():
+            path = self._column_paths[column]
+            if self.rows and os.path.exists(path):
+                arrays[column] = np.memmap(path, dtype=dtype, mode="r")
+            else:
+                arrays[column] = np.zeros(0, dtype=dtype)
+        users = StringTable.from_strings(list(self.user_codes))
+        arrays["user_offsets"] = users.offsets.astype("<i8")
+        arrays["user_order"] = users.order.astype("<u4")
+        arrays["user_blob"] = users.blob
+
+        header = {"version": 1, "num_rows": self.rows, "meal_types": MEAL_TYPES, "day_epoch": _EPOCH.isoformat()}
+        try:
+            write_section_file(self.out_path, _LOG_MAGIC, header, arrays)
+        finally:
+            del arrays
+            for path in self._column_paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+
+        return {
+            "rows": self.rows,
+            "skipped_rows": self.skipped_rows,
+            "users": len(self.user_codes),
+            "foods_not_found": self.foods_not_found,
+            "unknown_units": self.unknown_units,
+        }
+
+
+def import_food_log(in_path: str, out_path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """Imports a CSV or JSONL food log export into a columnar food log file."""
+    importer = FoodLogImporter(out_path, chunk_rows)
+    for chunk in _chunks(_read_rows(in_path), chunk_rows):
+        importer.add_chunk(chunk)
+    return importer.finish()
+
+
+class FoodLogTable:
+    """Read-only view of a food log file; every column is a memory-mapped array.
+
+    Columns are in import order. ``user`` indexes ``users`` and ``day``
+    counts days since 1970-01-01.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], users: StringTable):
+        self.columns = columns
+        self.users = users
+
+    @classmethod
+    def open(cls, path: str) -> "FoodLogTable":
+        header, sections = read_section_file(path, _LOG_MAGIC, "food log")
+        if header["meal_types"] != MEAL_TYPES:
+            raise ValueError(f"Food log file '{path}' uses meal types {header['meal_types']}, expected {MEAL_TYPES}")
+        users = StringTable(sections["user_offsets"], sections["user_blob"], sections["user_order"])
+        return cls({column: sections[column] for column in LOG_COLUMN_DTYPES}, users)
+
+    def __len__(self) -> int:
+        return len(self.columns["food_id"])
+
+    def __getattr__(self, column: str) -> np.ndarray:
+        if column in LOG_COLUMN_DTYPES:
+            return self.columns[column]
+        raise AttributeError(column)
+
+    def slice(self, start: int, stop: int) -> Dict[str, np.ndarray]:
+        """Returns rows ``start:stop`` of every column, as views into the file."""
+        return {column: values[start:stop] for column, values in self.columns.items()}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("in_path", help="CSV or JSONL (.jsonl) food log export")
+    parser.add_argument("out_path", help="Food log file to write")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    report = import_food_log(args.in_path, args.out_path, args.chunk_rows)
+    print(f"Imported {report['rows']} rows for {report['users']} users to {args.out_path}")
+    if report["skipped_rows"]:
+        print(f"Skipped {report['skipped_rows']} rows without a user, date, food or known unit")
+    if report["foods_not_found"]:
+        missing = sorted(report["foods_not_found"].items(), key=lambda item: item[1], reverse=True)
+        print("Foods not found: " + ", ".join(f"{name} ({count})" for name, count in missing[:20]))
+
+
+if __name__ == "__main__":
+    main()
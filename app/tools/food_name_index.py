@@ -0,0 +1,120 @@
+from typing import List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Fuzzy food-name resolution over the food store names and their aliases.
+# Strings are indexed by byte trigrams of their UTF-8 encoding in a CSR
+# inverted index; a query gathers candidates from its rarest trigrams, ranks
+# them by approximate Dice overlap and rescores the best few exactly.
+# FoodStore.resolve keeps an LRU of recent resolutions in front of it.
+
+DEFAULT_MAX_POSTINGS = 10000  # Posting entries scanned per query
+
+
+def trigrams(name: str) -> Set[int]:
+    """Returns the distinct trigrams of a normalized name, padded with spaces.
+
+    Each trigram is packed into one integer (three bytes of the UTF-8 encoding).
+    """
+    padded = b" " + name.encode("utf-8") + b" "
+    return {padded[i] << 16 | padded[i + 1] << 8 | padded[i + 2] for i in range(len(padded) - 2)}
+
+
+def dice(a: Set[int], b: Set[int]) -> float:
+    """Dice coefficient between two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2.0 * len(a & b) / (len(a) + len(b))
+
+
+def _first_of_runs(sorted_values: np.ndarray) -> np.ndarray:
+    """Marks the first element of every run of equal values in a sorted array."""
+    first = np.ones(len(sorted_values), dtype=bool)
+    first[1:] = sorted_values[1:] != sorted_values[:-1]
+    return first
+
+
+class FoodNameIndex:
+    """Trigram index that maps free-text food names to food IDs.
+
+    Args:
+        strings: Indexed strings (food names and aliases), already normalized
+        targets: Food ID that each string resolves to
+        max_postings: Upper bound on posting entries gathered per query
+    """
+
+    def __init__(self, strings: Sequence[str], targets: Sequence[int], max_postings: int = DEFAULT_MAX_POSTINGS):
+        self.strings = strings
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.max_postings = max_postings
+
+        # Trigrams of all strings at once: pad every string with spaces, pack
+        # each window of three bytes into an integer and drop the windows that
+        # straddle two strings
+        encoded = [b" " + string.encode("utf-8") + b" " for string in strings]
+        lengths = np.array([len(data) for data in encoded], dtype=np.int64)
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+        owner = np.repeat(np.arange(len(encoded), dtype=np.int64), lengths)
+        codes = buffer[:-2] << 16 | buffer[1:-1] << 8 | buffer[2:]
+        inside = owner[:-2] == owner[2:]
+
+        # One entry per distinct (string, trigram) pair, sorted by string
+        keys = np.sort(owner[:-2][inside] << 24 | codes[inside])
+        keys = keys[_first_of_runs(keys)]
+        owners = keys >> 24
+        codes = keys & 0xFFFFFF
+        self._sizes = np.bincount(owners, minlength=len(encoded))
+
+        # Regroup by trigram; the stable sort keeps each posting list in string order
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        starts = np.flatnonzero(_first_of_runs(codes))
+        self._vocabulary = codes[starts]
+        self._indptr = np.append(starts, len(codes))
+        self._postings = owners[order].astype(np.int32)
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, str, float]]:
+        """Returns up to top_k (food_id, matched_string, confidence) candidates, best first.
+
+        The query must be normalized the same way as the indexed strings.
+        """
+        grams = trigrams(query)
+        codes = np.fromiter(grams, dtype=np.int64, count=len(grams))
+        positions = np.searchsorted(self._vocabulary, codes)
+        known = positions < len(self._vocabulary)
+        known[known] = self._vocabulary[positions[known]] == codes[known]
+        positions = positions[known]
+        if len(positions) == 0:
+            return []
+
+        # Rarest trigrams first, stopping once the posting budget is spent
+        starts = self._indptr[positions]
+        frequencies = self._indptr[positions + 1] - starts
+        order = np.argsort(frequencies, kind="stable")
+        within_budget = np.cumsum(frequencies[order]) <= self.max_postings
+        within_budget[0] = True
+        candidates, shared = np.unique(
+            np.concatenate([self._postings[starts[i]:starts[i] + frequencies[i]] for i in order[within_budget]]),
+            return_counts=True
+        )
+
+        approximate = shared / (len(grams) + self._sizes[candidates])
+        shortlist_size = max(4 * top_k, 8)
+        if len(candidates) > shortlist_size:
+            candidates = candidates[np.argpartition(-approximate, shortlist_size - 1)[:shortlist_size]]
+
+        # Exact rescoring; a food reachable through several aliases keeps its best string
+        best = {}
+        for string_id in candidates.tolist():
+            string = self.strings[string_id]
+            score = dice(grams, trigrams(string))
+            food_id = int(self.targets[string_id])
+            if food_id not in best or score > best[food_id][1]:
+                best[food_id] = (string, score)
+        ranked = sorted(best.items(), key=lambda item: item[1][1], reverse=True)
+        return [(food_id, string, round(score, 3)) for food_id, (string, score) in ranked[:top_k]]
+
+    def best_match(self, query: str) -> Optional[Tuple[int, str, float]]:
+        """Returns the best (food_id, matched_string, confidence), or None."""
+        matches = self.search(query, top_k=1)
+        return matches[0] if matches else None
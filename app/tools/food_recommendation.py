@@ -1,11 +1,294 @@
 from google.adk.tools import FunctionTool
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .food_store import NUTRIENT_COLUMNS, get_food_store
+from .tool_cache import memoize
+
+# Recommendations come from a catalog of foods with dietary tags, allergens,
+# key nutrients and benefits. Every tag, allergen, nutrient and benefit has a
+# precomputed bitset over the catalog (one bit per food, packed into 64-bit
+# words), so a query is a handful of AND/OR/AND-NOT operations instead of a
+# scan over every food. Only the foods that pass the filters are scored,
+# and a page of the best-scoring ones is returned.
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+# Score weights: each matched health goal counts twice as much as a matched preference
+GOAL_WEIGHT = 2.0
+PREFERENCE_WEIGHT = 1.0
+
+GOAL_CACHE_SIZE = 1024  # Distinct health goals whose benefit bitsets are kept
+
+# Food catalog with categories and properties
+FOOD_CATALOG = {
+    "chicken breast": {
+        "category": "protein",
+        "dietary_tags": ["high_protein", "low_carb"],
+        "allergies": [],
+        "nutrients": ["protein", "vitamin B6", "niacin"],
+        "benefits": ["muscle building", "weight management"],
+        "serving_suggestion": "85g (3oz) grilled or baked"
+    },
+    "salmon": {
+        "category": "protein",
+        "dietary_tags": ["high_protein", "keto", "paleo"],
+        "allergies": ["fish", "seafood"],
+        "nutrients": ["protein", "omega-3 fatty acids", "vitamin D"],
+        "benefits": ["heart health", "brain health", "anti-inflammatory"],
+        "serving_suggestion": "85g (3oz) baked or grilled with herbs"
+    },
+    "tofu": {
+        "category": "protein",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based"],
+        "allergies": ["soy"],
+        "nutrients": ["protein", "calcium", "iron"],
+        "benefits": ["heart health", "bone health"],
+        "serving_suggestion": "85g (3oz) firm tofu, stir-fried or baked"
+    },
+    "lentils": {
+        "category": "protein",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "high_fiber"],
+        "allergies": [],
+        "nutrients": ["protein", "fiber", "iron", "folate"],
+        "benefits": ["heart health", "digestive health", "blood sugar control"],
+        "serving_suggestion": "1/2 cup cooked in soups or as a side dish"
+    },
+    "spinach": {
+        "category": "vegetable",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
+        "allergies": [],
+        "nutrients": ["iron", "calcium", "vitamin K", "vitamin A"],
+        "benefits": ["bone health", "immune support", "eye health"],
+        "serving_suggestion": "1 cup raw in salads or smoothies, or 1/2 cup cooked"
+    },
+    "broccoli": {
+        "category": "vegetable",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
+        "allergies": [],
+        "nutrients": ["vitamin C", "fiber", "calcium", "folate"],
+        "benefits": ["immune support", "digestive health", "cancer prevention"],
+        "serving_suggestion": "1 cup chopped, steamed or roasted"
+    },
+    "avocado": {
+        "category": "fruit",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
+        "allergies": [],
+        "nutrients": ["healthy fats", "fiber", "potassium", "vitamin E"],
+        "benefits": ["heart health", "weight management", "skin health"],
+        "serving_suggestion": "1/4 to 1/2 of a medium avocado"
+    },
+    "blueberries": {
+        "category": "fruit",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "paleo"],
+        "allergies": [],
+        "nutrients": ["antioxidants", "vitamin C", "fiber"],
+        "benefits": ["brain health", "heart health", "anti-aging"],
+        "serving_suggestion": "1/2 cup fresh or frozen"
+    },
+    "almonds": {
+        "category": "nuts",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
+        "allergies": ["nuts", "tree nuts"],
+        "nutrients": ["healthy fats", "protein", "vitamin E", "magnesium"],
+        "benefits": ["heart health", "weight management", "blood sugar control"],
+        "serving_suggestion": "1/4 cup (about 23 almonds)"
+    },
+    "quinoa": {
+        "category": "grain",
+        "dietary_tags": ["vegetarian", "vegan", "plant_based", "gluten_free"],
+        "allergies": [],
+        "nutrients": ["protein", "fiber", "magnesium", "iron"],
+        "benefits": ["muscle building", "digestive health", "energy production"],
+        "serving_suggestion": "1/2 cup cooked as a side dish or in salads"
+    },
+    "greek yogurt": {
+        "category": "dairy",
+        "dietary_tags": ["high_protein", "probiotic"],
+        "allergies": ["dairy", "milk"],
+        "nutrients": ["protein", "calcium", "probiotics", "vitamin B12"],
+        "benefits": ["gut health", "bone health", "muscle recovery"],
+        "serving_suggestion": "1 cup plain, with fruit or as a base for smoothies"
+    }
+}
+
+def _preference_tag(preference: str) -> str:
+    """Maps a dietary preference to its tag, e.g. "gluten free" -> "gluten_free"."""
+    return preference.replace(" ", "_").replace("-", "_")
+
+
+class FoodCatalog:
+    """Bitset indexes over a food catalog for fast filtering and ranking.
+
+    Args:
+        foods: Food name -> {"category", "dietary_tags", "allergies",
+            "nutrients", "benefits", "serving_suggestion"}
+    """
+
+    def __init__(self, foods: Dict[str, Dict]):
+        self.names = list(foods)
+        self.foods = [foods[name] for name in self.names]
+        self.num_words = -(-len(self.names) // 64)
+        self.all = self._pack(np.ones(len(self.names), dtype=bool))
+        self.tags = self._index(food["dietary_tags"] for food in self.foods)
+        self.allergens = self._index(food["allergies"] for food in self.foods)
+        self.nutrients = self._index([nutrient.lower() for nutrient in food["nutrients"]] for food in self.foods)
+        self.benefits = self._index([benefit.lower() for benefit in food["benefits"]] for food in self.foods)
+        self._goal_bits: Dict[str, np.ndarray] = {}
+
+        # Nutrient relevance: 1 for a food's first listed nutrient, 1/2 for the second, ...
+        self.nutrient_rank: Dict[str, np.ndarray] = {}
+        for i, food in enumerate(self.foods):
+            for position, nutrient in enumerate(food["nutrients"]):
+                rank = self.nutrient_rank.setdefault(nutrient.lower(), np.zeros(len(self.names)))
+                rank[i] = max(rank[i], 1.0 / (1 + position))
+
+        # Catalog foods in the food store, for nutrient densities
+        store = get_food_store()
+        store_ids = [store.lookup(name) for name in self.names]
+        self.store_ids = np.array([-1 if food_id is None else food_id for food_id in store_ids], dtype=np.int64)
+        self._density: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _pack(self, mask: np.ndarray) -> np.ndarray:
+        """Packs a boolean mask over the catalog into 64-bit words."""
+        padded = np.zeros(self.num_words * 64, dtype=bool)
+        padded[:len(mask)] = mask
+        return np.packbits(padded, bitorder="little").view(np.uint64)
+
+    def _index(self, values_per_food: Iterable[List[str]]) -> Dict[str, np.ndarray]:
+        """Builds one bitset per distinct value."""
+        members: Dict[str, List[int]] = {}
+        for i, values in enumerate(values_per_food):
+            for value in values:
+                members.setdefault(value, []).append(i)
+        index = {}
+        for value, food_indices in members.items():
+            mask = np.zeros(len(self.names), dtype=bool)
+            mask[food_indices] = True
+            index[value] = self._pack(mask)
+        return index
+
+    def _bits(self, index: Dict[str, np.ndarray], value: str) -> np.ndarray:
+        bits = index.get(value)
+        return bits if bits is not None else np.zeros_like(self.all)
+
+    def _unpacked(self, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits.view(np.uint8), count=len(self.names), bitorder="little")
+
+    def members(self, bits: np.ndarray) -> np.ndarray:
+        """Catalog indices of the foods in a bitset."""
+        return np.flatnonzero(self._unpacked(bits))
+
+    def goal_bits(self, goal: str) -> np.ndarray:
+        """Foods with a benefit that mentions the goal, e.g. "heart" -> "heart health"."""
+        bits = self._goal_bits.get(goal)
+        if bits is None:
+            bits = np.zeros_like(self.all)
+            for benefit, benefit_bits in self.benefits.items():
+                if goal in benefit:
+                    bits |= benefit_bits
+            if len(self._goal_bits) >= GOAL_CACHE_SIZE:
+                self._goal_bits.clear()
+            self._goal_bits[goal] = bits
+        return bits
+
+    def filter(
+        self,
+        dietary_preferences: List[str],
+        health_goals: List[str],
+        allergies: List[str],
+        nutrient_focus: Optional[str]
+    ) -> np.ndarray:
+        """Returns the bitset of foods that pass every filter.
+
+        A food is excluded if it contains any allergen; it must match at
+        least one preference and at least one goal (when given) and list
+        the focus nutrient (when given).
+        """
+        bits = self.all.copy()
+        for allergy in allergies:
+            bits &= ~self._bits(self.allergens, allergy)
+        if dietary_preferences:
+            preference_bits = np.zeros_like(self.all)
+            for preference in dietary_preferences:
+                preference_bits |= self._bits(self.tags, _preference_tag(preference))
+            bits &= preference_bits
+        if nutrient_focus:
+            bits &= self._bits(self.nutrients, nutrient_focus)
+        if health_goals:
+            goal_bits = np.zeros_like(self.all)
+            for goal in health_goals:
+                goal_bits |= self.goal_bits(goal)
+            bits &= goal_bits
+        return bits
+
+    def nutrient_density(self, nutrient: str) -> Optional[np.ndarray]:
+        """Per-100g amount of a nutrient for every catalog food, scaled to 0-1.
+
+        Returns None if the nutrient is not a food store column. Foods that
+        are not in the store get 0.
+        """
+        column = nutrient.replace(" ", "_")
+        if column not in NUTRIENT_COLUMNS:
+            return None
+        density = self._density.get(column)
+        if density is None:
+            store = get_food_store()
+            in_store = self.store_ids >= 0
+            density = np.zeros(len(self.names))
+            density[in_store] = store.nutrients[self.store_ids[in_store], NUTRIENT_COLUMNS.index(column)]
+            if density.max() > 0:
+                density /= density.max()
+            self._density[column] = density
+        return density
+
+    def score(
+        self,
+        candidates: np.ndarray,
+        dietary_preferences: List[str],
+        health_goals: List[str],
+        nutrient_focus: Optional[str]
+    ) -> np.ndarray:
+        """Relevance of the candidate foods: matched goals, matched preferences and nutrient focus."""
+        scores = np.zeros(len(candidates))
+        for goal in health_goals:
+            scores += GOAL_WEIGHT * self._unpacked(self.goal_bits(goal))[candidates]
+        for preference in dietary_preferences:
+            scores += PREFERENCE_WEIGHT * self._unpacked(self._bits(self.tags, _preference_tag(preference)))[candidates]
+        if nutrient_focus:
+            rank = self.nutrient_rank.get(nutrient_focus)
+            if rank is not None:
+                scores += rank[candidates]
+            density = self.nutrient_density(nutrient_focus)
+            if density is not None:
+                scores += density[candidates]
+        return scores
+
+
+
+_catalog: Optional[FoodCatalog] = None
+
+
+def get_food_catalog() -> FoodCatalog:
+    """Returns the shared food catalog, indexing it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = FoodCatalog(FOOD_CATALOG)
+    return _catalog
+
 
 def recommend_foods(
     dietary_preferences: List[str] = None,
     health_goals: List[str] = None,
     allergies: List[str] = None,
-    nutrient_focus: str = None
+    nutrient_focus: str = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    page: int = 1
 ) -> Dict:
     """Recommends foods based on user preferences, health goals, and dietary restrictions.
     
@@ -17,6 +300,8 @@ def recommend_foods(
         health_goals: List of health goals (e.g., ["weight loss", "muscle gain", "heart health", "diabetes management"])
         allergies: List of allergies or foods to avoid (e.g., ["nuts", "dairy", "gluten", "shellfish"])
         nutrient_focus: Specific nutrient the user wants to focus on (e.g., "protein", "fiber", "iron", "calcium")
+        limit: Number of recommendations per page (default 10, at most 50)
+        page: Page of the ranked recommendations to return, starting at 1
     
     Returns:
         A dictionary with the following structure:
@@ -28,17 +313,18 @@ def recommend_foods(
                     "category": food category (e.g., "protein", "vegetable", "fruit"),
                     "benefits": list of health benefits,
                     "nutrients": list of key nutrients,
-                    "serving_suggestion": recommended serving size and preparation
+                    "serving_suggestion": recommended serving size and preparation,
+                    "score": relevance to the goals, preferences and nutrient focus
                 },
                 ...
             ],
+            "total_matches": number of foods that match the criteria,
+            "page": the page returned,
+            "page_size": recommendations per page,
+            "has_more": whether later pages have more recommendations,
             "error_message": description of error (only if status is "error")
         }
     """
-    # In a real implementation, this would use a recommendation algorithm
-    # based on a comprehensive food database
-    # For demonstration, we'll use a simplified rule-based approach
-    
     # Initialize empty lists if None is provided
     if dietary_preferences is None:
         dietary_preferences = []
@@ -54,168 +340,52 @@ def recommend_foods(
     if nutrient_focus:
         nutrient_focus = nutrient_focus.lower()
     
-    # Food database with categories and properties
-    food_database = {
-        "chicken breast": {
-            "category": "protein",
-            "dietary_tags": ["high_protein", "low_carb"],
-            "allergies": [],
-            "nutrients": ["protein", "vitamin B6", "niacin"],
-            "benefits": ["muscle building", "weight management"],
-            "serving_suggestion": "85g (3oz) grilled or baked"
-        },
-        "salmon": {
-            "category": "protein",
-            "dietary_tags": ["high_protein", "keto", "paleo"],
-            "allergies": ["fish", "seafood"],
-            "nutrients": ["protein", "omega-3 fatty acids", "vitamin D"],
-            "benefits": ["heart health", "brain health", "anti-inflammatory"],
-            "serving_suggestion": "85g (3oz) baked or grilled with herbs"
-        },
-        "tofu": {
-            "category": "protein",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based"],
-            "allergies": ["soy"],
-            "nutrients": ["protein", "calcium", "iron"],
-            "benefits": ["heart health", "bone health"],
-            "serving_suggestion": "85g (3oz) firm tofu, stir-fried or baked"
-        },
-        "lentils": {
-            "category": "protein",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "high_fiber"],
-            "allergies": [],
-            "nutrients": ["protein", "fiber", "iron", "folate"],
-            "benefits": ["heart health", "digestive health", "blood sugar control"],
-            "serving_suggestion": "1/2 cup cooked in soups or as a side dish"
-        },
-        "spinach": {
-            "category": "vegetable",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
-            "allergies": [],
-            "nutrients": ["iron", "calcium", "vitamin K", "vitamin A"],
-            "benefits": ["bone health", "immune support", "eye health"],
-            "serving_suggestion": "1 cup raw in salads or smoothies, or 1/2 cup cooked"
-        },
-        "broccoli": {
-            "category": "vegetable",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
-            "allergies": [],
-            "nutrients": ["vitamin C", "fiber", "calcium", "folate"],
-            "benefits": ["immune support", "digestive health", "cancer prevention"],
-            "serving_suggestion": "1 cup chopped, steamed or roasted"
-        },
-        "avocado": {
-            "category": "fruit",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
-            "allergies": [],
-            "nutrients": ["healthy fats", "fiber", "potassium", "vitamin E"],
-            "benefits": ["heart health", "weight management", "skin health"],
-            "serving_suggestion": "1/4 to 1/2 of a medium avocado"
-        },
-        "blueberries": {
-            "category": "fruit",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "paleo"],
-            "allergies": [],
-            "nutrients": ["antioxidants", "vitamin C", "fiber"],
-            "benefits": ["brain health", "heart health", "anti-aging"],
-            "serving_suggestion": "1/2 cup fresh or frozen"
-        },
-        "almonds": {
-            "category": "nuts",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "keto", "paleo"],
-            "allergies": ["nuts", "tree nuts"],
-            "nutrients": ["healthy fats", "protein", "vitamin E", "magnesium"],
-            "benefits": ["heart health", "weight management", "blood sugar control"],
-            "serving_suggestion": "1/4 cup (about 23 almonds)"
-        },
-        "quinoa": {
-            "category": "grain",
-            "dietary_tags": ["vegetarian", "vegan", "plant_based", "gluten_free"],
-            "allergies": [],
-            "nutrients": ["protein", "fiber", "magnesium", "iron"],
-            "benefits": ["muscle building", "digestive health", "energy production"],
-            "serving_suggestion": "1/2 cup cooked as a side dish or in salads"
-        },
-        "greek yogurt": {
-            "category": "dairy",
-            "dietary_tags": ["high_protein", "probiotic"],
-            "allergies": ["dairy", "milk"],
-            "nutrients": ["protein", "calcium", "probiotics", "vitamin B12"],
-            "benefits": ["gut health", "bone health", "muscle recovery"],
-            "serving_suggestion": "1 cup plain, with fruit or as a base for smoothies"
-        }
-    }
+    page_size = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    page = max(int(page), 1)
     
     # Filter foods based on dietary preferences, allergies, and health goals
-    recommended_foods = []
+    catalog = get_food_catalog()
+    candidates = catalog.members(catalog.filter(dietary_preferences, health_goals, allergies, nutrient_focus))
+    if len(candidates) == 0:
+        return {
+            "status": "error",
+            "error_message": "No foods match the specified criteria. Try broadening your preferences or reducing restrictions."
+        }
     
-    for food_name, food_info in food_database.items():
-        # Skip if the food contains an allergen
-        if any(allergy in food_info["allergies"] for allergy in allergies):
-            continue
-        
-        # Check dietary preferences
-        if dietary_preferences:
-            matches_preference = False
-            for pref in dietary_preferences:
-                # Special handling for common dietary patterns
-                if pref == "vegetarian" and "vegetarian" in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-                elif pref == "vegan" and "vegan" in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-                elif pref == "keto" and "keto" in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-                elif pref == "paleo" and "paleo" in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-                elif pref == "gluten free" and "gluten_free" in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-                elif pref in food_info["dietary_tags"]:
-                    matches_preference = True
-                    break
-            
-            if not matches_preference:
-                continue
-        
-        # Check for nutrient focus
-        if nutrient_focus and nutrient_focus not in [n.lower() for n in food_info["nutrients"]]:
-            continue
-        
-        # Check health goals
-        if health_goals:
-            matches_goal = False
-            for goal in health_goals:
-                if any(goal in benefit.lower() for benefit in food_info["benefits"]):
-                    matches_goal = True
-                    break
-            
-            if not matches_goal:
-                continue
-        
-        # Add to recommendations if it passed all filters
+    # Rank by score; ties keep catalog order
+    scores = catalog.score(candidates, dietary_preferences, health_goals, nutrient_focus)
+    start = (page - 1) * page_size
+    stop = start + page_size
+    if stop < len(candidates):
+        # Only the foods up to the end of the page need to be sorted. All foods
+        # tied with the page's last score are kept, so ties break by catalog
+        # order the same way on every page.
+        boundary = np.partition(-scores, stop - 1)[stop - 1]
+        top = np.flatnonzero(-scores <= boundary)
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+    else:
+        top = np.lexsort((candidates, -scores))
+    
+    recommended_foods = []
+    for i in top[start:stop].tolist():
+        food_info = catalog.foods[candidates[i]]
         recommended_foods.append({
-            "food": food_name,
+            "food": catalog.names[candidates[i]],
             "category": food_info["category"],
             "benefits": food_info["benefits"],
             "nutrients": food_info["nutrients"],
-            "serving_suggestion": food_info["serving_suggestion"]
+            "serving_suggestion": food_info["serving_suggestion"],
+            "score": round(float(scores[i]), 2)
         })
     
-    # Return the results
-    if recommended_foods:
-        return {
-            "status": "success",
-            "recommendations": recommended_foods
-        }
-    else:
-        return {
-            "status": "error",
-            "error_message": "No foods match the specified criteria. Try broadening your preferences or reducing restrictions."
-        }
+    return {
+        "status": "success",
+        "recommendations": recommended_foods,
+        "total_matches": len(candidates),
+        "page": page,
+        "page_size": page_size,
+        "has_more": stop < len(candidates)
+    }
 
 # Create the Function Tool
-food_recommendation_tool = FunctionTool(func=recommend_foods) 
\ No newline at end of file
+food_recommendation_tool = FunctionTool(func=memoize(recommend_foods, ttl_seconds=3600))
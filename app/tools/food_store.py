@@ -0,0 +1,581 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+
+import numpy as np
+
+from config import FOOD_STORE_PATH
+from .food_name_index import FoodNameIndex
+
+# Shared food composition store used by the nutrition tools.
+# Every food gets an integer ID and its nutrients live in NumPy columns
+# (values per 100 g), so all tools read the same numbers instead of keeping
+# their own copies of a mock database. Full datasets are converted offline
+# by food_importer.py into a memory-mapped store file.
+
+MACRONUTRIENTS = ["protein", "carbohydrates", "fat", "fiber"]
+
+# Micronutrients are stored per 100 g in the canonical unit of each nutrient
+MICRONUTRIENT_UNITS = {
+    "vitamin_a": "µg",  # retinol activity equivalents
+    "vitamin_b6": "mg",
+    "vitamin_b12": "µg",
+    "vitamin_c": "mg",
+    "vitamin_d": "µg",
+    "vitamin_e": "mg",
+    "vitamin_k": "µg",
+    "thiamin": "mg",
+    "riboflavin": "mg",
+    "niacin": "mg",
+    "folate": "µg",  # dietary folate equivalents
+    "calcium": "mg",
+    "iron": "mg",
+    "magnesium": "mg",
+    "phosphorus": "mg",
+    "potassium": "mg",
+    "selenium": "µg",
+}
+MICRONUTRIENTS = list(MICRONUTRIENT_UNITS)
+
+NUTRIENT_COLUMNS = ["calories"] + MACRONUTRIENTS + MICRONUTRIENTS
+NUTRIENT_UNITS = ["kcal"] + ["g"] * len(MACRONUTRIENTS) + [MICRONUTRIENT_UNITS[nutrient] for nutrient in MICRONUTRIENTS]
+MACRONUTRIENT_SLICE = slice(1, 1 + len(MACRONUTRIENTS))
+MICRONUTRIENT_SLICE = slice(1 + len(MACRONUTRIENTS), len(NUTRIENT_COLUMNS))
+
+# Mass units accepted in micronutrient amounts, in milligrams
+_MASS_UNIT_MG = {"g": 1000.0, "mg": 1.0, "µg": 0.001, "μg": 0.001, "ug": 0.001, "mcg": 0.001}
+
+# International units are defined per nutrient, as milligrams per IU
+_IU_MG = {
+    "vitamin_a": 0.0003,  # retinol
+    "vitamin_d": 0.000025,
+    "vitamin_e": 0.67,  # natural alpha-tocopherol
+}
+
+FOOD_GROUPS = ["other", "fruit", "vegetable", "protein", "grain", "dairy", "nuts"]
+
+# Unit conversion factors (simplified)
+OUNCE_GRAMS = 28  # 1 oz ≈ 28g
+DEFAULT_CUP_GRAMS = 150  # Default assumption when a food has no cup weight
+DEFAULT_PIECE_GRAMS = 100  # Default assumption when a food has no piece weight
+
+# Fuzzy matches below this trigram similarity are treated as not found
+MIN_MATCH_CONFIDENCE = 0.6
+RESOLVE_CACHE_SIZE = 4096  # Recent name resolutions kept per store
+
+# Units with a gram weight in the store; unknown units are treated as grams
+UNITS = ["g", "oz", "cup", "piece"]
+_UNIT_CODES = {unit: code for code, unit in enumerate(UNITS)}
+
+# Mock composition data, values per 100 g; micronutrient amounts carry their unit
+_FOOD_DATA = {
+    "apple": {
+        "calories": 52, "protein": 0.3, "carbohydrates": 13.8, "fat": 0.2, "fiber": 2.4,
+        "micronutrients": {"vitamin_c": "4.6 mg", "potassium": "107 mg"},
+        "food_group": "fruit",
+        "aliases": ["apel"],
+        "piece_grams": 180,  # 1 medium apple ≈ 180g
+    },
+    "banana": {
+        "calories": 89, "protein": 1.1, "carbohydrates": 22.8, "fat": 0.3, "fiber": 2.6,
+        "micronutrients": {"vitamin_c": "8.7 mg", "vitamin_b6": "0.4 mg", "potassium": "358 mg", "magnesium": "27 mg"},
+        "food_group": "fruit",
+        "aliases": ["pisang"],
+        "piece_grams": 120,  # 1 medium banana ≈ 120g
+    },
+    "blueberries": {
+        "calories": 57, "protein": 0.7, "carbohydrates": 14.5, "fat": 0.3, "fiber": 2.4,
+        "micronutrients": {"vitamin_c": "9.7 mg", "vitamin_k": "19.3 µg", "potassium": "77 mg"},
+        "food_group": "fruit",
+        "aliases": ["blueberry"],
+        "cup_grams": 148,
+    },
+    "avocado": {
+        "calories": 160, "protein": 2.0, "carbohydrates": 8.5, "fat": 14.7, "fiber": 6.7,
+        "micronutrients": {"vitamin_e": "2.1 mg", "vitamin_k": "21 µg", "folate": "81 µg", "potassium": "485 mg"},
+        "food_group": "fruit",
+        "aliases": ["alpukat"],
+        "piece_grams": 150,
+    },
+    "chicken breast": {
+        "calories": 165, "protein": 31, "carbohydrates": 0, "fat": 3.6, "fiber": 0,
+        "micronutrients": {"vitamin_b6": "0.6 mg", "niacin": "13.7 mg", "phosphorus": "228 mg", "selenium": "27.6 µg"},
+        "food_group": "protein",
+        "aliases": ["dada ayam", "chicken"],
+    },
+    "salmon": {
+        "calories": 206, "protein": 22, "carbohydrates": 0, "fat": 13, "fiber": 0,
+        "micronutrients": {"vitamin_d": "13.1 µg", "vitamin_b12": "2.8 µg", "phosphorus": "252 mg", "selenium": "41 µg"},
+        "food_group": "protein",
+        "aliases": ["ikan salmon"],
+    },
+    "tofu": {
+        "calories": 76, "protein": 8.1, "carbohydrates": 1.9, "fat": 4.8, "fiber": 0.3,
+        "micronutrients": {"calcium": "350 mg", "iron": "5.4 mg", "magnesium": "30 mg"},
+        "food_group": "protein",
+        "aliases": ["tahu", "bean curd"],
+    },
+    "lentils": {
+        "calories": 116, "protein": 9.0, "carbohydrates": 20.1, "fat": 0.4, "fiber": 7.9,
+        "micronutrients": {"folate": "181 µg", "iron": "3.3 mg", "potassium": "369 mg"},
+        "food_group": "protein",
+        "aliases": ["lentil", "kacang lentil"],
+        "cup_grams": 198,
+    },
+    "rice": {
+        "calories": 130, "protein": 2.7, "carbohydrates": 28, "fat": 0.3, "fiber": 0.4,
+        "micronutrients": {"thiamin": "0.02 mg", "niacin": "0.4 mg", "iron": "0.2 mg"},
+        "food_group": "grain",
+        "aliases": ["white rice", "cooked rice", "nasi", "nasi putih"],
+        "cup_grams": 180,  # 1 cup of rice ≈ 180g
+    },
+    "brown rice": {
+        "calories": 112, "protein": 2.6, "carbohydrates": 23.5, "fat": 0.9, "fiber": 1.8,
+        "micronutrients": {"niacin": "1.5 mg", "vitamin_b6": "0.15 mg", "magnesium": "39 mg", "phosphorus": "77 mg"},
+        "food_group": "grain",
+        "aliases": ["nasi merah"],
+    },
+    "quinoa": {
+        "calories": 120, "protein": 4.4, "carbohydrates": 21.3, "fat": 1.9, "fiber": 2.8,
+        "micronutrients": {"folate": "42 µg", "iron": "1.5 mg", "magnesium": "64 mg"},
+        "food_group": "grain",
+        "cup_grams": 185,
+    },
+    "white bread": {
+        "calories": 74, "protein": 2.6, "carbohydrates": 13.8, "fat": 1, "fiber": 0.8,
+        "micronutrients": {"thiamin": "0.1 mg", "folate": "30 µg", "calcium": "38 mg", "iron": "0.9 mg"},
+        "food_group": "grain",
+        "aliases": ["bread", "roti", "roti tawar"],
+    },
+    "broccoli": {
+        "calories": 34, "protein": 2.8, "carbohydrates": 6.6, "fat": 0.4, "fiber": 2.6,
+        "micronutrients": {"vitamin_c": "89.2 mg", "vitamin_k": "101.6 µg", "folate": "63 µg", "calcium": "47 mg", "potassium": "316 mg"},
+        "food_group": "vegetable",
+        "aliases": ["brokoli"],
+        "cup_grams": 90,  # 1 cup of chopped broccoli ≈ 90g
+    },
+    "spinach": {
+        "calories": 23, "protein": 2.9, "carbohydrates": 3.6, "fat": 0.4, "fiber": 2.2,
+        "micronutrients": {"vitamin_a": "469 µg", "vitamin_k": "483 µg", "folate": "194 µg", "calcium": "99 mg", "iron": "2.7 mg"},
+        "food_group": "vegetable",
+        "aliases": ["bayam"],
+        "cup_grams": 30,
+    },
+    "greek yogurt": {
+        "calories": 59, "protein": 10, "carbohydrates": 3.6, "fat": 0.4, "fiber": 0,
+        "micronutrients": {"vitamin_b12": "0.75 µg", "riboflavin": "0.28 mg", "calcium": "110 mg", "phosphorus": "135 mg"},
+        "food_group": "dairy",
+        "aliases": ["yogurt", "yoghurt"],
+        "cup_grams": 245,
+    },
+    "almonds": {
+        "calories": 164, "protein": 6, "carbohydrates": 6, "fat": 14, "fiber": 3.5,
+        "micronutrients": {"vitamin_e": "7.3 mg", "riboflavin": "0.3 mg", "magnesium": "76.5 mg", "phosphorus": "136 mg"},
+        "food_group": "nuts",
+        "aliases": ["almond", "kacang almond"],
+    },
+}
+
+
+def unit_code(unit: str) -> int:
+    """Returns the index in ``UNITS`` for a unit name (grams if unknown)."""
+    return _UNIT_CODES.get(unit.strip().lower(), _UNIT_CODES["g"])
+
+
+def normalize_food_name(food_name: str) -> str:
+    """Normalizes a food name the way names are stored (lowercase, single spaces)."""
+    return " ".join(food_name.lower().split())
+
+
+def micronutrient_factor(nutrient: str, unit: str) -> float:
+    """Returns the factor that converts amounts of a micronutrient in ``unit`` to its canonical unit.
+
+    Accepts mass units (g, mg, µg/ug/mcg) and IU for vitamins A, D and E.
+    """
+    unit = unit.strip()
+    canonical_mg = _MASS_UNIT_MG[MICRONUTRIENT_UNITS[nutrient]]
+    if unit.lower() == "iu":
+        if nutrient not in _IU_MG:
+            raise ValueError(f"International units are not defined for {nutrient}")
+        return _IU_MG[nutrient] / canonical_mg
+    mass_unit = unit if unit in _MASS_UNIT_MG else unit.lower()
+    if mass_unit not in _MASS_UNIT_MG:
+        raise ValueError(f"Unknown unit '{unit}' for {nutrient}")
+    return _MASS_UNIT_MG[mass_unit] / canonical_mg
+
+
+def parse_micronutrient(nutrient: str, amount) -> float:
+    """Parses an amount such as ``"4.6 mg"``, ``"120 IU"`` or ``"19.3 µg"`` into the canonical unit.
+
+    Plain numbers are taken to be in the canonical unit already.
+    """
+    if isinstance(amount, (int, float)):
+        return float(amount)
+    text = amount.strip()
+    split = len(text)
+    while split > 0 and not (text[split - 1].isdigit() or text[split - 1] == "."):
+        split -= 1
+    value, unit = text[:split], text[split:]
+    if not unit.strip():
+        return float(value)
+    return float(value) * micronutrient_factor(nutrient, unit)
+
+
+def format_micronutrient(nutrient: str, amount: float) -> str:
+    """Formats an amount in the canonical unit, e.g. ``"4.6 mg"``."""
+    return f"{round(amount, 2):g} {MICRONUTRIENT_UNITS[nutrient]}"
+
+
+class StringTable:
+    """Read-only table of strings packed into one UTF-8 buffer.
+
+    String ``i`` is ``blob[offsets[i]:offsets[i + 1]]``. ``order`` lists the
+    string indices sorted by their bytes, so lookups are a binary search over
+    the packed buffer and never need a dict built at load time.
+    """
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray, order: np.ndarray, index: Optional[Dict[str, int]] = None):
+        self.offsets = offsets
+        self.blob = blob
+        self.order = order
+        # Tables built in memory also keep a dict, since they paid for it already
+        self._index = index
+
+    @classmethod
+    def from_strings(cls, strings: List[str]) -> "StringTable":
+        encoded = [string.encode("utf-8") for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(data) for data in encoded])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.uint32)
+        index = {}
+        for i, string in enumerate(strings):
+            index.setdefault(string, i)
+        return cls(offsets, blob, order, index)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self._bytes(index).decode("utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _bytes(self, index: int) -> bytes:
+        return self.blob[self.offsets[index]:self.offsets[index + 1]].tobytes()
+
+    def find(self, string: str) -> Optional[int]:
+        """Returns the index of a string, or None if it is not in the table."""
+        if self._index is not None:
+            return self._index.get(string)
+        target = string.encode("utf-8")
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._bytes(int(self.order[mid])) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self._bytes(int(self.order[lo])) == target:
+            return int(self.order[lo])
+        return None
+
+
+class FoodStore:
+    """Columnar food composition table.
+
+    Row ``i`` of ``nutrients`` holds the per-100 g values of the food with ID
+    ``i``, in the order given by ``NUTRIENT_COLUMNS``. The arrays may be plain
+    in-memory arrays or read-only views into a memory-mapped store file.
+    """
+
+    def __init__(
+        self,
+        names: StringTable,
+        nutrients: np.ndarray,
+        food_groups: np.ndarray,
+        cup_grams: np.ndarray,
+        piece_grams: np.ndarray,
+        aliases: Optional[StringTable] = None,
+        alias_targets: Optional[np.ndarray] = None
+    ):
+        self.names = names
+        self.nutrients = nutrients
+        self.food_groups = food_groups
+        self.cup_grams = cup_grams
+        self.piece_grams = piece_grams
+        self.aliases = aliases if aliases is not None else StringTable.from_strings([])
+        self.alias_targets = alias_targets if alias_targets is not None else np.zeros(0, dtype=np.uint32)
+        self._name_index: Optional[FoodNameIndex] = None
+        self._resolve_cached = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._resolve)
+
+    @classmethod
+    def from_foods(cls, foods: Dict[str, Dict]) -> "FoodStore":
+        """Builds an in-memory store from a ``{name: composition}`` mapping."""
+        nutrients = np.zeros((len(foods), len(NUTRIENT_COLUMNS)), dtype=np.float64)
+        food_groups = np.zeros(len(foods), dtype=np.int8)
+        cup_grams = np.full(len(foods), np.nan)
+        piece_grams = np.full(len(foods), np.nan)
+
+        micronutrient_columns = {nutrient: NUTRIENT_COLUMNS.index(nutrient) for nutrient in MICRONUTRIENTS}
+        for i, data in enumerate(foods.values()):
+            nutrients[i, :MICRONUTRIENT_SLICE.start] = [data.get(column, 0.0) for column in NUTRIENT_COLUMNS[:MICRONUTRIENT_SLICE.start]]
+            for nutrient, amount in data.get("micronutrients", {}).items():
+                nutrients[i, micronutrient_columns[nutrient]] = parse_micronutrient(nutrient, amount)
+            food_groups[i] = FOOD_GROUPS.index(data.get("food_group", "other"))
+            cup_grams[i] = data.get("cup_grams", np.nan)
+            piece_grams[i] = data.get("piece_grams", np.nan)
+
+        for array in (nutrients, food_groups, cup_grams, piece_grams):
+            array.setflags(write=False)
+
+        names = StringTable.from_strings([normalize_food_name(name) for name in foods])
+        alias_names = []
+        alias_targets = []
+        for i, data in enumerate(foods.values()):
+            for alias in data.get("aliases", []):
+                alias_names.append(normalize_food_name(alias))
+                alias_targets.append(i)
+        aliases = StringTable.from_strings(alias_names)
+        return cls(names, nutrients, food_groups, cup_grams, piece_grams, aliases, np.array(alias_targets, dtype=np.uint32))
+
+    @classmethod
+    def open(cls, path: str) -> "FoodStore":
+        """Opens a store file written by ``write_food_store`` without reading its data.
+
+        Only the small header is parsed; every column is a view into a
+        read-only memory map, so opening costs the same for any dataset size.
+        """
+        header, sections = read_section_file(path, _STORE_MAGIC, "food store")
+        if header["columns"] != NUTRIENT_COLUMNS:
+            raise ValueError(f"Food store file '{path}' has columns {header['columns']}, expected {NUTRIENT_COLUMNS}")
+        if header.get("units") != NUTRIENT_UNITS:
+            raise ValueError(f"Food store file '{path}' uses units {header.get('units')}, expected {NUTRIENT_UNITS}; re-import it")
+
+        names = StringTable(sections["name_offsets"], sections["name_blob"], sections["name_order"])
+        aliases = None
+        if "alias_offsets" in sections:
+            aliases = StringTable(sections["alias_offsets"], sections["alias_blob"], sections["alias_order"])
+        # Nutrients are stored column by column; the transpose gives the usual (food, nutrient) layout
+        return cls(
+            names,
+            sections["nutrients"].T,
+            sections["food_groups"],
+            sections["cup_grams"],
+            sections["piece_grams"],
+            aliases,
+            sections.get("alias_targets")
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, food_name: str) -> Optional[int]:
+        """Returns the food ID for an exact name or alias, or None if the food is unknown."""
+        food_name = normalize_food_name(food_name)
+        food_id = self.names.find(food_name)
+        if food_id is None:
+            alias_id = self.aliases.find(food_name)
+            if alias_id is not None:
+                food_id = int(self.alias_targets[alias_id])
+        return food_id
+
+    @property
+    def name_index(self) -> FoodNameIndex:
+        """Trigram index over names and aliases, built on first fuzzy lookup."""
+        if self._name_index is None:
+            strings = list(self.names) + list(self.aliases)
+            targets = np.concatenate([np.arange(len(self.names)), self.alias_targets])
+            self._name_index = FoodNameIndex(strings, targets)
+        return self._name_index
+
+    def resolve(self, food_name: str, min_confidence: float = MIN_MATCH_CONFIDENCE) -> Tuple[Optional[int], float]:
+        """Resolves a free-text food name to a food ID, tolerating typos and plurals.
+
+        Returns:
+            (food_id, confidence), where confidence is 1.0 for exact names and
+            aliases and the trigram similarity otherwise. food_id is None when
+            the best match is below min_confidence.
+        """
+        food_id, confidence = self._resolve_cached(normalize_food_name(food_name))
+        if food_id is not None and confidence < min_confidence:
+            return None, confidence
+        return food_id, confidence
+
+    def _resolve(self, food_name: str) -> Tuple[Optional[int], float]:
+        food_id = self.lookup(food_name)
+        if food_id is not None:
+            return food_id, 1.0
+        match = self.name_index.best_match(food_name)
+        if match is None:
+            return None, 0.0
+        return match[0], match[2]
+
+    def column(self, nutrient: str) -> np.ndarray:
+        """Returns the per-100 g values of one nutrient for every food."""
+        return self.nutrients[:, NUTRIENT_COLUMNS.index(nutrient)]
+
+    def food_group(self, food_id: int) -> str:
+        return FOOD_GROUPS[self.food_groups[food_id]]
+
+    def grams(self, food_id: int, quantity: float, unit: str) -> float:
+        """Converts a quantity of a food to grams."""
+        code = unit_code(unit)
+        if code == _UNIT_CODES["oz"]:
+            return quantity * OUNCE_GRAMS
+        elif code == _UNIT_CODES["cup"]:
+            cup_grams = float(self.cup_grams[food_id])
+            return quantity * (DEFAULT_CUP_GRAMS if np.isnan(cup_grams) else cup_grams)
+        elif code == _UNIT_CODES["piece"]:
+            piece_grams = float(self.piece_grams[food_id])
+            return quantity * (DEFAULT_PIECE_GRAMS if np.isnan(piece_grams) else piece_grams)
+        else:
+            return quantity
+
+    def grams_batch(self, food_ids: np.ndarray, quantities: np.ndarray, unit_codes: np.ndarray) -> np.ndarray:
+        """Vectorized form of ``grams`` over arrays of food IDs, quantities and unit codes."""
+        cup_grams = self.cup_grams[food_ids]
+        piece_grams = self.piece_grams[food_ids]
+        grams_per_unit = np.select(
+            [unit_codes == _UNIT_CODES["oz"], unit_codes == _UNIT_CODES["cup"], unit_codes == _UNIT_CODES["piece"]],
+            [
+                np.full(len(food_ids), float(OUNCE_GRAMS)),
+                np.where(np.isnan(cup_grams), DEFAULT_CUP_GRAMS, cup_grams),
+                np.where(np.isnan(piece_grams), DEFAULT_PIECE_GRAMS, piece_grams)
+            ],
+            default=1.0
+        )
+        return np.asarray(quantities, dtype=np.float64) * grams_per_unit
+
+    def nutrients_for(self, food_id: int, grams: float) -> np.ndarray:
+        """Returns the nutrient vector for a given weight of a food."""
+        return self.nutrients[food_id] * (grams / 100.0)
+
+
+# Store file layout: magic, little-endian uint64 header length, JSON header,
+# then each section starting on a 64-byte boundary.
+_STORE_MAGIC = b"NUTRIFS\x01"
+_ALIGNMENT = 64
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def read_section_file(path: str, magic: bytes, description: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Opens a file written by ``write_section_file`` and memory-maps its sections.
+
+    Returns the JSON header and one read-only array view per section.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(magic)) != magic:
+            raise ValueError(f"'{path}' is not a {description} file")
+        header_length = int.from_bytes(fh.read(8), "little")
+        header = json.loads(fh.read(header_length).decode("utf-8"))
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+    sections = {
+        name: buffer[spec["offset"]:spec["offset"] + spec["nbytes"]].view(spec["dtype"]).reshape(spec["shape"])
+        for name, spec in header["sections"].items()
+    }
+    return header, sections
+
+
+def write_section_file(path: str, magic: bytes, header: Dict, arrays: Dict[str, np.ndarray]) -> None:
+    """Writes named arrays as 64-byte aligned sections behind a JSON header.
+
+    The layout is the magic bytes, the header length (8 bytes, little
+    endian), the header with a "sections" entry added, then the sections.
+    Arrays may be memory-mapped; they are streamed to the file. The file is
+    written next to ``path`` and moved into place when complete.
+    """
+    layout = []
+    relative_offset = 0
+    for name, array in arrays.items():
+        layout.append((name, relative_offset, array))
+        relative_offset += _aligned(array.nbytes)
+
+    # Section offsets are absolute, and the header that records them sits in
+    # front of the data, so grow the data start until the header fits
+    data_start = 0
+    while True:
+        sections = {
+            name: {"offset": data_start + offset, "nbytes": array.nbytes, "dtype": array.dtype.str, "shape": list(array.shape)}
+            for name, offset, array in layout
+        }
+        header_bytes = json.dumps({**header, "sections": sections}).encode("utf-8")
+        required_start = _aligned(len(magic) + 8 + len(header_bytes))
+        if required_start == data_start:
+            break
+        data_start = required_start
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(magic)
+        fh.write(len(header_bytes).to_bytes(8, "little"))
+        fh.write(header_bytes)
+        for name, array in arrays.items():
+            fh.seek(sections[name]["offset"])
+            fh.write(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
+    os.replace(tmp_path, path)
+
+
+def write_food_store(
+    path: str,
+    names: List[str],
+    nutrients: np.ndarray,
+    food_groups: np.ndarray,
+    cup_grams: np.ndarray,
+    piece_grams: np.ndarray,
+    aliases: Optional[List[Tuple[str, int]]] = None
+) -> None:
+    """Writes a store file that ``FoodStore.open`` can memory-map.
+
+    Args:
+        path: Output file path
+        names: Food names; they are normalized with ``normalize_food_name``
+        nutrients: Per-100 g values in ``NUTRIENT_UNITS``, shape (len(names), len(NUTRIENT_COLUMNS))
+        food_groups: Index into ``FOOD_GROUPS`` for every food
+        cup_grams: Grams per cup for every food (NaN when unknown)
+        piece_grams: Grams per piece for every food (NaN when unknown)
+        aliases: Optional (alias, food ID) pairs, e.g. local names for a food
+    """
+    table = StringTable.from_strings([normalize_food_name(name) for name in names])
+    aliases = aliases or []
+    alias_table = StringTable.from_strings([normalize_food_name(alias) for alias, _ in aliases])
+    arrays = {
+        "nutrients": np.ascontiguousarray(np.asarray(nutrients, dtype="<f4").T),
+        "food_groups": np.asarray(food_groups, dtype="i1"),
+        "cup_grams": np.asarray(cup_grams, dtype="<f4"),
+        "piece_grams": np.asarray(piece_grams, dtype="<f4"),
+        "name_offsets": table.offsets.astype("<i8"),
+        "name_order": table.order.astype("<u4"),
+        "name_blob": table.blob,
+        "alias_offsets": alias_table.offsets.astype("<i8"),
+        "alias_order": alias_table.order.astype("<u4"),
+        "alias_targets": np.array([food_id for _, food_id in aliases], dtype="<u4"),
+        "alias_blob": alias_table.blob,
+    }
+
+    header = {"version": 2, "num_foods": len(table), "columns": NUTRIENT_COLUMNS, "units": NUTRIENT_UNITS}
+    write_section_file(path, _STORE_MAGIC, header, arrays)
+
+
+_store: Optional[FoodStore] = None
+
+
+def get_food_store() -> FoodStore:
+    """Returns the shared food store, opening it on first use.
+
+    If FOOD_STORE_PATH is configured the store file is memory-mapped,
+    otherwise the built-in demonstration foods are used.
+    """
+    global _store
+    if _store is None:
+        if FOOD_STORE_PATH:
+            _store = FoodStore.open(FOOD_STORE_PATH)
+        else:
+            _store = FoodStore.from_foods(_FOOD_DATA)
+    return _store
@@ -0,0 +1,217 @@
+from google.adk.tools import FunctionTool
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import re
+
+from .measurement_conversion import UNIT_MAPPING, conversion_graph
+from .tool_cache import memoize
+
+# Deterministic parser for free-text ingredient lines and food log entries
+# such as "1 1/2 cups cooked rice", "2-3 medium bananas" or "200gr dada
+# ayam". Lines are turned into the {"name", "quantity", "unit"} dicts used
+# by the nutrition tools, without a model round trip. Parsed lines are
+# memoized, so a food log that repeats the same entries is parsed once.
+
+# Unit used when a line has a quantity but no unit ("2 bananas")
+DEFAULT_COUNT_UNIT = "piece"
+
+PARSE_CACHE_SIZE = 4096  # Distinct lines kept in the memo cache
+
+_UNICODE_FRACTIONS = {
+    "½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4",
+    "⅕": "1/5", "⅖": "2/5", "⅗": "3/5", "⅘": "4/5",
+    "⅙": "1/6", "⅚": "5/6", "⅛": "1/8", "⅜": "3/8", "⅝": "5/8", "⅞": "7/8"
+}
+
+# Size words carry no unit of their own ("2 medium bananas")
+SIZE_WORDS = {"small", "medium", "large", "kecil", "sedang", "besar"}
+
+# Food log entries may start with the meal ("breakfast: 2 eggs")
+MEAL_PREFIXES = {
+    "breakfast": "breakfast",
+    "sarapan": "breakfast",
+    "makan pagi": "breakfast",
+    "lunch": "lunch",
+    "makan siang": "lunch",
+    "dinner": "dinner",
+    "makan malam": "dinner",
+    "snack": "snack",
+    "camilan": "snack",
+    "cemilan": "snack",
+}
+
+# Store units that calculate_nutrition and analyze_diet understand, per dimension
+_CALCULATOR_UNITS = {"weight": "g", "volume": "cup"}
+
+_NUMBER = r"(?:\d+\s+\d+/\d+|\d+/\d+|\d+(?:[.,]\d+)?|[.,]\d+)"
+_QUANTITY = re.compile(
+    r"^(?P<low>" + _NUMBER + r")(?:\s*(?:-|–|to|sampai|s/d)\s*(?P<high>" + _NUMBER + r"))?(?![\d/])\s*"
+)
+_MEAL_PREFIX = re.compile(
+    r"^(" + "|".join(re.escape(prefix) for prefix in sorted(MEAL_PREFIXES, key=len, reverse=True)) + r")\s*[:\-]\s*"
+)
+
+# Longest aliases first, so "sendok makan" wins over shorter prefixes and "cups" over "c"
+_UNIT_PATTERN = re.compile(
+    r"^(" + "|".join(re.escape(alias) for alias in sorted(UNIT_MAPPING, key=len, reverse=True)) + r")\.?(?=\s|$)"
+)
+
+
+def _parse_number(text: str) -> Optional[float]:
+    """The value of a number, mixed number or fraction; None for a zero denominator ("1/0")."""
+    text = text.strip()
+    if "/" in text:
+        whole, _, fraction = text.rpartition(" ")
+        numerator, denominator = fraction.split("/")
+        if int(denominator) == 0:
+            return None
+        return (int(whole) if whole else 0) + int(numerator) / int(denominator)
+    # Decimal comma, as in "1,5 kg"
+    return float(text.replace(",", "."))
+
+
+def _normalize_line(line: str) -> str:
+    text = line.lower()
+    for symbol, fraction in _UNICODE_FRACTIONS.items():
+        # "1½" becomes "1 1/2", a lone "½" becomes "1/2"
+        text = text.replace(symbol, f" {fraction}")
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text: str) -> Optional[Tuple[str, float, str, Optional[Tuple[float, float]]]]:
+    quantity = 1.0
+    quantity_range = None
+    match = _QUANTITY.match(text)
+    if match:
+        low = _parse_number(match.group("low"))
+        if low is None:
+            return None
+        quantity = low
+        if match.group("high") is not None:
+            high = _parse_number(match.group("high"))
+            if high is None:
+                return None
+            if high > low:
+                # Ranges ("2-3 bananas") use the midpoint
+                quantity = (low + high) / 2
+                quantity_range = (low, high)
+            elif high < 1:
+                # Hyphenated mixed number ("1-1/2 cups")
+                quantity = low + high
+        text = text[match.end():]
+
+    words = text.split(" ")
+    while words and words[0] in SIZE_WORDS:
+        words.pop(0)
+    text = " ".join(words)
+
+    unit = DEFAULT_COUNT_UNIT
+    unit_match = _UNIT_PATTERN.match(text)
+    if unit_match:
+        unit = UNIT_MAPPING[unit_match.group(1)]
+        text = text[unit_match.end():].lstrip()
+
+    # Drop a leading "of", size words after the unit and preparation notes after a comma
+    words = text.split(" ")
+    while words and (words[0] in SIZE_WORDS or words[0] == "of"):
+        words.pop(0)
+    name = " ".join(words).split(",", 1)[0].strip()
+    if not name:
+        return None
+    return name, quantity, unit, quantity_range
+
+
+def parse_ingredient_line(line: str) -> Optional[Dict]:
+    """Parses one ingredient line into ``{"name", "quantity", "unit"}``.
+
+    Handles mixed numbers and fractions ("1 1/2", "½", "1,5"), ranges ("2-3",
+    "2 sampai 3", parsed as the midpoint with ``quantity_range`` added), unit
+    aliases from ``UNIT_MAPPING`` including Indonesian household measures,
+    and size words. The unit is the standard abbreviation; lines without a
+    unit are counted in pieces. Returns None if no food name is left or a
+    quantity cannot be read ("1/0 cup").
+    """
+    parsed = _parse_cached(_normalize_line(line))
+    if parsed is None:
+        return None
+    name, quantity, unit, quantity_range = parsed
+    result = {"name": name, "quantity": quantity, "unit": unit}
+    if quantity_range is not None:
+        result["quantity_range"] = list(quantity_range)
+    return result
+
+
+def to_calculator_units(item: Dict) -> Dict:
+    """Expresses a parsed amount in the units the nutrition tools read (g, cup, piece).
+
+    Weight units become grams and volume units become cups, so the food
+    store's per-food cup weights apply. Count units stay as they are.
+    """
+    dimension = conversion_graph.dimension_of.get(item["unit"])
+    if dimension is None:
+        return {**item, "unit": DEFAULT_COUNT_UNIT} if item["unit"] != DEFAULT_COUNT_UNIT else item
+    target = _CALCULATOR_UNITS[dimension]
+    quantity = item["quantity"] * conversion_graph.factor("", item["unit"], target)
+    return {**item, "quantity": round(quantity, 3), "unit": target}
+
+
+def parse_food_log(entries: List[str]) -> Dict:
+    """Parses free-text food log entries into items for the nutrition tools.
+
+    Use this tool to turn what the user ate, written as text, into the food items
+    that calculate_nutrition and analyze_diet expect, instead of writing them by hand.
+    Entries may start with a meal, e.g. "breakfast: 2 eggs" or "makan siang: 2 potong tahu".
+
+    Args:
+        entries: Food log lines (e.g., ["1 1/2 cups cooked rice", "2 medium bananas", "200gr dada ayam"])
+
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "items": [
+                {
+                    "name": the food name,
+                    "quantity": the amount, in the unit below,
+                    "unit": "g", "cup" or "piece",
+                    "meal_type": the meal, if the entry named one
+                }
+            ],
+            "unparsed_entries": entries without a food name,
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    items = []
+    unparsed_entries = []
+    for entry in entries:
+        text = _normalize_line(entry)
+        meal_type = None
+        prefix = _MEAL_PREFIX.match(text)
+        if prefix:
+            meal_type = MEAL_PREFIXES[prefix.group(1)]
+            text = text[prefix.end():]
+
+        parsed = parse_ingredient_line(text)
+        if parsed is None:
+            unparsed_entries.append(entry)
+            continue
+        item = to_calculator_units(parsed)
+        item.pop("quantity_range", None)
+        if meal_type is not None:
+            item["meal_type"] = meal_type
+        items.append(item)
+
+    if not items:
+        return {
+            "status": "error",
+            "error_message": "No food entries could be parsed."
+        }
+    return {
+        "status": "success",
+        "items": items,
+        "unparsed_entries": unparsed_entries
+    }
+
+# Create the Function Tool
+food_log_parser_tool = FunctionTool(func=memoize(parse_food_log, ttl_seconds=3600))
@@ -3,6 +3,7 @@ import os
 import json
 
 from google.adk.tools import FunctionTool
+from .tool_cache import memoize
 
 # Simple local RAG over JSONL or Markdown directory.
 # This is a placeholder lexical search to integrate with the agent schema.
@@ -69,4 +70,5 @@ def rag_query(query: str, top_k: int = 3, knowledge_dir: Optional[str] = None) -
     return {"status": "success", "matches": scored[:top_k]}
 
 
-local_rag_tool = FunctionTool(func=rag_query)
+# Knowledge files change rarely; the search is case-insensitive
+local_rag_tool = FunctionTool(func=memoize(rag_query, ttl_seconds=600, case_insensitive=True))
@@ -0,0 +1,251 @@
+from google.adk.tools import FunctionTool
+from typing import Dict, List, Optional, Tuple
+import time
+
+import numpy as np
+
+from .food_recommendation import get_food_catalog
+from .food_store import NUTRIENT_COLUMNS, get_food_store
+from .tool_cache import memoize
+
+# Day meal plans that hit calorie and macronutrient targets in one tool call.
+# The plan is built from whole portions of the store's foods: a vectorized
+# greedy pass adds, one portion at a time, whichever food brings the totals
+# closest to the targets, then a local search swaps single portions between
+# foods while that still helps. Both stop when the time budget runs out, and
+# the plan found so far is returned with its distance from the targets.
+
+PORTION_GRAMS = 25  # Amounts in the plan are multiples of this
+MAX_FOOD_GRAMS = 300  # Most of any one food in a day plan
+DEFAULT_MAX_FOODS = 6
+DEFAULT_TIME_BUDGET_MS = 50
+
+PLAN_NUTRIENTS = ["calories", "protein", "carbohydrates", "fat"]
+_PLAN_COLUMNS = [NUTRIENT_COLUMNS.index(nutrient) for nutrient in PLAN_NUTRIENTS]
+
+
+def _candidate_foods(allergies: List[str], dietary_preferences: List[str]) -> np.ndarray:
+    """Store IDs of the foods the plan may use.
+
+    Allergens and dietary tags come from the recommendation catalog, so
+    when either constraint is given only catalog foods that pass it are
+    used; foods without catalog data can't be checked and are left out.
+    """
+    store = get_food_store()
+    if not allergies and not dietary_preferences:
+        return np.arange(len(store))
+    catalog = get_food_catalog()
+    members = catalog.members(catalog.filter(dietary_preferences, [], allergies, None))
+    store_ids = catalog.store_ids[members]
+    return np.unique(store_ids[store_ids >= 0])
+
+
+def _errors(totals: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted squared relative deviation from the targets, over the last axis."""
+    return (((totals - targets) / targets) ** 2 * weights).sum(axis=-1)
+
+
+def solve_meal_plan(
+    portion_nutrients: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    max_portions: int,
+    max_foods: int,
+    deadline: float
+) -> Tuple[np.ndarray, bool]:
+    """Chooses portion counts per food that bring the nutrient totals close to the targets.
+
+    Args:
+        portion_nutrients: Nutrients of one portion, one row per candidate food
+        targets: Target totals; entries with weight 0 are ignored
+        weights: Importance of each target
+        max_portions: Most portions of any one food
+        max_foods: Most distinct foods in the plan
+        deadline: time.perf_counter() value at which to stop
+
+    Returns:
+        The portion count of every candidate food, and whether the search
+        finished before the deadline
+    """
+    num_foods = len(portion_nutrients)
+    portions = np.zeros(num_foods, dtype=np.int64)
+    totals = np.zeros(len(targets))
+    error = _errors(totals, targets, weights)
+
+    # Greedy: add the portion that lowers the error most, for all foods at once
+    while True:
+        if time.perf_counter() > deadline:
+            return portions, False
+        allowed = portions < max_portions
+        if np.count_nonzero(portions) >= max_foods:
+            allowed &= portions > 0
+        candidate_errors = _errors(totals + portion_nutrients, targets, weights)
+        candidate_errors[~allowed] = np.inf
+        best = int(np.argmin(candidate_errors))
+        if candidate_errors[best] >= error:
+            break
+        portions[best] += 1
+        totals += portion_nutrients[best]
+        error = candidate_errors[best]
+
+    # Local search: move one portion from a food in the plan to any other food
+    while True:
+        if time.perf_counter() > deadline:
+            return portions, False
+        in_plan = np.flatnonzero(portions)
+        if len(in_plan) == 0:
+            break
+        # Shape (foods in plan, all foods, nutrients)
+        moved = totals - portion_nutrients[in_plan][:, None, :] + portion_nutrients[None, :, :]
+        move_errors = _errors(moved, targets, weights)
+        full = portions >= max_portions
+        move_errors[:, full] = np.inf
+        # A new food may only come in if the plan has room or the source food leaves it
+        new_food = portions == 0
+        if len(in_plan) >= max_foods:
+            move_errors[np.ix_(portions[in_plan] > 1, new_food)] = np.inf
+        move_errors[np.arange(len(in_plan)), in_plan] = np.inf
+        source, target = np.unravel_index(int(np.argmin(move_errors)), move_errors.shape)
+        if move_errors[source, target] >= error:
+            break
+        portions[in_plan[source]] -= 1
+        portions[target] += 1
+        totals = moved[source, target]
+        error = move_errors[source, target]
+    return portions, True
+
+
+def plan_meals(
+    calorie_target: float,
+    protein_target: Optional[float] = None,
+    carbohydrates_target: Optional[float] = None,
+    fat_target: Optional[float] = None,
+    allergies: List[str] = None,
+    dietary_preferences: List[str] = None,
+    max_foods: int = DEFAULT_MAX_FOODS,
+    time_budget_ms: float = DEFAULT_TIME_BUDGET_MS
+) -> Dict:
+    """Builds a one-day food plan that hits calorie and macronutrient targets.
+
+    Use this tool when the user wants a day plan for a calorie goal, optionally with
+    protein, carbohydrate or fat goals, allergies or a diet (e.g., "2000 kcal and 150 g
+    protein without nuts"). It replaces trying out foods with repeated calorie calculator calls.
+
+    Args:
+        calorie_target: Calories for the day (e.g., 2000)
+        protein_target: Grams of protein for the day (optional)
+        carbohydrates_target: Grams of carbohydrates for the day (optional)
+        fat_target: Grams of fat for the day (optional)
+        allergies: List of allergies or foods to avoid (e.g., ["nuts", "dairy"])
+        dietary_preferences: List of dietary preferences; foods must match at least one (e.g., ["vegetarian"])
+        max_foods: Most distinct foods in the plan (default 6)
+        time_budget_ms: Time the search may take, in milliseconds (default 50)
+
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "plan": [
+                {
+                    "food": name of the food,
+                    "grams": amount for the day,
+                    "calories": calories from this amount,
+                    "protein": grams of protein,
+                    "carbohydrates": grams of carbohydrates,
+                    "fat": grams of fat
+                },
+                ...
+            ],
+            "totals": calories, protein, carbohydrates and fat of the whole plan,
+            "deviation": {
+                nutrient: {
+                    "target": the target,
+                    "actual": the plan's total,
+                    "difference": actual minus target,
+                    "percent": difference as a percentage of the target
+                }
+            },
+            "search_complete": False if the time budget ran out before the search finished,
+            "solve_time_ms": time taken by the search; 0 for a plan served from the cache,
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    if calorie_target is None or calorie_target <= 0:
+        return {
+            "status": "error",
+            "error_message": "A positive calorie target is required."
+        }
+    allergies = [allergy.lower() for allergy in allergies or []]
+    dietary_preferences = [pref.lower() for pref in dietary_preferences or []]
+
+    store = get_food_store()
+    food_ids = _candidate_foods(allergies, dietary_preferences)
+    if len(food_ids) == 0:
+        return {
+            "status": "error",
+            "error_message": "No foods match the given allergies and dietary preferences."
+        }
+
+    requested = [calorie_target, protein_target, carbohydrates_target, fat_target]
+    targets = np.array([target if target else 1.0 for target in requested], dtype=np.float64)
+    # Calories count double, so macronutrient goals don't push the day far off its energy target
+    weights = np.array([2.0] + [1.0 if target else 0.0 for target in requested[1:]])
+    portion_nutrients = store.nutrients[np.ix_(food_ids, _PLAN_COLUMNS)] * (PORTION_GRAMS / 100.0)
+
+    start = time.perf_counter()
+    portions, search_complete = solve_meal_plan(
+        portion_nutrients,
+        targets,
+        weights,
+        MAX_FOOD_GRAMS // PORTION_GRAMS,
+        max(int(max_foods), 1),
+        start + time_budget_ms / 1000.0
+    )
+    solve_time_ms = (time.perf_counter() - start) * 1000
+
+    plan = []
+    for i in np.flatnonzero(portions)[np.argsort(-portions[portions > 0], kind="stable")].tolist():
+        amounts = portion_nutrients[i] * portions[i]
+        plan.append({
+            "food": store.names[int(food_ids[i])],
+            "grams": int(portions[i]) * PORTION_GRAMS,
+            **{nutrient: round(float(amount), 1) for nutrient, amount in zip(PLAN_NUTRIENTS, amounts)}
+        })
+
+    totals = portions @ portion_nutrients
+    deviation = {}
+    for nutrient, target, actual in zip(PLAN_NUTRIENTS, requested, totals.tolist()):
+        if target:
+            deviation[nutrient] = {
+                "target": target,
+                "actual": round(actual, 1),
+                "difference": round(actual - target, 1),
+                "percent": round((actual - target) / target * 100, 1)
+            }
+
+    return {
+        "status": "success",
+        "plan": plan,
+        "totals": {nutrient: round(amount, 1) for nutrient, amount in zip(PLAN_NUTRIENTS, totals.tolist())},
+        "deviation": deviation,
+        "search_complete": search_complete,
+        "solve_time_ms": round(solve_time_ms, 2)
+    }
+
+
+def _served_from_cache(result: Dict) -> Dict:
+    # No search ran for a cached plan
+    result["solve_time_ms"] = 0.0
+    return result
+
+
+# Create the Function Tool. Plans cut short by the time budget are not cached,
+# so a slow run doesn't pin a worse plan.
+meal_plan_tool = FunctionTool(
+    func=memoize(
+        plan_meals,
+        ttl_seconds=3600,
+        cache_if=lambda result: result.get("search_complete", True),
+        on_hit=_served_from_cache
+    )
+)
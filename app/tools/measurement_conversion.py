@@ -1,5 +1,249 @@
 from google.adk.tools import FunctionTool
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .food_store import normalize_food_name
+from .tool_cache import memoize
+
+# The unit system is compiled once into a conversion graph: every unit
+# belongs to a dimension (volume, weight or count), units of the same
+# dimension are connected through a dense factor matrix, and foods add
+# density edges (volume <-> weight) and count edges (piece/slice -> weight
+# or volume). In a real implementation this would use a comprehensive food
+# measurement database.
+
+# Normalize units to standard abbreviations
+UNIT_MAPPING = {
+    # Volume units
+    "cup": "cup",
+    "cups": "cup",
+    "c": "cup",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "tbsp": "tbsp",
+    "tb": "tbsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "tsp": "tsp",
+    "fluid ounce": "fl oz",
+    "fluid ounces": "fl oz",
+    "fl oz": "fl oz",
+    "floz": "fl oz",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "ml": "ml",
+    "liter": "l",
+    "liters": "l",
+    "l": "l",
+    "pint": "pint",
+    "pints": "pint",
+    "pt": "pint",
+    "quart": "quart",
+    "quarts": "quart",
+    "qt": "quart",
+    "gallon": "gallon",
+    "gallons": "gallon",
+    "gal": "gallon",
+
+    # Weight units
+    "gram": "g",
+    "grams": "g",
+    "g": "g",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "kg": "kg",
+    "ounce": "oz",
+    "ounces": "oz",
+    "oz": "oz",
+    "pound": "lb",
+    "pounds": "lb",
+    "lb": "lb",
+    "lbs": "lb",
+
+    # Count units
+    "piece": "piece",
+    "pieces": "piece",
+    "slice": "slice",
+    "slices": "slice",
+
+    # Indonesian household measures (ukuran rumah tangga)
+    "sendok makan": "tbsp",
+    "sdm": "tbsp",
+    "sendok teh": "tsp",
+    "sdt": "tsp",
+    "gelas": "cup",  # 1 gelas ≈ 240 ml
+    "gr": "g",
+    "kilo": "kg",
+    "ons": "ons",  # 100 g
+    "buah": "piece",
+    "butir": "piece",
+    "biji": "piece",
+    "potong": "slice",
+    "iris": "slice",
+    "lembar": "slice"
+}
+
+# Size of each unit in the base unit of its dimension (ml, g; count units are their own base)
+VOLUME_UNITS = {
+    "cup": 236.588,
+    "tbsp": 14.7868,
+    "tsp": 4.92892,
+    "fl oz": 29.5735,
+    "ml": 1.0,
+    "l": 1000.0,
+    "pint": 473.176,
+    "quart": 946.353,
+    "gallon": 3785.41
+}
+WEIGHT_UNITS = {
+    "g": 1.0,
+    "kg": 1000.0,
+    "oz": 28.3495,
+    "lb": 453.592,
+    "ons": 100.0  # Indonesian ons
+}
+COUNT_UNITS = ["piece", "slice"]
+
+# Approximate densities in g/ml
+FOOD_DENSITIES = {
+    "flour": 0.53,
+    "sugar": 0.85,
+    "brown sugar": 0.72,
+    "powdered sugar": 0.56,
+    "salt": 1.2,
+    "butter": 0.96,
+    "oil": 0.92,
+    "milk": 1.03,
+    "water": 1.0,
+    "honey": 1.42,
+    "maple syrup": 1.32,
+    "rice": 0.75,
+    "oats": 0.4,
+    "yogurt": 1.03
+}
+
+# Food-specific count conversions: grams and cups per count unit
+COUNT_CONVERSIONS = {
+    "apple": {"piece": {"g": 180, "cup": 1.5}},  # Medium apple, chopped
+    "banana": {"piece": {"g": 120, "cup": 1}},  # Medium banana, sliced
+    "bread": {"slice": {"g": 30}},  # Regular slice
+    "egg": {"piece": {"g": 50, "cup": 0.25}}  # Medium egg without shell
+}
+
+
+class ConversionGraph:
+    """Unit conversion graph compiled from the tables above.
+
+    ``factors[dimension]`` is the dense matrix of conversion factors between
+    the units of one dimension. Conversions across dimensions go through the
+    food's density and count edges.
+    """
+
+    def __init__(
+        self,
+        unit_mapping: Dict[str, str],
+        dimensions: Dict[str, Dict[str, float]],
+        densities: Dict[str, float],
+        count_conversions: Dict[str, Dict[str, Dict[str, float]]]
+    ):
+        self.unit_mapping = unit_mapping
+        self.dimension_of = {}
+        self.index_of = {}
+        self.scale_of = {}
+        self.factors = {}
+        for dimension, units in dimensions.items():
+            scales = np.array(list(units.values()), dtype=np.float64)
+            # factors[i, j] converts an amount in unit i to unit j
+            self.factors[dimension] = np.outer(scales, 1.0 / scales)
+            for index, (unit, scale) in enumerate(units.items()):
+                self.dimension_of[unit] = dimension
+                self.index_of[unit] = index
+                self.scale_of[unit] = scale
+
+        self.densities = {normalize_food_name(food): density for food, density in densities.items()}
+
+        # Count edges, stored per food as base units (g or ml) per count unit
+        self.count_edges: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for food, units in count_conversions.items():
+            for count_unit, targets in units.items():
+                edges = {}
+                for target, amount in targets.items():
+                    edges[self.dimension_of[target]] = amount * self.scale_of[target]
+                self.count_edges[(normalize_food_name(food), count_unit)] = edges
+
+    def normalize_unit(self, unit: str) -> Optional[str]:
+        """Returns the standard abbreviation of a unit, or None if it is unknown."""
+        return self.unit_mapping.get(unit.lower().strip())
+
+    def _count_to(self, food: str, count_unit: str, dimension: str) -> Optional[float]:
+        """Base units (g or ml) of ``dimension`` in one ``count_unit`` of a food."""
+        edges = self.count_edges.get((food, count_unit), {})
+        if dimension in edges:
+            return edges[dimension]
+        # Reach the other dimension through the food's density
+        density = self.densities.get(food)
+        if density is not None:
+            if dimension == "weight" and "volume" in edges:
+                return edges["volume"] * density
+            if dimension == "volume" and "weight" in edges:
+                return edges["weight"] / density
+        return None
+
+    def factor(self, food: str, from_unit: str, to_unit: str) -> float:
+        """Returns the factor that converts an amount of a food from one unit to another.
+
+        Raises:
+            ValueError: If a unit is unknown or the graph has no path for this food
+        """
+        from_norm = self.normalize_unit(from_unit)
+        if from_norm is None:
+            raise ValueError(f"Unknown source unit: '{from_unit}'")
+        to_norm = self.normalize_unit(to_unit)
+        if to_norm is None:
+            raise ValueError(f"Unknown target unit: '{to_unit}'")
+
+        from_dimension = self.dimension_of.get(from_norm, "count")
+        to_dimension = self.dimension_of.get(to_norm, "count")
+        food_name = normalize_food_name(food)
+
+        if from_dimension == to_dimension:
+            if from_dimension == "count":
+                # Direct count conversion (e.g., 1 piece = 1 piece)
+                if from_norm == to_norm:
+                    return 1.0
+                raise ValueError(f"Cannot convert between different count units: {from_unit} to {to_unit}")
+            return float(self.factors[from_dimension][self.index_of[from_norm], self.index_of[to_norm]])
+
+        if from_dimension == "count" or to_dimension == "count":
+            if from_dimension == "count":
+                base = self._count_to(food_name, from_norm, to_dimension)
+                if base is not None:
+                    return base / self.scale_of[to_norm]
+            else:
+                base = self._count_to(food_name, to_norm, from_dimension)
+                if base is not None:
+                    return self.scale_of[from_norm] / base
+            raise ValueError(f"Cannot convert between {from_unit} and {to_unit} for {food}")
+
+        # Volume <-> weight needs density information
+        density = self.densities.get(food_name)
+        if density is None:
+            raise ValueError(
+                f"Density information for '{food}' is not available for conversion between {from_unit} and {to_unit}"
+            )
+        if from_dimension == "volume":
+            return self.scale_of[from_norm] * density / self.scale_of[to_norm]
+        return self.scale_of[from_norm] / density / self.scale_of[to_norm]
+
+
+conversion_graph = ConversionGraph(
+    UNIT_MAPPING,
+    {"volume": VOLUME_UNITS, "weight": WEIGHT_UNITS},
+    FOOD_DENSITIES,
+    COUNT_CONVERSIONS
+)
+
 
 def convert_measurement(
     food: str,
@@ -8,17 +252,17 @@ def convert_measurement(
     to_unit: str
 ) -> Dict:
     """Converts food measurements from one unit to another.
-    
+
     Use this tool when the user needs to convert between different units of measurement
     for food ingredients, such as converting cups to grams, teaspoons to tablespoons,
     or ounces to milliliters.
-    
+
     Args:
         food: The food item being measured (e.g., "flour", "sugar", "milk")
         amount: The numerical amount to convert
         from_unit: The unit to convert from (e.g., "cup", "tbsp", "oz", "g")
         to_unit: The unit to convert to (e.g., "g", "ml", "tsp", "cup")
-    
+
     Returns:
         A dictionary with the following structure:
         {
@@ -31,386 +275,87 @@ def convert_measurement(
             "error_message": description of error (only if status is "error")
         }
     """
-    # In a real implementation, this would use a comprehensive food measurement database
-    # For demonstration, we'll use a simplified approach with common conversions
-    
-    # Normalize units to standard abbreviations
-    unit_mapping = {
-        # Volume units
-        "cup": "cup",
-        "cups": "cup",
-        "c": "cup",
-        "tablespoon": "tbsp",
-        "tablespoons": "tbsp",
-        "tbsp": "tbsp",
-        "tb": "tbsp",
-        "teaspoon": "tsp",
-        "teaspoons": "tsp",
-        "tsp": "tsp",
-        "fluid ounce": "fl oz",
-        "fluid ounces": "fl oz",
-        "fl oz": "fl oz",
-        "floz": "fl oz",
-        "milliliter": "ml",
-        "milliliters": "ml",
-        "ml": "ml",
-        "liter": "l",
-        "liters": "l",
-        "l": "l",
-        "pint": "pint",
-        "pints": "pint",
-        "pt": "pint",
-        "quart": "quart",
-        "quarts": "quart",
-        "qt": "quart",
-        "gallon": "gallon",
-        "gallons": "gallon",
-        "gal": "gallon",
-        
-        # Weight units
-        "gram": "g",
-        "grams": "g",
-        "g": "g",
-        "kilogram": "kg",
-        "kilograms": "kg",
-        "kg": "kg",
-        "ounce": "oz",
-        "ounces": "oz",
-        "oz": "oz",
-        "pound": "lb",
-        "pounds": "lb",
-        "lb": "lb",
-        "lbs": "lb",
-        
-        # Count units
-        "piece": "piece",
-        "pieces": "piece",
-        "slice": "slice",
-        "slices": "slice"
-    }
-    
-    # Normalize input units
-    from_unit_norm = from_unit.lower()
-    to_unit_norm = to_unit.lower()
-    
-    if from_unit_norm in unit_mapping:
-        from_unit_norm = unit_mapping[from_unit_norm]
-    else:
+    try:
+        factor = conversion_graph.factor(food, from_unit, to_unit)
+    except ValueError as error:
         return {
             "status": "error",
-            "error_message": f"Unknown source unit: '{from_unit}'"
-        }
-    
-    if to_unit_norm in unit_mapping:
-        to_unit_norm = unit_mapping[to_unit_norm]
-    else:
-        return {
-            "status": "error",
-            "error_message": f"Unknown target unit: '{to_unit}'"
-        }
-    
-    # Check if units are in the same category
-    volume_units = ["cup", "tbsp", "tsp", "fl oz", "ml", "l", "pint", "quart", "gallon"]
-    weight_units = ["g", "kg", "oz", "lb"]
-    count_units = ["piece", "slice"]
-    
-    # Determine if we're converting between volume, weight, or count units
-    same_category = False
-    if from_unit_norm in volume_units and to_unit_norm in volume_units:
-        same_category = True
-        category = "volume"
-    elif from_unit_norm in weight_units and to_unit_norm in weight_units:
-        same_category = True
-        category = "weight"
-    elif from_unit_norm in count_units and to_unit_norm in count_units:
-        same_category = True
-        category = "count"
-    
-    # If not in the same category, we need density information for the food
-    food_densities = {
-        # Approximate densities in g/ml
-        "flour": 0.53,
-        "sugar": 0.85,
-        "brown sugar": 0.72,
-        "powdered sugar": 0.56,
-        "salt": 1.2,
-        "butter": 0.96,
-        "oil": 0.92,
-        "milk": 1.03,
-        "water": 1.0,
-        "honey": 1.42,
-        "maple syrup": 1.32,
-        "rice": 0.75,
-        "oats": 0.4,
-        "yogurt": 1.03
-    }
-    
-    # Conversion factors within the same category
-    volume_conversions = {
-        "cup": {
-            "cup": 1,
-            "tbsp": 16,
-            "tsp": 48,
-            "fl oz": 8,
-            "ml": 236.588,
-            "l": 0.236588,
-            "pint": 0.5,
-            "quart": 0.25,
-            "gallon": 0.0625
-        },
-        "tbsp": {
-            "cup": 0.0625,
-            "tbsp": 1,
-            "tsp": 3,
-            "fl oz": 0.5,
-            "ml": 14.7868,
-            "l": 0.0147868,
-            "pint": 0.03125,
-            "quart": 0.015625,
-            "gallon": 0.00390625
-        },
-        "tsp": {
-            "cup": 0.0208333,
-            "tbsp": 0.333333,
-            "tsp": 1,
-            "fl oz": 0.166667,
-            "ml": 4.92892,
-            "l": 0.00492892,
-            "pint": 0.0104167,
-            "quart": 0.00520833,
-            "gallon": 0.00130208
-        },
-        "fl oz": {
-            "cup": 0.125,
-            "tbsp": 2,
-            "tsp": 6,
-            "fl oz": 1,
-            "ml": 29.5735,
-            "l": 0.0295735,
-            "pint": 0.0625,
-            "quart": 0.03125,
-            "gallon": 0.0078125
-        },
-        "ml": {
-            "cup": 0.00422675,
-            "tbsp": 0.067628,
-            "tsp": 0.202884,
-            "fl oz": 0.033814,
-            "ml": 1,
-            "l": 0.001,
-            "pint": 0.00211338,
-            "quart": 0.00105669,
-            "gallon": 0.000264172
-        },
-        "l": {
-            "cup": 4.22675,
-            "tbsp": 67.628,
-            "tsp": 202.884,
-            "fl oz": 33.814,
-            "ml": 1000,
-            "l": 1,
-            "pint": 2.11338,
-            "quart": 1.05669,
-            "gallon": 0.264172
-        },
-        "pint": {
-            "cup": 2,
-            "tbsp": 32,
-            "tsp": 96,
-            "fl oz": 16,
-            "ml": 473.176,
-            "l": 0.473176,
-            "pint": 1,
-            "quart": 0.5,
-            "gallon": 0.125
-        },
-        "quart": {
-            "cup": 4,
-            "tbsp": 64,
-            "tsp": 192,
-            "fl oz": 32,
-            "ml": 946.353,
-            "l": 0.946353,
-            "pint": 2,
-            "quart": 1,
-            "gallon": 0.25
-        },
-        "gallon": {
-            "cup": 16,
-            "tbsp": 256,
-            "tsp": 768,
-            "fl oz": 128,
-            "ml": 3785.41,
-            "l": 3.78541,
-            "pint": 8,
-            "quart": 4,
-            "gallon": 1
-        }
-    }
-    
-    weight_conversions = {
-        "g": {
-            "g": 1,
-            "kg": 0.001,
-            "oz": 0.035274,
-            "lb": 0.00220462
-        },
-        "kg": {
-            "g": 1000,
-            "kg": 1,
-            "oz": 35.274,
-            "lb": 2.20462
-        },
-        "oz": {
-            "g": 28.3495,
-            "kg": 0.0283495,
-            "oz": 1,
-            "lb": 0.0625
-        },
-        "lb": {
-            "g": 453.592,
-            "kg": 0.453592,
-            "oz": 16,
-            "lb": 1
+            "error_message": str(error)
         }
+
+    return {
+        "status": "success",
+        "food": food,
+        "original_amount": amount,
+        "original_unit": from_unit,
+        "converted_amount": round(amount * factor, 3),
+        "converted_unit": to_unit
     }
-    
-    # Food-specific count to weight/volume conversions
-    count_conversions = {
-        "apple": {
-            "piece": {
-                "g": 180,  # Medium apple
-                "cup": 1.5  # Chopped
-            }
-        },
-        "banana": {
-            "piece": {
-                "g": 120,  # Medium banana
-                "cup": 1  # Sliced
-            }
-        },
-        "bread": {
-            "slice": {
-                "g": 30,  # Regular slice
-                "oz": 1
-            }
-        },
-        "egg": {
-            "piece": {
-                "g": 50,  # Medium egg without shell
-                "cup": 0.25
+
+
+def convert_measurements_batch(conversions: List[Dict]) -> Dict:
+    """Converts a whole list of food measurements in one call.
+
+    Use this tool instead of calling convert_measurement repeatedly, for example
+    to convert every ingredient of a recipe at once.
+
+    Args:
+        conversions: A list of dictionaries, each containing:
+            {
+                "food": the food item being measured (e.g., "flour"),
+                "amount": the numerical amount to convert,
+                "from_unit": the unit to convert from (e.g., "cup"),
+                "to_unit": the unit to convert to (e.g., "g")
             }
+
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success",
+            "conversions": one result per input, in the same format as convert_measurement
         }
-    }
-    
-    # Perform the conversion
-    if same_category:
-        if category == "volume":
-            converted_amount = amount * volume_conversions[from_unit_norm][to_unit_norm]
-            return {
-                "status": "success",
-                "food": food,
-                "original_amount": amount,
-                "original_unit": from_unit,
-                "converted_amount": round(converted_amount, 3),
-                "converted_unit": to_unit
-            }
-        elif category == "weight":
-            converted_amount = amount * weight_conversions[from_unit_norm][to_unit_norm]
-            return {
-                "status": "success",
-                "food": food,
-                "original_amount": amount,
-                "original_unit": from_unit,
-                "converted_amount": round(converted_amount, 3),
-                "converted_unit": to_unit
-            }
-        elif category == "count":
-            # Direct count conversion (e.g., 1 piece = 1 piece)
-            if from_unit_norm == to_unit_norm:
-                return {
-                    "status": "success",
-                    "food": food,
-                    "original_amount": amount,
-                    "original_unit": from_unit,
-                    "converted_amount": amount,
-                    "converted_unit": to_unit
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error_message": f"Cannot convert between different count units: {from_unit} to {to_unit}"
-                }
-    else:
-        # Cross-category conversion (requires food density or specific conversion data)
-        food_lower = food.lower()
-        
-        # Check if we have count conversion data for this food
-        if from_unit_norm in count_units and food_lower in count_conversions and from_unit_norm in count_conversions[food_lower]:
-            if to_unit_norm in count_conversions[food_lower][from_unit_norm]:
-                # Direct conversion from count to target unit exists
-                converted_amount = amount * count_conversions[food_lower][from_unit_norm][to_unit_norm]
-                return {
-                    "status": "success",
-                    "food": food,
-                    "original_amount": amount,
-                    "original_unit": from_unit,
-                    "converted_amount": round(converted_amount, 3),
-                    "converted_unit": to_unit
-                }
-        
-        # Check if we're converting between volume and weight
-        if (from_unit_norm in volume_units and to_unit_norm in weight_units) or (from_unit_norm in weight_units and to_unit_norm in volume_units):
-            # Need density information
-            if food_lower in food_densities:
-                density = food_densities[food_lower]  # g/ml
-                
-                # First convert to ml if from_unit is volume
-                if from_unit_norm in volume_units:
-                    amount_in_ml = amount * volume_conversions[from_unit_norm]["ml"]
-                    amount_in_g = amount_in_ml * density
-                    
-                    # Then convert from g to target weight unit
-                    if to_unit_norm in weight_units:
-                        converted_amount = amount_in_g * weight_conversions["g"][to_unit_norm]
-                    else:
-                        return {
-                            "status": "error",
-                            "error_message": f"Unsupported conversion: {from_unit} to {to_unit}"
-                        }
-                
-                # First convert to g if from_unit is weight
-                elif from_unit_norm in weight_units:
-                    amount_in_g = amount * weight_conversions[from_unit_norm]["g"]
-                    amount_in_ml = amount_in_g / density
-                    
-                    # Then convert from ml to target volume unit
-                    if to_unit_norm in volume_units:
-                        converted_amount = amount_in_ml * volume_conversions["ml"][to_unit_norm]
-                    else:
-                        return {
-                            "status": "error",
-                            "error_message": f"Unsupported conversion: {from_unit} to {to_unit}"
-                        }
-                
-                return {
-                    "status": "success",
-                    "food": food,
-                    "original_amount": amount,
-                    "original_unit": from_unit,
-                    "converted_amount": round(converted_amount, 3),
-                    "converted_unit": to_unit
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error_message": f"Density information for '{food}' is not available for conversion between {from_unit} and {to_unit}"
-                }
-        else:
-            return {
+    """
+    # Each distinct (food, from, to) path is resolved once, then all amounts
+    # are scaled in a single array operation
+    paths = {}
+    for item in conversions:
+        key = (item["food"], item["from_unit"], item["to_unit"])
+        if key not in paths:
+            try:
+                paths[key] = conversion_graph.factor(*key)
+            except ValueError as error:
+                paths[key] = error
+
+    factors = np.array([
+        path if not isinstance(path, ValueError) else np.nan
+        for path in (paths[(item["food"], item["from_unit"], item["to_unit"])] for item in conversions)
+    ], dtype=np.float64)
+    amounts = np.array([item["amount"] for item in conversions], dtype=np.float64)
+    converted = np.round(amounts * factors, 3).tolist()
+
+    results = []
+    for item, converted_amount in zip(conversions, converted):
+        path = paths[(item["food"], item["from_unit"], item["to_unit"])]
+        if isinstance(path, ValueError):
+            results.append({
                 "status": "error",
-                "error_message": f"Cannot convert between {from_unit} and {to_unit} for {food}"
-            }
+                "error_message": str(path)
+            })
+        else:
+            results.append({
+                "status": "success",
+                "food": item["food"],
+                "original_amount": item["amount"],
+                "original_unit": item["from_unit"],
+                "converted_amount": converted_amount,
+                "converted_unit": item["to_unit"]
+            })
+
+    return {
+        "status": "success",
+        "conversions": results
+    }
 
-# Create the Function Tool
-measurement_conversion_tool = FunctionTool(func=convert_measurement) 
\ No newline at end of file
+# Create the Function Tools
+measurement_conversion_tool = FunctionTool(func=memoize(convert_measurement, ttl_seconds=86400, max_entries=1024))
+measurement_conversion_batch_tool = FunctionTool(func=memoize(convert_measurements_batch, ttl_seconds=86400))
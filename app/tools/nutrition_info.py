@@ -1,6 +1,16 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, Optional, List
 
+from .food_store import (
+    MACRONUTRIENT_SLICE,
+    MACRONUTRIENTS,
+    MICRONUTRIENT_SLICE,
+    MICRONUTRIENTS,
+    format_micronutrient,
+    get_food_store,
+)
+from .tool_cache import memoize
+
 def get_nutrition_info(food_name: str, quantity: float = 100.0, unit: str = "g") -> Dict:
     """Retrieves nutritional information for a specified food.
     
@@ -18,6 +28,8 @@ def get_nutrition_info(food_name: str, quantity: float = 100.0, unit: str = "g")
         {
             "status": "success" or "error",
             "food_name": the normalized food name,
+            "matched_food": the database food used, if the name only matched approximately,
+            "match_confidence": similarity of that approximate match (0-1),
             "quantity": the quantity used for calculation,
             "unit": the unit used for calculation,
             "calories": number of calories,
@@ -28,90 +40,44 @@ def get_nutrition_info(food_name: str, quantity: float = 100.0, unit: str = "g")
                 "fiber": fiber in grams
             },
             "micronutrients": {
-                "vitamin_a": amount in appropriate units,
-                "vitamin_c": amount in appropriate units,
+                "vitamin_a": amount with its unit (mg, µg), e.g. "4.6 mg",
+                "vitamin_c": amount with its unit,
                 # other vitamins and minerals
             },
             "error_message": description of error (only if status is "error")
         }
     """
-    # In a real implementation, this would query a nutrition database API
-    # For demonstration, we'll return mock data for a few common foods
+    store = get_food_store()
+    food_id, confidence = store.resolve(food_name)
     
-    food_database = {
-        "apple": {
-            "calories": 52,
-            "macronutrients": {
-                "protein": 0.3,
-                "carbohydrates": 13.8,
-                "fat": 0.2,
-                "fiber": 2.4
-            },
-            "micronutrients": {
-                "vitamin_c": "4.6 mg",
-                "potassium": "107 mg"
-            }
-        },
-        "banana": {
-            "calories": 89,
-            "macronutrients": {
-                "protein": 1.1,
-                "carbohydrates": 22.8,
-                "fat": 0.3,
-                "fiber": 2.6
-            },
-            "micronutrients": {
-                "vitamin_c": "8.7 mg",
-                "potassium": "358 mg"
-            }
-        },
-        "chicken breast": {
-            "calories": 165,
-            "macronutrients": {
-                "protein": 31,
-                "carbohydrates": 0,
-                "fat": 3.6,
-                "fiber": 0
-            },
-            "micronutrients": {
-                "vitamin_b6": "0.6 mg",
-                "niacin": "13.7 mg"
-            }
-        }
-    }
-    
-    food_name_lower = food_name.lower()
-    
-    # Calculate scaling factor based on quantity and unit
-    scaling_factor = quantity / 100.0  # Default is per 100g
-    
-    # Different scaling for different units (simplified)
-    if unit == "oz":
-        scaling_factor = quantity * 0.28  # 1 oz ≈ 28g
-    elif unit == "cup":
-        # Rough approximation - would be different for different foods
-        scaling_factor = quantity * 2.4  # Assuming 1 cup ≈ 240g
-    elif unit == "piece" and food_name_lower in ["apple", "banana"]:
-        # Rough approximation for a medium piece
-        scaling_factor = quantity * 1.2  # Assuming 1 piece ≈ 120g
-    
-    if food_name_lower in food_database:
-        food_data = food_database[food_name_lower]
+    if food_id is not None:
+        # Scale the per-100g values to the requested quantity
+        grams = store.grams(food_id, quantity, unit)
+        scaling_factor = grams / 100.0
+        values = store.nutrients[food_id]
         
-        # Scale the nutritional values
         scaled_data = {
             "status": "success",
             "food_name": food_name,
             "quantity": quantity,
             "unit": unit,
-            "calories": round(food_data["calories"] * scaling_factor, 1),
+            "calories": round(float(values[0]) * scaling_factor, 1),
             "macronutrients": {
-                nutrient: round(value * scaling_factor, 1) 
-                for nutrient, value in food_data["macronutrients"].items()
+                nutrient: round(float(value) * scaling_factor, 1)
+                for nutrient, value in zip(MACRONUTRIENTS, values[MACRONUTRIENT_SLICE])
             },
-            "micronutrients": food_data["micronutrients"]  # Not scaling micronutrients for simplicity
+            "micronutrients": {
+                nutrient: format_micronutrient(nutrient, float(value) * scaling_factor)
+                for nutrient, value in zip(MICRONUTRIENTS, values[MICRONUTRIENT_SLICE])
+                if value > 0
+            }
         }
         
+        # Report which food was used when the name only matched approximately
+        if confidence < 1.0:
+            scaled_data["matched_food"] = store.names[food_id]
+            scaled_data["match_confidence"] = confidence
+        
         return scaled_data
     else:
         return {
@@ -120,4 +86,4 @@ def get_nutrition_info(food_name: str, quantity: float = 100.0, unit: str = "g")
         }
 
 # Create the Function Tool
-nutrition_info_tool = FunctionTool(func=get_nutrition_info) 
\ No newline at end of file
+nutrition_info_tool = FunctionTool(func=memoize(get_nutrition_info, ttl_seconds=86400, case_insensitive=True))
\ No newline at end of file
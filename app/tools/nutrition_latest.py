@@ -5,6 +5,7 @@ import json
 
 from google.adk.tools import FunctionTool
 from config import BE_URL
+from .tool_cache import memoize
 
 
 def get_latest_nutrition_facts(food_name: str, serving_size: Optional[str] = None) -> Dict:
@@ -37,4 +38,6 @@ def get_latest_nutrition_facts(food_name: str, serving_size: Optional[str] = Non
         }
 
 
-latest_nutrition_facts_tool = FunctionTool(func=get_latest_nutrition_facts)
+latest_nutrition_facts_tool = FunctionTool(
+    func=memoize(get_latest_nutrition_facts, ttl_seconds=3600, max_entries=1024, case_insensitive=True)
+)
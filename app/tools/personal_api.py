@@ -5,6 +5,7 @@ import json
 
 from google.adk.tools import FunctionTool
 from config import BE_URL
+from .tool_cache import memoize
 
 
 def get_user_profile(user_id: str) -> Dict:
@@ -45,5 +46,6 @@ def get_user_calorie_history(user_id: str, start_date: Optional[str] = None, end
         return {"status": "error", "error_message": str(exc), "user_id": user_id, "start_date": start_date, "end_date": end_date}
 
 
-user_profile_tool = FunctionTool(func=get_user_profile)
+# Profiles are cached briefly so edits show up within a minute
+user_profile_tool = FunctionTool(func=memoize(get_user_profile, ttl_seconds=60))
 user_calorie_history_tool = FunctionTool(func=get_user_calorie_history)
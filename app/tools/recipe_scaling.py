@@ -0,0 +1,158 @@
+from google.adk.tools import FunctionTool
+from typing import Dict, List
+
+import numpy as np
+
+from .food_store import (
+    MACRONUTRIENT_SLICE,
+    MACRONUTRIENTS,
+    MICRONUTRIENT_SLICE,
+    MICRONUTRIENTS,
+    format_micronutrient,
+    get_food_store,
+)
+from .ingredient_parser import parse_ingredient_line
+from .measurement_conversion import conversion_graph
+from .tool_cache import memoize
+
+
+def _ingredient_grams(store, food_id: int, names: List[str], quantity: float, unit: str) -> float:
+    """Converts a parsed ingredient amount to grams.
+
+    Weight units convert directly. Volume and count units use the food's own
+    cup and piece weights from the store, then the conversion graph's density
+    and count edges, and finally the store's default portion weights.
+    """
+    dimension = conversion_graph.dimension_of.get(unit, "count")
+    if dimension == "weight":
+        return quantity * conversion_graph.scale_of[unit]
+    if dimension == "volume":
+        cups = quantity * conversion_graph.factor("", unit, "cup")
+        if not np.isnan(store.cup_grams[food_id]):
+            return store.grams(food_id, cups, "cup")
+    elif not np.isnan(store.piece_grams[food_id]):
+        return store.grams(food_id, quantity, "piece")
+    for name in names:
+        try:
+            return quantity * conversion_graph.factor(name, unit, "g")
+        except ValueError:
+            pass
+    if dimension == "volume":
+        return store.grams(food_id, cups, "cup")
+    return store.grams(food_id, quantity, "piece")
+
+
+def scale_recipe(ingredients: List[str], original_servings: int, target_servings: int) -> Dict:
+    """Scales a recipe to a new number of servings and calculates nutrition per serving.
+
+    Use this tool when the user wants to make a recipe for a different number of people,
+    or asks for the nutrition per serving of a recipe. It replaces separate measurement
+    conversion and calorie calculator calls for every ingredient.
+
+    Args:
+        ingredients: Ingredient lines as written in the recipe (e.g., ["2 cups flour", "1 1/2 cups milk", "2 bananas"])
+        original_servings: Number of servings the recipe makes as written
+        target_servings: Number of servings wanted
+
+    Returns:
+        A dictionary with the following structure:
+        {
+            "status": "success" or "error",
+            "original_servings": servings of the original recipe,
+            "target_servings": servings of the scaled recipe,
+            "scale_factor": factor applied to every ingredient,
+            "ingredients": [
+                {
+                    "line": the original ingredient line,
+                    "name": the ingredient name,
+                    "quantity": the scaled quantity,
+                    "unit": the unit of the scaled quantity,
+                    "grams": the scaled weight in grams (only if the food was found),
+                    "matched_food": the database food used for nutrition (only if found)
+                }
+            ],
+            "per_serving": {
+                "calories": calories per serving of the scaled recipe,
+                "macronutrients": protein, carbohydrates, fat and fiber in grams,
+                "micronutrients": vitamins and minerals with their units
+            },
+            "items_not_found": ingredient names without nutrition data,
+            "unparsed_lines": lines that could not be parsed,
+            "error_message": description of error (only if status is "error")
+        }
+    """
+    if original_servings <= 0 or target_servings <= 0:
+        return {
+            "status": "error",
+            "error_message": "Servings must be greater than zero."
+        }
+
+    store = get_food_store()
+    scale_factor = target_servings / original_servings
+
+    scaled_ingredients = []
+    items_not_found = []
+    unparsed_lines = []
+    food_ids = []
+    grams = []
+
+    for line in ingredients:
+        parsed = parse_ingredient_line(line)
+        if parsed is None:
+            unparsed_lines.append(line)
+            continue
+
+        ingredient = {
+            "line": line,
+            "name": parsed["name"],
+            "quantity": round(parsed["quantity"] * scale_factor, 2),
+            "unit": parsed["unit"]
+        }
+        food_id, _ = store.resolve(parsed["name"])
+        if food_id is not None:
+            matched_food = store.names[food_id]
+            ingredient_grams = _ingredient_grams(
+                store, food_id, [parsed["name"], matched_food], parsed["quantity"] * scale_factor, parsed["unit"]
+            )
+            ingredient["grams"] = round(ingredient_grams, 1)
+            ingredient["matched_food"] = matched_food
+            food_ids.append(food_id)
+            grams.append(ingredient_grams)
+        else:
+            items_not_found.append(parsed["name"])
+        scaled_ingredients.append(ingredient)
+
+    if not scaled_ingredients:
+        return {
+            "status": "error",
+            "error_message": "No ingredient lines could be parsed."
+        }
+
+    # Per-serving nutrition of every found ingredient in one matrix product
+    weights = np.asarray(grams, dtype=np.float64) / 100.0 / target_servings
+    per_serving = weights @ store.nutrients[np.asarray(food_ids, dtype=np.intp)]
+
+    return {
+        "status": "success",
+        "original_servings": original_servings,
+        "target_servings": target_servings,
+        "scale_factor": round(scale_factor, 3),
+        "ingredients": scaled_ingredients,
+        "per_serving": {
+            "calories": round(float(per_serving[0]), 1),
+            "macronutrients": {
+                nutrient: round(value, 1)
+                for nutrient, value in zip(MACRONUTRIENTS, per_serving[MACRONUTRIENT_SLICE].tolist())
+            },
+            "micronutrients": {
+                nutrient: format_micronutrient(nutrient, value)
+                for nutrient, value in zip(MICRONUTRIENTS, per_serving[MICRONUTRIENT_SLICE].tolist())
+                if value > 0
+            }
+        },
+        "items_not_found": items_not_found,
+        "unparsed_lines": unparsed_lines
+    }
+
+# Create the Function Tool
+recipe_scaling_tool = FunctionTool(func=memoize(scale_recipe, ttl_seconds=3600))
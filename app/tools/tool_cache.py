@@ -0,0 +1,252 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import copy
+import functools
+import inspect
+import json
+import sqlite3
+import threading
+import time
+
+from config import TOOL_CACHE_BACKEND, TOOL_CACHE_ENABLED, TOOL_CACHE_PATH
+
+# Memoization for the functions behind FunctionTools. memoize() wraps a tool
+# function with a per-tool policy (TTL, max entries, key normalization)
+# and keeps its signature, name and docstring, so FunctionTool builds the
+# same declaration for the model:
+#     local_rag_tool = FunctionTool(func=memoize(rag_query, ttl_seconds=600))
+# Results are stored in-process (an LRU per tool) or, with
+# TOOL_CACHE_BACKEND=sqlite, in a SQLite file shared by every worker on the
+# host. Error results are never cached, nor results a tool's cache_if
+# predicate rejects; a tool's on_hit adjusts a result served from the
+# cache. Hits, misses and latencies are kept per tool; see
+# tool_cache_stats().
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 256
+
+_MISSING = object()
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry.
+
+    Args:
+        max_entries: Most entries kept; the least recently used is evicted first
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires <= time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """Entries of one tool in a SQLite file, shared between processes.
+
+    Args:
+        path: Database file
+        tool_name: Tool whose entries this backend reads and writes
+        max_entries: Most entries kept for the tool; the least recently used is evicted first
+    """
+
+    def __init__(self, path: str, tool_name: str, max_entries: int):
+        self.path = path
+        self.tool_name = tool_name
+        self.max_entries = max_entries
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "tool TEXT, key TEXT, expires REAL, used REAL, value TEXT, PRIMARY KEY (tool, key))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5)
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value FROM tool_cache WHERE tool = ? AND key = ? AND expires > ?",
+                (self.tool_name, key, now)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            connection.execute("UPDATE tool_cache SET used = ? WHERE tool = ? AND key = ?", (now, self.tool_name, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tool_cache VALUES (?, ?, ?, ?, ?)",
+                (self.tool_name, key, now + ttl_seconds, now, json.dumps(value))
+            )
+            connection.execute(
+                "DELETE FROM tool_cache WHERE tool = ? AND (expires <= ? OR key IN ("
+                "SELECT key FROM tool_cache WHERE tool = ? ORDER BY used DESC LIMIT -1 OFFSET ?))",
+                (self.tool_name, now, self.tool_name, self.max_entries)
+            )
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM tool_cache WHERE tool = ?", (self.tool_name,))
+
+
+def _normalize(value: Any, case_insensitive: bool) -> Any:
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.lower() if case_insensitive else value
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, case_insensitive) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, case_insensitive) for v in value]
+    return value
+
+
+class ToolCache:
+    """Cache and metrics of one memoized tool function.
+
+    Args:
+        func: The tool function
+        ttl_seconds: Seconds a result stays valid
+        max_entries: Most results kept
+        case_insensitive: Whether string arguments that differ only in case share a result
+        key: Builds the cache key from the call's bound arguments instead of the default normalization
+        cache_if: Whether a (non-error) result may be cached; all are by default
+        on_hit: Adjusts a result served from the cache, e.g. to zero timings of the original call
+        backend: "memory" or "sqlite"; defaults to TOOL_CACHE_BACKEND
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        case_insensitive: bool = False,
+        key: Optional[Callable[[Dict], Any]] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        on_hit: Optional[Callable[[Any], Any]] = None,
+        backend: Optional[str] = None
+    ):
+        self.func = func
+        self.name = func.__name__
+        self.ttl_seconds = ttl_seconds
+        self.signature = inspect.signature(func)
+        self.case_insensitive = case_insensitive
+        self.key_func = key
+        self.cache_if = cache_if
+        self.on_hit = on_hit
+        backend = backend or TOOL_CACHE_BACKEND
+        if backend == "sqlite":
+            self.backend = SQLiteBackend(TOOL_CACHE_PATH, self.name, max_entries)
+        elif backend == "memory":
+            self.backend = MemoryBackend(max_entries)
+        else:
+            raise ValueError(f"Unknown tool cache backend '{backend}', expected 'memory' or 'sqlite'")
+        self.hits = 0
+        self.misses = 0
+        self.hit_seconds = 0.0
+        self.miss_seconds = 0.0
+
+    def key(self, args: tuple, kwargs: Dict) -> str:
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        if self.key_func is not None:
+            return json.dumps(self.key_func(arguments), sort_keys=True, default=str)
+        return json.dumps(_normalize(arguments, self.case_insensitive), sort_keys=True, default=str)
+
+    def call(self, args: tuple, kwargs: Dict) -> Any:
+        start = time.perf_counter()
+        key = self.key(args, kwargs)
+        result = self.backend.get(key)
+        if result is not _MISSING:
+            if self.on_hit is not None:
+                result = self.on_hit(result)
+            self.hits += 1
+            self.hit_seconds += time.perf_counter() - start
+            return result
+        result = self.func(*args, **kwargs)
+        if not (isinstance(result, dict) and result.get("status") == "error"):
+            if self.cache_if is None or self.cache_if(result):
+                self.backend.set(key, result, self.ttl_seconds)
+        self.misses += 1
+        self.miss_seconds += time.perf_counter() - start
+        return result
+
+    def stats(self) -> Dict:
+        calls = self.hits + self.misses
+        miss_ms = self.miss_seconds * 1000 / self.misses if self.misses else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / calls, 3) if calls else 0.0,
+            "avg_hit_ms": round(self.hit_seconds * 1000 / self.hits, 3) if self.hits else 0.0,
+            "avg_miss_ms": round(miss_ms, 3),
+            "saved_ms": round(self.hits * miss_ms - self.hit_seconds * 1000, 1)
+        }
+
+
+_caches: Dict[str, ToolCache] = {}
+
+
+def memoize(func: Callable, **policy) -> Callable:
+    """Wraps a tool function with a cache; keeps its signature, name and docstring.
+
+    Args:
+        func: The tool function
+        **policy: ToolCache options (ttl_seconds, max_entries, case_insensitive, key, cache_if, on_hit, backend)
+
+    Returns:
+        The wrapped function, or func itself when TOOL_CACHE_ENABLED is off
+    """
+    if not TOOL_CACHE_ENABLED:
+        return func
+    cache = ToolCache(func, **policy)
+    _caches[cache.name] = cache
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return cache.call(args, kwargs)
+
+    wrapper.cache = cache
+    return wrapper
+
+
+def tool_cache_stats() -> Dict[str, Dict]:
+    """Hits, misses and latencies of every memoized tool."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_tool_caches() -> None:
+    for cache in _caches.values():
+        cache.backend.clear()